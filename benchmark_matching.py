@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Benchmark match scoring accuracy and speed on the labelled corpus.
+
+Scores the recorded search results in utils/destinations/match_corpus.json,
+picks each track's best candidate like search_track does, and reports
+precision and recall of accepting it at each min_match_score threshold,
+together with tracks/sec and time per candidate. Run it before switching
+scorers or thresholds to check both accuracy and speed.
+
+Usage:
+    python benchmark_matching.py [--repeat 200] [--thresholds 0.7 0.85]
+                                 [--scorer module:attribute] [--errors 0.7]
+"""
+import argparse
+import importlib
+import os
+import sys
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.destinations.match_evaluation import CORPUS_PATH, DEFAULT_THRESHOLDS, evaluate, load_corpus
+
+DEFAULT_SCORER = "utils.destinations.base:PlaylistDestination.calculate_match_score"
+
+
+def load_scorer(path):
+    """Import a (track, title, artist) -> score callable from "module:attribute.path"."""
+    module_name, _, attribute = path.partition(":")
+    scorer = importlib.import_module(module_name)
+    for name in attribute.split("."):
+        scorer = getattr(scorer, name)
+    return scorer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="Labelled corpus file")
+    parser.add_argument("--scorer", default=DEFAULT_SCORER,
+                        help=f"Scorer to evaluate as module:attribute (default: {DEFAULT_SCORER})")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=list(DEFAULT_THRESHOLDS),
+                        help="min_match_score values to report")
+    parser.add_argument("--repeat", type=int, default=200,
+                        help="Times to score the corpus for timing (default: 200)")
+    parser.add_argument("--errors", type=float, metavar="THRESHOLD",
+                        help="List the cases decided wrongly at this threshold")
+    args = parser.parse_args()
+
+    cases = load_corpus(args.corpus)
+    scorer = load_scorer(args.scorer)
+    thresholds = sorted(set(args.thresholds + ([args.errors] if args.errors is not None else [])))
+    evaluation = evaluate(cases, scorer, thresholds, repeat=args.repeat)
+
+    positives = sum(1 for case in cases if case.expected)
+    print(f"{len(cases)} tracks ({positives} on Spotify), "
+          f"{evaluation.candidates // args.repeat} candidates, scorer {args.scorer}")
+    print(f"{evaluation.tracks_per_second:,.0f} tracks/s, {evaluation.us_per_candidate:.1f} us/candidate")
+    print(f"{'threshold':>9} {'TP':>4} {'FP':>4} {'FN':>4} {'precision':>10} {'recall':>7}")
+    for result in evaluation.results:
+        print(f"{result.threshold:>9.2f} {result.true_positives:>4} {result.false_positives:>4} "
+              f"{result.false_negatives:>4} {result.precision:>10.1%} {result.recall:>7.1%}")
+
+    if args.errors is not None:
+        by_id = {case.id: case for case in cases}
+        print(f"\nWrong at {args.errors}:")
+        for case_id in evaluation.at(args.errors).errors:
+            case = by_id[case_id]
+            print(f"  {case.id} {case.note}: {case.track.artist} - {case.track.title}"
+                  f"{f' ({case.track.remix})' if case.track.remix else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark near-duplicate clustering with MinHash/LSH blocking.
+
+Builds synthetic results of 1k/10k/100k tracks in which a share of tracks
+are re-uploads with small title changes (typos, punctuation, "[Official Audio]",
+"Extended Mix"). Reports clustering time, precise comparisons made, and
+recall of the planted duplicates. The all-pairs comparison with the same
+scorer is timed on a sample and extrapolated to the full size.
+
+Usage:
+    python benchmark_near_dedup.py [--sizes 1000 10000 100000] [--duplicate-rate 0.2]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.destinations.base import PlaylistDestination
+from utils.sources.base import Track
+from utils.sources.near_dedup import NearDuplicateClusterer, match_text
+
+# All-pairs comparison is timed on this many tracks and extrapolated
+PAIRWISE_SAMPLE = 300
+
+
+def random_word(rng):
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))).capitalize()
+
+
+def variant(rng, track):
+    """A re-upload of track with a small title change."""
+    title = track.title
+    change = rng.randrange(4)
+    if change == 0:
+        # Typo
+        i = rng.randrange(len(title))
+        title = title[:i] + rng.choice(string.ascii_lowercase) + title[i + 1:]
+    elif change == 1:
+        title = f"{title} [Official Audio]"
+    elif change == 2:
+        title = title.replace(" ", "  ", 1) + "!"
+    remix = "Extended Mix" if change == 3 else track.remix
+    return Track(title=title, artist=track.artist, remix=remix, source="Reupload")
+
+
+def build_corpus(rng, size, duplicate_rate):
+    """Return tracks and the index of the original each planted duplicate copies."""
+    artists = [f"{random_word(rng)} {random_word(rng)}" for _ in range(max(size // 20, 10))]
+    tracks, origins = [], []
+    while len(tracks) < size:
+        if tracks and rng.random() < duplicate_rate:
+            origin = rng.randrange(len(tracks))
+            origin = origins[origin] if origins[origin] is not None else origin
+            tracks.append(variant(rng, tracks[origin]))
+            origins.append(origin)
+        else:
+            title = " ".join(random_word(rng) for _ in range(rng.randint(1, 4)))
+            tracks.append(Track(title=title, artist=rng.choice(artists), source="Label"))
+            origins.append(None)
+    return tracks, origins
+
+
+def pairwise_clusters(clusterer, tracks):
+    """All-pairs comparison with the same precise scorer, for reference."""
+    texts = [PlaylistDestination.normalize_title(match_text(track)) for track in tracks]
+    for i in range(len(texts)):
+        for j in range(i):
+            clusterer._similar(texts[i], texts[j])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Result sizes to cluster (default: 1000 10000 100000)")
+    parser.add_argument("--duplicate-rate", type=float, default=0.2,
+                        help="Share of tracks that are planted near duplicates (default: 0.2)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'tracks':>8} {'LSH s':>8} {'compares':>10} {'removed':>8} {'recall':>7} {'pairwise s':>11}")
+    for size in args.sizes:
+        tracks, origins = build_corpus(rng, size, args.duplicate_rate)
+
+        clusterer = NearDuplicateClusterer()
+        start = time.perf_counter()
+        clusters = clusterer.cluster(tracks)
+        elapsed = time.perf_counter() - start
+
+        cluster_of = {}
+        for number, indices in enumerate(clusters):
+            for index in indices:
+                cluster_of[index] = number
+        planted = [(i, origin) for i, origin in enumerate(origins) if origin is not None]
+        found = sum(1 for i, origin in planted if cluster_of[i] == cluster_of[origin])
+        recall = found / len(planted) if planted else 1.0
+
+        reference = NearDuplicateClusterer()
+        pairs = size * (size - 1) // 2
+        sample = tracks[:PAIRWISE_SAMPLE]
+        start = time.perf_counter()
+        pairwise_clusters(reference, sample)
+        per_pair = (time.perf_counter() - start) / (len(sample) * (len(sample) - 1) // 2)
+
+        print(f"{size:>8} {elapsed:>8.2f} {clusterer.comparisons:>10,} {size - len(clusters):>8,} "
+              f"{recall:>7.1%} {per_pair * pairs:>11,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Benchmark match scoring of search candidates.
+
+Builds synthetic tracks with 5 search candidates each (like a Spotify or
+YouTube search page): near matches, other versions and unrelated titles.
+Reports the cost per candidate of the previous pure-Python scorer (kept
+below as a reference) against utils.destinations.scoring, both scoring
+every candidate exactly and picking the best candidate with pruning, and
+checks that the new scores are identical.
+
+Usage:
+    python benchmark_scoring.py [--tracks 2000] [--candidates 5] [--min-score 0.7]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.destinations import scoring
+from utils.destinations.scoring import TrackScorer
+from utils.sources.base import Track
+
+
+# Reference: the scorer PlaylistDestination used before utils.destinations.scoring
+
+def legacy_normalize_title(title):
+    if not title:
+        return ""
+    title = title.lower()
+    for word in ["official", "video", "audio", "lyric", "lyrics", "ft.", "feat.", "remix", "edit"]:
+        title = title.replace(word, "")
+    for char in ",.()[]{}!?\"':-;":
+        title = title.replace(char, "")
+    return " ".join(title.split())
+
+
+def legacy_normalize_artist(artist):
+    if not artist:
+        return ""
+    artist = artist.lower()
+    for word in ["official", "dj", "feat.", "ft."]:
+        artist = artist.replace(word, "")
+    for char in ",.()[]{}!?\"':-;":
+        artist = artist.replace(char, "")
+    return " ".join(artist.split())
+
+
+def legacy_levenshtein(s1, s2):
+    if len(s1) < len(s2):
+        return legacy_levenshtein(s2, s1)
+    if len(s2) == 0:
+        return len(s1)
+    previous_row = range(len(s2) + 1)
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            current_row.append(min(previous_row[j + 1] + 1, current_row[j] + 1, previous_row[j] + (c1 != c2)))
+        previous_row = current_row
+    return previous_row[-1]
+
+
+def legacy_similarity(a, b, containment=False):
+    if a == b:
+        return 1.0
+    if containment and (a in b or b in a):
+        return 0.9
+    max_length = max(len(a), len(b))
+    if max_length == 0:
+        return 0.0
+    return 1.0 - (legacy_levenshtein(a, b) / max_length)
+
+
+def legacy_match_score(track, match_title, match_artist):
+    title_score = legacy_similarity(legacy_normalize_title(track.title), legacy_normalize_title(match_title))
+    artist_score = legacy_similarity(legacy_normalize_artist(track.artist),
+                                     legacy_normalize_artist(match_artist), containment=True)
+    remix_bonus = 0.05 if track.remix and track.remix.lower() in match_title.lower() else 0.0
+    return min(1.0, (title_score * 0.5) + (artist_score * 0.5) + remix_bonus)
+
+
+def random_words(rng, count):
+    return " ".join("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))).capitalize()
+                    for _ in range(count))
+
+
+def build_searches(rng, tracks, candidates):
+    """Return (track, [(title, artist), ...]) pairs shaped like search results."""
+    searches = []
+    for _ in range(tracks):
+        track = Track(title=random_words(rng, rng.randint(1, 4)), artist=random_words(rng, 2),
+                      remix=rng.choice([None, "Extended Mix", "Dub Mix"]))
+        results = []
+        for _ in range(candidates):
+            kind = rng.random()
+            if kind < 0.3:
+                title = f"{track.title} - {track.remix or 'Original Mix'}"
+                artist = track.artist
+            elif kind < 0.5:
+                title = f"{track.artist} - {track.title} (Official Video)"
+                artist = f"{track.artist} Official"
+            else:
+                title = random_words(rng, rng.randint(1, 6))
+                artist = random_words(rng, 2)
+            results.append((title, artist))
+        rng.shuffle(results)
+        searches.append((track, results))
+    return searches
+
+
+def timed(func, searches):
+    start = time.perf_counter()
+    result = func(searches)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=2000, help="Tracks to match (default: 2000)")
+    parser.add_argument("--candidates", type=int, default=5, help="Search results per track (default: 5)")
+    parser.add_argument("--min-score", type=float, default=0.7,
+                        help="Minimum score for the thresholded run (default: 0.7)")
+    args = parser.parse_args()
+
+    searches = build_searches(random.Random(42), args.tracks, args.candidates)
+    total = args.tracks * args.candidates
+
+    legacy_time, legacy_scores = timed(
+        lambda s: [[legacy_match_score(track, t, a) for t, a in results] for track, results in s], searches)
+
+    scoring.normalize_title.cache_clear()
+    scoring.normalize_artist.cache_clear()
+    exact_time, exact_scores = timed(
+        lambda s: [TrackScorer(track).score_all(results) for track, results in s], searches)
+    assert exact_scores == legacy_scores, "scores differ from the reference scorer"
+
+    def best(s):
+        picks = []
+        for track, results in s:
+            picks.append(TrackScorer(track).best_match(results))
+        return picks
+    best_time, picks = timed(best, searches)
+    for (index, score), scores in zip(picks, legacy_scores):
+        assert score == max(scores + [0.0]) and (index is None or scores[index] == score)
+
+    threshold_time, _ = timed(
+        lambda s: [TrackScorer(track).score_all(results, args.min_score) for track, results in s], searches)
+
+    print(f"{total:,} candidates ({args.tracks:,} tracks x {args.candidates})")
+    print(f"{'scorer':<32} {'total s':>8} {'us/candidate':>13} {'speedup':>8}")
+    for label, elapsed in [("legacy DP", legacy_time),
+                           ("bit-parallel, all exact", exact_time),
+                           ("bit-parallel, best match", best_time),
+                           (f"bit-parallel, min score {args.min_score}", threshold_time)]:
+        print(f"{label:<32} {elapsed:>8.3f} {elapsed / total * 1e6:>13.1f} {legacy_time / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
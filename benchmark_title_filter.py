@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Benchmark the compiled title filter against the old per-keyword loops.
+
+Builds a synthetic corpus of video titles (tracks, remixes, mixes, sets...),
+classifies it with the original nested keyword loop, TitleFilter.is_filtered
+and TitleFilter.classify on 50-title pages, and checks all three agree.
+
+Usage:
+    python benchmark_title_filter.py [--titles 100000] [--extra-keywords 10]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.sources.title_filter import TitleFilter
+
+# Same lists as YouTubeSource, copied so the benchmark runs without its dependencies
+FILTER_KEYWORDS = [
+    "mix compilation", "dj set", "live set", "mixtape", "megamix",
+    "year mix", "monthly selection", "best of", "top 10", "top tracks",
+    "mix show", "radio show", "special mix", "mixed by", "album mix",
+    "tracklist", "interview", "behind the scenes", "vlog", "tutorial",
+    "mashup", "yearmix", "classics", "throwback", "back to back"
+]
+ALLOWED_TERMS = [
+    "extended mix", "club mix", "radio edit", "original mix", "remix"
+]
+
+ARTISTS = ["Kerri Chandler", "Dennis Ferrer", "Honey Dijon", "CamelPhat", "Purple Disco Machine",
+           "Black Coffee", "Peggy Gou", "Fisher", "Chris Lake", "Solardo", "Lane 8", "Yotto"]
+WORDS = ["Love", "Night", "Deep", "Sunrise", "Groove", "Soul", "Ocean", "Fire", "Dream", "Rhythm",
+         "Gold", "Paradise", "Shadow", "Higher", "Feel", "Together", "Music", "Heart"]
+SUFFIXES = ["", " (Extended Mix)", " (Original Mix)", " (Club Mix)", " [Radio Edit]",
+            " (Dennis Ferrer Remix)", " | Defected", " (Official Video)"]
+NON_TRACKS = ["DJ Set @ Printworks", "Live Set from Ibiza", "Best Of 2024", "Year Mix 2023",
+              "Radio Show 412", "Tracklist + Interview", "Behind The Scenes Vlog", "Top 10 Tracks",
+              "Monthly Selection March", "Classics Mashup", "Back To Back with Friends"]
+
+
+def build_corpus(size, seed=42):
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(size):
+        artist = rng.choice(ARTISTS)
+        if rng.random() < 0.2:
+            title = f"{artist} - {rng.choice(NON_TRACKS)}"
+            if rng.random() < 0.2:
+                # Blocked keyword but an allowed term too, e.g. "Classics (Extended Mix)"
+                title += rng.choice(SUFFIXES[1:4])
+        else:
+            title = f"{artist} - {rng.choice(WORDS)} {rng.choice(WORDS)}{rng.choice(SUFFIXES)}"
+        titles.append(title)
+    return titles
+
+
+def legacy_is_filtered(title, filter_keywords, allowed_terms):
+    """The loop previously copy-pasted in utils/sources/youtube.py."""
+    should_filter = False
+    for keyword in filter_keywords:
+        if keyword.lower() in title.lower():
+            has_allowed_term = False
+            for allowed in allowed_terms:
+                if allowed.lower() in title.lower():
+                    has_allowed_term = True
+                    break
+            if not has_allowed_term:
+                should_filter = True
+                break
+    return should_filter
+
+
+def timed(label, func, count):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed * 1000:9.1f} ms   {elapsed / count * 1e6:7.2f} us/title")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=100000, help="Corpus size (default: 100000)")
+    parser.add_argument("--extra-keywords", type=int, default=0,
+                        help="Add this many user keywords to the block list (default: 0)")
+    args = parser.parse_args()
+
+    titles = build_corpus(args.titles)
+    keywords = FILTER_KEYWORDS + [f"user keyword {i}" for i in range(args.extra_keywords)]
+    print(f"{len(titles)} titles, {len(keywords)} block keywords, {len(ALLOWED_TERMS)} allowed terms\n")
+
+    start = time.perf_counter()
+    title_filter = TitleFilter(keywords, ALLOWED_TERMS)
+    print(f"{'compile':<34} {(time.perf_counter() - start) * 1000:9.3f} ms")
+
+    legacy = timed("legacy nested loops", lambda: [legacy_is_filtered(t, keywords, ALLOWED_TERMS) for t in titles],
+                   len(titles))
+    single = timed("TitleFilter.is_filtered", lambda: [title_filter.is_filtered(t) for t in titles], len(titles))
+    batched = timed("TitleFilter.classify (50/page)",
+                    lambda: [flag for i in range(0, len(titles), 50)
+                             for flag in title_filter.classify(titles[i:i + 50])],
+                    len(titles))
+
+    if legacy != single or legacy != batched:
+        mismatches = sum(a != b or a != c for a, b, c in zip(legacy, single, batched))
+        print(f"\nMISMATCH: {mismatches} titles classified differently")
+        sys.exit(1)
+    print(f"\nAll methods agree; {sum(legacy)} of {len(titles)} titles filtered")
+
+
+if __name__ == "__main__":
+    main()
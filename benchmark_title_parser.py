@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Benchmark title parsing throughput on the golden title corpus.
+
+Checks every corpus title against its expected (artist, track, remix), then
+measures titles/sec for the old per-call regex parsing, the precompiled
+parser without the memo, and the memoized parser (repeat titles, as on
+every task).
+
+Usage:
+    python benchmark_title_parser.py [--rounds 200]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.sources import title_parser
+from utils.sources.title_parser import clear_title_cache, get_title_cache_stats, parse_youtube_title
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils", "sources", "title_corpus.json")
+
+
+def legacy_parse_youtube_title(title):
+    """YouTubeSource._parse_title as it was before the patterns were precompiled."""
+    title = title.strip()
+    patterns = [
+        r"^([^-]+)\s*-\s*([^(\[]+)(?:\(([^)]+)\))?",
+        r'^([^"]+)\s*"([^"]+)"(?:\s*\(([^)]+)\))?',
+        r"^([^']+)\s*'([^']+)'(?:\s*\(([^)]+)\))?",
+        r"^([^|]+)\s*\|\s*([^(\[]+)(?:\s*\(([^)]+)\))?",
+        r"^([^(byB)]+)\s+(?:by|BY)\s+([^(\[]+)(?:\s*\(([^)]+)\))?",
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, title)
+        if match:
+            groups = match.groups()
+            artist = groups[0].strip()
+            track_title = groups[1].strip()
+            remix = groups[2].strip() if groups[2] else None
+            if not remix:
+                remix_match = re.search(r'\(([^)]*(?:remix|mix|edit|version)[^)]*)\)', track_title, re.IGNORECASE)
+                if remix_match:
+                    remix = remix_match.group(1)
+                    track_title = re.sub(r'\s*\([^)]*(?:remix|mix|edit|version)[^)]*\)', '', track_title)
+            return artist, track_title, remix
+    for delimiter in [" - ", " | ", ": ", " _ "]:
+        if delimiter in title:
+            parts = title.split(delimiter, 1)
+            artist = parts[0].strip()
+            track_title = parts[1].strip()
+            remix_match = re.search(r'\(([^)]*(?:remix|mix|edit|version)[^)]*)\)', track_title, re.IGNORECASE)
+            if remix_match:
+                remix = remix_match.group(1)
+                track_title = re.sub(r'\s*\([^)]*(?:remix|mix|edit|version)[^)]*\)', '', track_title)
+            else:
+                remix = None
+            return artist, track_title, remix
+    return "Unknown Artist", title, None
+
+
+def throughput(label, parse, titles):
+    start = time.perf_counter()
+    for title in titles:
+        parse(title)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<30} {len(titles) / elapsed:12,.0f} titles/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200, help="Passes over the corpus (default: 200)")
+    args = parser.parse_args()
+
+    with open(CORPUS_PATH, encoding="utf-8") as corpus_file:
+        corpus = json.load(corpus_file)
+
+    cases = corpus["youtube"]
+    failures = [case["title"] for case in cases
+                if parse_youtube_title(case["title"]) != (case["artist"], case["track"], case["remix"])]
+    if failures:
+        print(f"{len(failures)} corpus titles parsed differently, e.g. {failures[0]!r}")
+        sys.exit(1)
+
+    titles = [case["title"] for case in cases] * args.rounds
+    print(f"{len(cases)} corpus titles x {args.rounds} rounds = {len(titles)} parses\n")
+
+    throughput("legacy (regex per call)", legacy_parse_youtube_title, titles)
+    throughput("precompiled, no memo", title_parser._parse_youtube_title, titles)
+    clear_title_cache()
+    throughput("precompiled + LRU memo", parse_youtube_title, titles)
+
+    stats = get_title_cache_stats()
+    print(f"\nMemo: {stats['size']} entries, hit rate {stats['hit_rate']:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Benchmark YouTube client construction: build() per call vs the shared factory.
+
+No network access is needed; the client is built from the discovery document
+bundled with google-api-python-client and no request is executed.
+
+Usage:
+    python benchmark_youtube_client.py [--calls 30]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from googleapiclient.discovery import build
+
+from utils.youtube_client import YouTubeClientFactory
+
+API_KEY = "benchmark-key"
+
+
+def time_calls(func, calls):
+    """Return per-call latencies in milliseconds."""
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label, latencies):
+    ordered = sorted(latencies)
+    print(f"{label:<28} first {latencies[0]:8.2f} ms   "
+          f"median {ordered[len(ordered) // 2]:8.2f} ms   "
+          f"total {sum(latencies):9.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=30,
+                        help="Clients requested, e.g. one per source of a task (default: 30)")
+    args = parser.parse_args()
+
+    print(f"Requesting a YouTube client {args.calls} times\n")
+
+    # What get_tracks_from_sources used to do for every source
+    report("build() per call", time_calls(
+        lambda: build("youtube", "v3", developerKey=API_KEY, cache_discovery=False),
+        args.calls
+    ))
+
+    # Fresh factory so the first call includes loading the discovery document
+    factory = YouTubeClientFactory()
+    report("YouTubeClientFactory", time_calls(lambda: factory.get_client(API_KEY), args.calls))
+    print(f"\nClients built by the factory: {factory.builds}")
+
+    # Building the request object is all that is left on the hot path
+    client = factory.get_client(API_KEY)
+    report("request construction", time_calls(
+        lambda: client.playlistItems().list(part="snippet", playlistId="PL0", maxResults=50),
+        args.calls
+    ))
+
+
+if __name__ == "__main__":
+    main()
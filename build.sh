@@ -22,4 +22,16 @@ if [ ! -z "$DATABASE_URL" ] && [ -f "migrate_postgres.py" ]; then
     python migrate_postgres.py
 fi
 
+# Add shared task state columns to playlist_tasks
+if [ -f "migrate_task_state.py" ]; then
+    echo "Running task state migration..."
+    python migrate_task_state.py
+fi
+
+# Add per-user title filter keywords to users
+if [ -f "migrate_user_filter_keywords.py" ]; then
+    echo "Running user filter keywords migration..."
+    python migrate_user_filter_keywords.py
+fi
+
 echo "Build complete!"
\ No newline at end of file
@@ -5,7 +5,6 @@ This script provides a command line interface for creating Spotify playlists
 from various music sources.
 """
 import argparse
-import asyncio
 import logging
 import os
 import sys
@@ -13,6 +12,7 @@ from datetime import datetime
 
 from dotenv import load_dotenv
 
+from utils.http_session import HTTP_SESSIONS
 from utils.sources.youtube import YouTubeSource
 from utils.destinations.spotify import SpotifyDestination
 from utils.sources.traxsource_new import TraxsourceSource
@@ -236,4 +236,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    sys.exit(asyncio.run(main()))
\ No newline at end of file
+    sys.exit(HTTP_SESSIONS.run(main()))
\ No newline at end of file
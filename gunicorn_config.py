@@ -1,8 +1,14 @@
 """Gunicorn configuration file for production deployment."""
 
+import os
+
 # Workers configuration
 workers = 2  # Number of worker processes
-worker_class = 'sync'  # Use sync workers for simplicity
+# Threaded workers so open progress streams (/api/status/<id>/stream) don't
+# block other requests; each open stream holds one thread, at most
+# STREAM_MAX_OPEN per worker (see RENDER_CONFIG.md)
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 16))
 worker_connections = 1000
 
 # Timeout configuration
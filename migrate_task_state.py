@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Migration to add shared processing state, track length filter and dedup columns to playlist_tasks table."""
+
+import os
+from dotenv import load_dotenv
+load_dotenv()
+
+from web_app import app, db
+from sqlalchemy import text
+
+# Column name -> SQL type (DATETIME is spelled differently per database)
+TASK_STATE_COLUMNS = {
+    'step': 'INTEGER DEFAULT 0',
+    'status_message': 'TEXT',
+    'sources_data': 'TEXT',
+    'tracks_data': 'TEXT',
+    'state_version': 'INTEGER DEFAULT 0',
+    'lease_owner': 'VARCHAR(100)',
+    'lease_expires_at': None,
+    'min_duration': 'INTEGER',
+    'max_duration': 'INTEGER',
+    'duplicates_removed': 'INTEGER DEFAULT 0',
+    'merge_near_duplicates': 'BOOLEAN DEFAULT FALSE',
+}
+
+def add_task_state_columns():
+    """Add step/message/lease/version, duration filter and dedup columns to playlist_tasks table."""
+    with app.app_context():
+        try:
+            # Check database type
+            is_sqlite = 'sqlite' in str(db.engine.url)
+            
+            if is_sqlite:
+                # SQLite approach - check pragma
+                result = db.session.execute(text("PRAGMA table_info(playlist_tasks)"))
+                existing = {row[1] for row in result}
+            else:
+                # PostgreSQL approach
+                result = db.session.execute(text("""
+                    SELECT column_name 
+                    FROM information_schema.columns 
+                    WHERE table_name='playlist_tasks'
+                """))
+                existing = {row[0] for row in result}
+            
+            for column, column_type in TASK_STATE_COLUMNS.items():
+                if column in existing:
+                    print(f"Column {column} already exists in playlist_tasks table")
+                    continue
+                
+                if column_type is None:
+                    column_type = 'DATETIME' if is_sqlite else 'TIMESTAMP'
+                
+                db.session.execute(text(f"ALTER TABLE playlist_tasks ADD COLUMN {column} {column_type}"))
+                print(f"Added {column} column to playlist_tasks table")
+            
+            db.session.commit()
+            print("Successfully migrated playlist_tasks table")
+            
+        except Exception as e:
+            print(f"Error adding task state columns: {e}")
+            db.session.rollback()
+            raise
+
+if __name__ == "__main__":
+    add_task_state_columns()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Migration to add filter_keywords column to users table."""
+
+import os
+from dotenv import load_dotenv
+load_dotenv()
+
+from web_app import app, db
+from sqlalchemy import text
+
+def add_filter_keywords_column():
+    """Add filter_keywords column to users table if it doesn't exist."""
+    with app.app_context():
+        try:
+            # Check database type
+            is_sqlite = 'sqlite' in str(db.engine.url)
+            
+            if is_sqlite:
+                # SQLite approach - check pragma
+                result = db.session.execute(text("PRAGMA table_info(users)"))
+                existing = {row[1] for row in result}
+            else:
+                # PostgreSQL approach
+                result = db.session.execute(text("""
+                    SELECT column_name 
+                    FROM information_schema.columns 
+                    WHERE table_name='users'
+                """))
+                existing = {row[0] for row in result}
+            
+            if 'filter_keywords' in existing:
+                print("Column filter_keywords already exists in users table")
+                return
+            
+            db.session.execute(text("ALTER TABLE users ADD COLUMN filter_keywords TEXT"))
+            db.session.commit()
+            print("Successfully added filter_keywords column to users table")
+            
+        except Exception as e:
+            print(f"Error adding filter_keywords column: {e}")
+            db.session.rollback()
+            raise
+
+if __name__ == "__main__":
+    add_filter_keywords_column()
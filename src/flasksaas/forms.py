@@ -43,6 +43,18 @@ class PlaylistForm(FlaskForm):
             (21, 'Last 3 weeks'),
             (30, 'Last month')
         ], default=14, coerce=int)
+    min_duration = SelectField('Minimum Length', choices=[
+            (0, 'Any length'),
+            (60, 'At least 1 minute'),
+            (120, 'At least 2 minutes')
+        ], default=0, coerce=int)
+    max_duration = SelectField('Maximum Length', choices=[
+            (0, 'Any length'),
+            (600, 'Up to 10 minutes'),
+            (900, 'Up to 15 minutes'),
+            (1200, 'Up to 20 minutes')
+        ], default=0, coerce=int)
+    merge_near_duplicates = BooleanField('Merge near-duplicate uploads')
     # This will be populated dynamically in the view
     selected_sources = SelectMultipleField('Select Sources', choices=[], coerce=str)
 
@@ -0,0 +1,271 @@
+"""
+Job queue for playlist generation tasks.
+
+Tasks are enqueued when they are created and run to completion by workers,
+so the status endpoint only reads task state instead of advancing the task
+inside the request.
+
+Backends (TASK_QUEUE_BACKEND):
+    thread   - worker threads inside each web process (default, also used for tests);
+               unfinished tasks are re-enqueued when the process starts
+    database - jobs stored in the task_jobs table and claimed by `python worker.py`
+"""
+import os
+import time
+import queue
+import socket
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, or_
+
+from src.flasksaas import db
+from src.flasksaas.models import PlaylistTask, TaskJob
+from .task_manager import cleanup_old_tasks, get_task, process_task_step, tasks, update_task_status
+
+logger = logging.getLogger(__name__)
+
+# Safety net against a task that never leaves the processing states
+MAX_TASK_STEPS = 10
+
+
+async def run_task(task_id: str) -> Optional[Dict[str, Any]]:
+    """Run a task's steps until it completes or fails.
+
+    Returns:
+        The final task dict, or None if the task does not exist
+    """
+    task = get_task(task_id)
+    if not task:
+        logger.warning(f"Task {task_id} not found, nothing to run")
+        return None
+
+    for _ in range(MAX_TASK_STEPS):
+        if task['status'] not in ['processing', 'running']:
+            break
+        # False means another worker holds the task's lease; leave it to them
+        if not await process_task_step(task_id):
+            break
+    else:
+        update_task_status(task_id, status='error', message='Task did not finish, please try again.',
+                           error='Exceeded maximum number of steps')
+
+    return task
+
+
+class ThreadJobQueue:
+    """Runs tasks on worker threads inside the web process."""
+
+    # Task state is updated in this process's memory, so reads can use it
+    out_of_process = False
+
+    def __init__(self, app, workers: int = 2):
+        self.app = app
+        self.workers = workers
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._threads = []
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"task-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Started {self.workers} task worker threads")
+
+        try:
+            with self.app.app_context():
+                recovered = self.recover()
+            if recovered:
+                logger.info(f"Re-enqueued {recovered} unfinished tasks")
+        except Exception as e:
+            logger.error(f"Could not recover unfinished tasks: {e}", exc_info=True)
+
+    def recover(self, max_age: timedelta = timedelta(days=1)) -> int:
+        """Re-enqueue unfinished tasks that no live worker holds.
+
+        The queue only lives in memory, so tasks that were queued or running
+        when the process stopped would otherwise never finish. Tasks whose
+        step lease is still held are left alone; if another process is still
+        running them, the lease keeps a step from running twice anyway.
+
+        Args:
+            max_age: Tasks created longer ago than this are not resumed
+
+        Returns:
+            Number of tasks enqueued
+        """
+        now = datetime.utcnow()
+        task_ids = [task_id for (task_id,) in db.session.query(PlaylistTask.id).filter(
+            PlaylistTask.status.in_(['processing', 'running']),
+            PlaylistTask.created_at >= now - max_age,
+            or_(PlaylistTask.lease_owner.is_(None),
+                PlaylistTask.lease_expires_at.is_(None),
+                PlaylistTask.lease_expires_at < now)
+        ).order_by(PlaylistTask.created_at)]
+
+        for task_id in task_ids:
+            self.enqueue(task_id)
+        return len(task_ids)
+
+    def enqueue(self, task_id: str) -> None:
+        self._queue.put(task_id)
+
+    def _work(self) -> None:
+        # One loop per worker thread for its lifetime, so the pooled HTTP session
+        # (bound to the loop) keeps its connections between tasks
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        while True:
+            task_id = self._queue.get()
+            try:
+                with self.app.app_context():
+                    loop.run_until_complete(run_task(task_id))
+                    cleanup_old_tasks()
+            except Exception as e:
+                logger.error(f"Task worker failed on task {task_id}: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+
+class DatabaseJobQueue:
+    """Stores jobs in the task_jobs table for separate worker processes.
+
+    Workers claim a job with a conditional UPDATE on its status, so a job is
+    only run by one worker. Jobs left running by a crashed worker are
+    reclaimed after stale_after seconds, up to max_attempts times.
+    """
+
+    # Task state is written to the database by another process
+    out_of_process = True
+
+    def __init__(self, app, stale_after: int = 900, max_attempts: int = 3):
+        self.app = app
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        """Nothing to start in the web process; run worker.py instead."""
+
+    def enqueue(self, task_id: str) -> None:
+        db.session.add(TaskJob(task_id=task_id))
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def claim(self, worker_id: str) -> Optional[str]:
+        """Claim the oldest runnable job.
+
+        Returns:
+            The claimed task ID, or None if there is nothing to run
+        """
+        stale_cutoff = datetime.utcnow() - timedelta(seconds=self.stale_after)
+        candidates = TaskJob.query.filter(
+            TaskJob.attempts < self.max_attempts,
+            or_(TaskJob.status == 'queued',
+                and_(TaskJob.status == 'running', TaskJob.started_at < stale_cutoff))
+        ).order_by(TaskJob.enqueued_at).limit(5).all()
+
+        for job in candidates:
+            # Only succeeds if no other worker changed the job since we read it
+            claimed = TaskJob.query.filter(
+                TaskJob.id == job.id,
+                TaskJob.status == job.status,
+                TaskJob.attempts == job.attempts
+            ).update({
+                TaskJob.status: 'running',
+                TaskJob.worker_id: worker_id,
+                TaskJob.started_at: datetime.utcnow(),
+                TaskJob.attempts: TaskJob.attempts + 1
+            }, synchronize_session=False)
+            db.session.commit()
+
+            if claimed:
+                return job.task_id
+
+        return None
+
+    def finish(self, task_id: str, error: Optional[str] = None) -> None:
+        TaskJob.query.filter_by(task_id=task_id, status='running').update({
+            TaskJob.status: 'failed' if error else 'done',
+            TaskJob.error: error,
+            TaskJob.finished_at: datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+
+    def run_worker(self, worker_id: Optional[str] = None, poll_interval: float = 1.0) -> None:
+        """Claim and run jobs forever."""
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        logger.info(f"Task worker {worker_id} started")
+
+        while True:
+            try:
+                with self.app.app_context():
+                    if self.run_next(worker_id):
+                        continue
+                    cleanup_old_tasks()
+            except Exception as e:
+                logger.error(f"Task worker {worker_id} error: {e}", exc_info=True)
+            time.sleep(poll_interval)
+
+    def run_next(self, worker_id: str) -> bool:
+        """Claim and run one job. Returns False if the queue was empty."""
+        task_id = self.claim(worker_id)
+        if not task_id:
+            return False
+
+        logger.info(f"Worker {worker_id} running task {task_id}")
+        try:
+            task = self._event_loop().run_until_complete(run_task(task_id))
+            error = task.get('error') if task and task['status'] == 'error' else None
+            self.finish(task_id, error=error)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Task {task_id} failed: {e}", exc_info=True)
+            self.finish(task_id, error=str(e))
+        finally:
+            # The database is the source of truth for other processes
+            tasks.pop(task_id, None)
+        return True
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """The worker's event loop, kept across jobs so pooled HTTP connections are reused."""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+        return self._loop
+
+
+job_queue = None
+
+
+def init_job_queue(app):
+    """Create and start the job queue selected by TASK_QUEUE_BACKEND."""
+    global job_queue
+
+    backend = os.environ.get("TASK_QUEUE_BACKEND", "thread").lower()
+    if backend == "database":
+        job_queue = DatabaseJobQueue(app)
+    else:
+        job_queue = ThreadJobQueue(app, workers=int(os.environ.get("TASK_QUEUE_WORKERS", 2)))
+
+    job_queue.start()
+    logger.info(f"Task job queue backend: {backend}")
+    return job_queue
+
+
+def enqueue_task(task_id: str) -> None:
+    """Queue a task to be run by a worker."""
+    if job_queue is None:
+        raise RuntimeError("Job queue not initialized, call init_job_queue(app) first")
+    job_queue.enqueue(task_id)
+
+
+def task_state_is_remote() -> bool:
+    """Whether task state must be read from the database rather than memory."""
+    return bool(job_queue and job_queue.out_of_process)
@@ -1,21 +1,34 @@
 """Main blueprint for core application routes."""
+import os
 import time
+import queue
 import asyncio
+import threading
 import csv
 import io
 import json
 import uuid
 import gzip
 import base64
+import hashlib
 from datetime import datetime, timedelta
-from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify, current_app, session, send_file, make_response
+from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify, current_app, session, send_file, make_response, Response, stream_with_context
 from flask_login import login_required, current_user
 from flask_wtf.csrf import generate_csrf
 from flask_mail import Message, Mail
 
 # Import the PlaylistForm from the correct location
 from src.flasksaas.forms import PlaylistForm
-from src.flasksaas.main.task_manager import create_new_task, process_task_step, get_task, get_user_tasks, tasks, TaskManager
+from src.flasksaas.main.task_manager import create_new_task, get_task, get_task_version, get_user_tasks, tasks, TaskManager, resolve_channel_source
+from src.flasksaas.main.task_events import task_events
+from src.flasksaas.main.job_queue import enqueue_task, task_state_is_remote
+from utils.sources.youtube import get_page_cache_stats
+from utils.sources.title_filter import parse_keywords
+from utils.youtube_executor import YOUTUBE_EXECUTOR
+from utils.http_session import HTTP_SESSIONS
+from utils.spotify_scheduler import SPOTIFY_SCHEDULER
+from utils.destinations.spotify_queries import SPOTIFY_QUERY_STATS
+from utils.youtube_quota import QUOTA_MANAGER, quota_attribution
 from ..models import User, UserSource, GeneratedPlaylist
 from .. import db
 
@@ -126,8 +139,12 @@ def create():
                 genre=form.genre.data if not current_user.has_active_subscription else 'all',
                 days=form.days.data,
                 public=True,  # Default to True since we removed the form field
-                source_selection='both' if not selected_sources else selected_sources
+                source_selection='both' if not selected_sources else selected_sources,
+                min_duration=form.min_duration.data or None,
+                max_duration=form.max_duration.data or None,
+                merge_near_duplicates=form.merge_near_duplicates.data
             )
+            enqueue_task(task_id)
             
             # No flash message needed - the status page will show the progress
             return redirect(url_for('main.status', task_id=task_id))
@@ -165,7 +182,7 @@ def status(task_id):
     print(f"Status route accessed for task {task_id} by user {current_user.id}")
     
     # Get task using the task manager
-    task = get_task(task_id)
+    task = get_task(task_id, refresh=task_state_is_remote())
     if not task:
         flash("Task not found.", "error")
         return redirect(url_for('main.dashboard'))
@@ -202,16 +219,15 @@ def debug_status(task_id):
 
 @main_bp.route('/api/status/<task_id>')
 def api_status(task_id):
-    """API endpoint to get task status."""
-    print(f"API status called for task {task_id}")
-    print(f"Session ID: {session.get('_id', 'No session ID')}")
-    print(f"Session keys: {list(session.keys())}")
-    print(f"Current user: {getattr(current_user, 'id', 'Not authenticated')}")
+    """API endpoint to get task status.
     
-    # Get task using the task manager
-    task = get_task(task_id)
+    Returns progress fields only; a completed task's result is fetched once
+    from result_url. The response carries an ETag, so an unchanged status
+    is answered with 304 Not Modified.
+    """
+    # Get task using the task manager (tasks are run by the job queue workers)
+    task = get_task(task_id, refresh=task_state_is_remote())
     if not task:
-        print(f"Task {task_id} not found")
         return jsonify({'error': 'Task not found'}), 404
     
     # Require authentication and ownership check
@@ -221,53 +237,178 @@ def api_status(task_id):
     if task['user_id'] != current_user.id:
         return jsonify({'error': 'Access denied'}), 403
     
-    print(f"Task found: user_id={task['user_id']}, status={task['status']}, step={task['step']}")
+    # Return the current task status
+    response_data = _progress_fields(task)
+    response_data['version'] = task.get('version', 0)
+    
+    if task['status'] in ['completed', 'complete']:
+        response_data['result_url'] = url_for('main.api_task_result', task_id=task_id)
+    elif task['status'] == 'error':
+        response_data['error'] = task.get('message', 'Unknown error')
+    
+    body = json.dumps(response_data, separators=(',', ':'))
+    response = make_response(body)
+    response.mimetype = 'application/json'
+    response.set_etag(hashlib.md5(body.encode('utf-8')).hexdigest()[:16])
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
+
+@main_bp.route('/api/tasks/<task_id>/result')
+@login_required
+def api_task_result(task_id):
+    """Result of a completed task, gzip-compressed and cacheable.
+    
+    A completed task's result never changes, so clients revalidate with
+    If-None-Match and get 304 Not Modified without the body.
+    """
+    task = get_task(task_id, refresh=task_state_is_remote())
+    if not task:
+        return jsonify({'error': 'Task not found'}), 404
+    
+    if task['user_id'] != current_user.id:
+        return jsonify({'error': 'Access denied'}), 403
     
-    # Store pre-processing state for debugging
-    pre_status = task['status']
-    pre_step = task['step']
-    pre_progress = task['progress']
+    if task['status'] not in ['completed', 'complete']:
+        return jsonify({'error': 'Task has not completed yet'}), 409
     
-    print(f"API status: Task {task_id} before processing - status: {pre_status}, step: {pre_step}, progress: {pre_progress}%")
+    response = make_response(json.dumps(_task_result_payload(task), separators=(',', ':'), default=str))
+    response.mimetype = 'application/json'
+    compress = ('gzip' in request.headers.get('Accept-Encoding', '')
+                and response.content_length and response.content_length > RESULT_GZIP_MIN_BYTES)
+    # The gzip and identity bodies differ, so they must not share a strong ETag
+    etag = f"{task_id}-{task.get('version', 0)}"
+    response.set_etag(f"{etag}-gz" if compress else etag)
+    response.headers['Cache-Control'] = 'private, max-age=3600'
+    response.vary.add('Accept-Encoding')
+    response = response.make_conditional(request)
     
-    # If the task is still in progress, advance it by one step
-    was_updated = False
-    if task['status'] not in ['completed', 'error']:
-        # This will update the task state if needed
-        was_updated = asyncio.run(process_task_step(task_id))
-        task = get_task(task_id)  # Get updated task
-        print(f"API status: Task {task_id} after processing - status: {task['status']}, step: {task['step']}, progress: {task['progress']}%, updated: {was_updated}")
+    if compress and response.status_code == 200:
+        response.set_data(gzip.compress(response.get_data(), compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
     
-    # Return the current task status
-    response_data = {
+    return response
+
+
+def _task_result_payload(task):
+    """Result fields sent to the status page once a task has completed."""
+    result = task.get('result') or {}
+    return {
+        'result': result,  # Includes the track list
+        'total_tracks': result.get('track_count', len(result.get('tracks', []))),
+        'has_csv': bool(task.get('csv_data')),  # CSV itself is served by /download
+        'spotify_playlist_url': task.get('spotify_playlist_url')
+    }
+
+
+def _progress_fields(task):
+    """Progress fields pushed to the status page while a task is running."""
+    return {
         'status': task['status'],
         'progress': task['progress'],
         'message': task['message'],
-        'step': task['step'],
-        'authenticated': True,
-        'was_updated': was_updated,
-        'pre_status': pre_status,
-        'pre_step': pre_step,
-        'pre_progress': pre_progress
+        'step': task['step']
     }
+
+
+def _sse(event, data):
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+# Results smaller than this are not worth compressing
+RESULT_GZIP_MIN_BYTES = 1024
+
+# Progress stream tuning: how often to check the DB for updates from other
+# processes, when to send a keep-alive comment, and when to end the stream so
+# the worker thread is freed (EventSource reconnects after STREAM_RETRY_MS)
+STREAM_DB_CHECK_SECONDS = 2
+STREAM_KEEPALIVE_SECONDS = 15
+STREAM_MAX_SECONDS = 30
+STREAM_RETRY_MS = 2000
+
+# Each open stream holds a worker thread, so only this many are open at once
+# per process; further status pages are told to poll instead
+STREAM_MAX_OPEN = int(os.environ.get("STREAM_MAX_OPEN", 8))
+_stream_slots = threading.BoundedSemaphore(STREAM_MAX_OPEN)
+
+
+@main_bp.route('/api/status/<task_id>/stream')
+@login_required
+def api_status_stream(task_id):
+    """Server-Sent Events stream of task progress.
+    
+    Sends the changed progress fields whenever the task is updated, then the
+    full result once when it completes. A stream ends after one step
+    transition or STREAM_MAX_SECONDS and the browser reconnects, so no
+    thread is held for the whole task. The status page falls back to
+    polling /api/status/<task_id> if the stream cannot be opened or all
+    STREAM_MAX_OPEN streams are in use ("busy" event).
+    """
+    task = get_task(task_id, refresh=task_state_is_remote())
+    if not task:
+        return jsonify({'error': 'Task not found'}), 404
     
-    # Add task results if complete
-    if task['status'] == 'completed':
-        response_data.update({
-            'tracks': task.get('tracks', []),
-            'sources': task.get('sources', []),
-            'total_tracks': len(task.get('tracks', [])),
-            'result': task.get('result'),  # Include the result object for the frontend
-            'csv_data': task.get('csv_data'),  # Include CSV data for download button
-            'matched_tracks': task.get('matched_tracks'),
-            'unmatched_tracks': task.get('unmatched_tracks'),
-            'spotify_playlist_url': task.get('spotify_playlist_url')
-        })
-    elif task['status'] == 'error':
-        response_data['error'] = task.get('message', 'Unknown error')
+    if task['user_id'] != current_user.id:
+        return jsonify({'error': 'Access denied'}), 403
+    
+    subscription = task_events.subscribe(task_id)
+    
+    def generate():
+        # Taken when the stream starts rather than in the view, so a response
+        # that is never sent cannot hold a slot
+        if not _stream_slots.acquire(blocking=False):
+            task_events.unsubscribe(task_id, subscription)
+            yield _sse('busy', {})
+            return
+        try:
+            current = task
+            sent = {}
+            version = current.get('version', 0)
+            first_step = current['step']
+            started_at = last_sent_at = time.time()
+            yield f"retry: {STREAM_RETRY_MS}\n\n"
+            
+            while True:
+                if current['status'] in ['completed', 'complete']:
+                    yield _sse('result', {**_progress_fields(current), **_task_result_payload(current)})
+                    yield _sse('done', {})
+                    return
+                if current['status'] == 'error':
+                    yield _sse('failed', {'error': current.get('message', 'Unknown error')})
+                    return
+                
+                state = _progress_fields(current)
+                delta = {key: value for key, value in state.items() if sent.get(key) != value}
+                if delta:
+                    yield _sse('progress', delta)
+                    sent.update(delta)
+                    last_sent_at = time.time()
+                elif time.time() - last_sent_at >= STREAM_KEEPALIVE_SECONDS:
+                    yield ": keep-alive\n\n"
+                    last_sent_at = time.time()
+                
+                if current['step'] != first_step or time.time() - started_at >= STREAM_MAX_SECONDS:
+                    return
+                
+                try:
+                    subscription.get(timeout=STREAM_DB_CHECK_SECONDS)
+                except queue.Empty:
+                    # Updates made by other processes only show up in the database
+                    db.session.rollback()  # end the read transaction to see new commits
+                    db_version = get_task_version(task_id)
+                    if db_version is None or db_version == version:
+                        continue
+                
+                current = get_task(task_id, refresh=task_state_is_remote()) or current
+                version = current.get('version', version)
+        finally:
+            task_events.unsubscribe(task_id, subscription)
+            _stream_slots.release()
     
-    print(f"API response: {response_data}")
-    return jsonify(response_data)
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 
 @main_bp.route('/test-api/<task_id>')
 @login_required
@@ -282,10 +423,6 @@ def test_api(task_id):
     if task['user_id'] != current_user.id:
         return f"Task belongs to user {task['user_id']}, current user is {current_user.id}"
     
-    # Try to process the task
-    was_updated = asyncio.run(process_task_step(task_id))
-    task = get_task(task_id)
-    
     return f"""
     <h2>Task {task_id} Debug Info</h2>
     <p><strong>User ID:</strong> {current_user.id}</p>
@@ -294,7 +431,6 @@ def test_api(task_id):
     <p><strong>Step:</strong> {task['step']}</p>
     <p><strong>Progress:</strong> {task['progress']}%</p>
     <p><strong>Message:</strong> {task['message']}</p>
-    <p><strong>Was Updated:</strong> {was_updated}</p>
     <p><strong>Session ID:</strong> {session.get('_id', 'No session ID')}</p>
     <p><strong>CSRF Token:</strong> {generate_csrf()}</p>
     <p><strong>Last Updated:</strong> {task['last_updated']}</p>
@@ -307,7 +443,7 @@ def test_api(task_id):
 def simple_status(task_id):
     """Simple status page that passes task data directly to template."""
     # Get task using the task manager
-    task = get_task(task_id)
+    task = get_task(task_id, refresh=task_state_is_remote())
     if not task:
         flash("Task not found.", "error")
         return redirect(url_for('main.dashboard'))
@@ -317,11 +453,6 @@ def simple_status(task_id):
         flash("Access denied.", "error")
         return redirect(url_for('main.dashboard'))
     
-    # Process the task if it's not complete
-    if task['status'] not in ['completed', 'error']:
-        asyncio.run(process_task_step(task_id))
-        task = get_task(task_id)  # Get updated task
-    
     return render_template('simple_status.html', task_id=task_id, task=task)
 
 @main_bp.route('/download/<task_id>')
@@ -510,6 +641,10 @@ def add_source():
             db.session.add(new_source)
             db.session.commit()
             
+            # Resolve the uploads playlist now so generation skips the lookup
+            if source_type == 'channel':
+                resolve_channel_source(source_url, user_id=current_user.id)
+            
             flash(f"Successfully added '{name}' to your custom sources!", "success")
             return redirect(url_for('main.sources'))
             
@@ -554,6 +689,35 @@ def delete_source(source_id):
     return redirect(url_for('main.sources'))
 
 
+# Upper bound on a user's own title filter keywords
+MAX_FILTER_KEYWORDS = 50
+
+
+@main_bp.route("/sources/filters", methods=["POST"])
+@login_required
+def update_filter_keywords():
+    """Save the user's extra title filter keywords."""
+    if not current_user.has_active_subscription:
+        flash("Access denied.", "error")
+        return redirect(url_for('main.dashboard'))
+    
+    keywords = parse_keywords(request.form.get("filter_keywords", ""))
+    if len(keywords) > MAX_FILTER_KEYWORDS:
+        flash(f"You can add up to {MAX_FILTER_KEYWORDS} filter keywords.", "error")
+        return redirect(url_for('main.sources'))
+    
+    try:
+        current_user.filter_keywords = ", ".join(keywords) or None
+        db.session.commit()
+        flash("Filter keywords saved.", "success")
+    except Exception as e:
+        db.session.rollback()
+        flash("An error occurred while saving your filter keywords.", "error")
+        current_app.logger.error(f"Error saving filter keywords: {e}")
+    
+    return redirect(url_for('main.sources'))
+
+
 @main_bp.route("/sources/<int:source_id>/toggle", methods=["POST"])
 @login_required
 def toggle_source(source_id):
@@ -680,21 +844,22 @@ def view_history(playlist_id):
 def debug_playlist(playlist_id):
     """Debug endpoint to test individual YouTube playlists."""
     import os
-    from googleapiclient.discovery import build
+    from utils.youtube_client import get_youtube_client
     
     api_key = os.environ.get("YOUTUBE_API_KEY")
     if not api_key:
         return jsonify({"error": "No YouTube API key configured"}), 500
     
     try:
-        youtube = build("youtube", "v3", developerKey=api_key)
+        youtube = get_youtube_client(api_key)
         
         # Get playlist info
         playlist_request = youtube.playlists().list(
             part="snippet,contentDetails",
             id=playlist_id
         )
-        playlist_response = playlist_request.execute()
+        with quota_attribution(user_id=current_user.id):
+            playlist_response = QUOTA_MANAGER.execute_blocking(playlist_request, "playlists.list")
         
         if not playlist_response.get("items"):
             return jsonify({"error": "Playlist not found", "playlist_id": playlist_id}), 404
@@ -707,7 +872,8 @@ def debug_playlist(playlist_id):
             playlistId=playlist_id,
             maxResults=20
         )
-        items_response = playlist_items_request.execute()
+        with quota_attribution(user_id=current_user.id):
+            items_response = QUOTA_MANAGER.execute_blocking(playlist_items_request, "playlistItems.list")
         
         videos = []
         for item in items_response.get("items", []):
@@ -729,6 +895,32 @@ def debug_playlist(playlist_id):
         return jsonify({"error": str(e), "playlist_id": playlist_id}), 500
 
 
+def is_admin(user) -> bool:
+    """Whether the user's email is listed in the ADMIN_EMAILS env var (comma-separated)."""
+    admin_emails = {
+        email.strip().lower()
+        for email in os.environ.get("ADMIN_EMAILS", "").split(",")
+        if email.strip()
+    }
+    return bool(user.is_authenticated and user.email and user.email.lower() in admin_emails)
+
+
+@main_bp.route("/admin/quota")
+@login_required
+def admin_quota():
+    """YouTube API quota usage for today, with the page cache and I/O pool counters."""
+    if not is_admin(current_user):
+        return jsonify({"error": "Forbidden"}), 403
+    
+    quota = QUOTA_MANAGER.snapshot()
+    quota['page_cache'] = get_page_cache_stats()
+    quota['executor'] = YOUTUBE_EXECUTOR.stats()
+    quota['http_sessions'] = HTTP_SESSIONS.stats()
+    quota['spotify'] = SPOTIFY_SCHEDULER.stats()
+    quota['spotify_queries'] = SPOTIFY_QUERY_STATS.snapshot()
+    return jsonify(quota)
+
+
 @main_bp.route("/contact", methods=["GET", "POST"])
 def contact():
     """Contact form page."""
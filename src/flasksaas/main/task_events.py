@@ -0,0 +1,48 @@
+"""
+In-process pub/sub for task progress events.
+
+update_task_status publishes every state change here, and the Server-Sent
+Events endpoint subscribes per task so progress is pushed to the browser as
+soon as it happens. Events only reach subscribers in the same process; the
+stream also watches the task's state_version in the database to pick up
+changes made by other workers.
+"""
+import queue
+import threading
+from typing import Any, Dict, List
+
+
+class TaskEventBroker:
+    """Fans task events out to per-subscriber queues."""
+
+    def __init__(self, max_pending: int = 100):
+        self.max_pending = max_pending
+        self._subscribers: Dict[str, List[queue.Queue]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, task_id: str) -> queue.Queue:
+        subscription: queue.Queue = queue.Queue(maxsize=self.max_pending)
+        with self._lock:
+            self._subscribers.setdefault(task_id, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, task_id: str, subscription: queue.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(task_id, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers:
+                self._subscribers.pop(task_id, None)
+
+    def publish(self, task_id: str, event: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(task_id, []))
+        for subscription in subscribers:
+            try:
+                subscription.put_nowait(event)
+            except queue.Full:
+                # A slow client only needs the latest state, which it re-reads anyway
+                pass
+
+
+task_events = TaskEventBroker()
@@ -1,8 +1,12 @@
 """
 Task manager for handling playlist creation tasks.
 """
+import os
 import time
+import json
+import socket
 import asyncio
+import threading
 import re
 import csv
 import io
@@ -11,18 +15,37 @@ from typing import Dict, List, Optional, Callable, Any
 import uuid
 import logging
 
+from sqlalchemy import or_
+
 # Import the real playlist generation functionality
 from utils.sources.youtube import YouTubeSource
+from utils.sources.dedup import TrackDeduplicator
+from utils.sources.near_dedup import NearDuplicateClusterer
+from utils.sources.durations import format_duration, parse_iso8601_duration, within_duration
+from utils.sources.title_filter import parse_keywords
+from utils.youtube_quota import quota_attribution
+from utils.http_session import HTTP_SESSIONS
 from src.flasksaas.models import User, UserSource, PlaylistTask, GeneratedPlaylist
+from src.flasksaas.stores import DatabaseChannelResolutionStore, DatabaseSyncStateStore
 from src.flasksaas import db
+from .task_events import task_events
 import gzip
 import base64
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# In-memory task storage (in production, use Redis or database)
+# In-memory task cache; the playlist_tasks row is the shared source of truth
 tasks: Dict[str, Dict[str, Any]] = {}
+# Guards the cached versions and swapping in refreshed copies of tasks
+tasks_lock = threading.Lock()
+
+# Seconds a worker may hold a task step before another worker can take it over
+TASK_LEASE_SECONDS = int(os.environ.get("TASK_LEASE_SECONDS", 300))
+
+# Step 1: how many sources are fetched at once, and how long one source may take
+SOURCE_FETCH_CONCURRENCY = int(os.environ.get("SOURCE_FETCH_CONCURRENCY", 5))
+SOURCE_FETCH_TIMEOUT = float(os.environ.get("SOURCE_FETCH_TIMEOUT", 90))
 
 def update_task_status(task_id: str, status: str = None, progress: int = None, message: str = None, **kwargs):
     """Update task status in both memory and database."""
@@ -50,7 +73,7 @@ def update_task_status(task_id: str, status: str = None, progress: int = None, m
             db_task.progress = progress
         if status in ['completed', 'complete']:
             db_task.completed_at = datetime.utcnow()
-        elif status == 'failed' and 'error' in kwargs:
+        elif status in ['failed', 'error'] and 'error' in kwargs:
             db_task.error_message = str(kwargs['error'])
         
         # Update results if provided
@@ -62,14 +85,116 @@ def update_task_status(task_id: str, status: str = None, progress: int = None, m
             db_task.tracks_found = kwargs['tracks_found']
         if 'tracks_matched' in kwargs:
             db_task.tracks_matched = kwargs['tracks_matched']
+        if 'duplicates_removed' in kwargs:
+            db_task.duplicates_removed = kwargs['duplicates_removed']
         if 'csv_data' in kwargs:
             db_task.csv_data = kwargs['csv_data']
-            
-        db.session.commit()
+        
+        # Shared processing state
+        if message is not None:
+            db_task.status_message = message
+        if 'step' in kwargs:
+            db_task.step = kwargs['step']
+        if 'sources' in kwargs:
+            db_task.sources_data = json.dumps(kwargs['sources'])
+        if 'tracks' in kwargs:
+            db_task.tracks_data = json.dumps(kwargs['tracks'])
+        db_task.state_version = (db_task.state_version or 0) + 1
+        
+        # Record the new version before it is visible in the database, so
+        # get_task never sees this process's own write as a newer version
+        with tasks_lock:
+            cached = tasks.get(task_id)
+            previous_version = cached.get('version', 0) if cached is not None else None
+            if cached is not None:
+                cached['version'] = db_task.state_version
+        try:
+            db.session.commit()
+        except Exception:
+            with tasks_lock:
+                if cached is not None and cached.get('version') == db_task.state_version:
+                    cached['version'] = previous_version
+            raise
+        
+        # Push the change to open progress streams in this process
+        task_events.publish(task_id, {
+            'status': db_task.status,
+            'progress': db_task.progress,
+            'message': db_task.status_message,
+            'step': db_task.step,
+            'version': db_task.state_version
+        })
+
+
+def get_task_version(task_id: str) -> Optional[int]:
+    """Return the task's state_version without loading the row."""
+    return db.session.query(PlaylistTask.state_version).filter_by(id=task_id).scalar()
+
+
+def claim_task_step(task_id: str, step: int, owner: str) -> bool:
+    """Atomically take the lease on a task step.
+    
+    Only one worker (across processes and nodes) can hold a task's lease; it
+    expires after TASK_LEASE_SECONDS so a crashed worker's task is picked up
+    again. Fails if the task is no longer at this step.
+    
+    Args:
+        task_id: Task UUID
+        step: Step the caller wants to run
+        owner: Worker identifier, see worker_identity()
+        
+    Returns:
+        True if the caller now holds the lease
+    """
+    now = datetime.utcnow()
+    claimed = PlaylistTask.query.filter(
+        PlaylistTask.id == task_id,
+        PlaylistTask.step == step,
+        PlaylistTask.status.in_(['processing', 'running']),
+        or_(PlaylistTask.lease_owner.is_(None),
+            PlaylistTask.lease_owner == owner,
+            PlaylistTask.lease_expires_at < now)
+    ).update({
+        PlaylistTask.lease_owner: owner,
+        PlaylistTask.lease_expires_at: now + timedelta(seconds=TASK_LEASE_SECONDS)
+    }, synchronize_session=False)
+    db.session.commit()
+    return claimed == 1
+
+
+def extend_task_lease(task_id: str, owner: str) -> None:
+    """Push back the lease expiry while a long step is still running."""
+    PlaylistTask.query.filter_by(id=task_id, lease_owner=owner).update({
+        PlaylistTask.lease_expires_at: datetime.utcnow() + timedelta(seconds=TASK_LEASE_SECONDS)
+    }, synchronize_session=False)
+    db.session.commit()
+
+
+def release_task_lease(task_id: str, owner: str) -> None:
+    """Give up the lease so another worker can run the next step."""
+    PlaylistTask.query.filter_by(id=task_id, lease_owner=owner).update({
+        PlaylistTask.lease_owner: None,
+        PlaylistTask.lease_expires_at: None
+    }, synchronize_session=False)
+    db.session.commit()
+
+
+def get_user_filter_keywords(user_id: Optional[int]) -> tuple:
+    """Return the user's extra title filter keywords, if they set any."""
+    if not user_id:
+        return ()
+    user = User.query.get(user_id)
+    return parse_keywords(user.filter_keywords) if user else ()
+
+
+def worker_identity() -> str:
+    """Identify the current worker thread across processes and hosts."""
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
 
 class TaskManager:
     def __init__(self):
-        self.youtube_source = YouTubeSource()
+        self.youtube_source = YouTubeSource(sync_store=DatabaseSyncStateStore(),
+                                            resolution_store=DatabaseChannelResolutionStore())
     
     async def create_playlist_task(self, genre: str, track_count: int, progress_callback=None) -> Dict:
         """Create a playlist by fetching real tracks from YouTube."""
@@ -116,7 +241,7 @@ class TaskManager:
                     'remix': track.remix,
                     'source': track.source,
                     'source_url': track.source_url,
-                    'duration': "3:30",  # Default duration since YouTube API doesn't provide this easily
+                    'duration': format_duration(parse_iso8601_duration(track.duration)),
                     'youtube_id': track.source_url.split('v=')[-1] if 'v=' in track.source_url else None
                 }
                 track_dicts.append(track_dict)
@@ -265,6 +390,27 @@ def get_selected_sources(genre: str, user_id: int, selected_source_ids: List[str
     return sources
 
 
+def resolve_channel_source(source_url: str, user_id: Optional[int] = None) -> None:
+    """Resolve a channel source's uploads playlist up front and store it.
+    
+    Failures are only logged; the source is resolved again on first use.
+    """
+    channel_ref = extract_youtube_id(source_url)
+    if not channel_ref:
+        return
+    
+    try:
+        youtube_source = YouTubeSource(resolution_store=DatabaseChannelResolutionStore())
+        with quota_attribution(user_id=user_id):
+            resolution = HTTP_SESSIONS.run(youtube_source.resolve_channel(channel_ref))
+        if resolution:
+            logger.info(f"Resolved {channel_ref} to uploads playlist {resolution.uploads_playlist_id}")
+        else:
+            logger.warning(f"Could not resolve channel source {channel_ref}")
+    except Exception as e:
+        logger.warning(f"Error resolving channel source {channel_ref}: {e}")
+
+
 def extract_youtube_id(url: str) -> Optional[str]:
     """Extract YouTube channel or playlist ID from URL."""
     try:
@@ -306,8 +452,14 @@ def extract_youtube_id(url: str) -> Optional[str]:
         logger.error(f"Error extracting YouTube ID from URL {url}: {e}")
         return None
 
-def create_new_task(user_id: int, playlist_name: str, description: str, genre: str, days: int, public: bool, source_selection = 'both') -> str:
-    """Create a new playlist generation task."""
+def create_new_task(user_id: int, playlist_name: str, description: str, genre: str, days: int, public: bool, source_selection = 'both',
+                    min_duration: Optional[int] = None, max_duration: Optional[int] = None,
+                    merge_near_duplicates: bool = False) -> str:
+    """Create a new playlist generation task.
+    
+    min_duration/max_duration (seconds) drop videos outside that length range.
+    merge_near_duplicates also merges re-uploads whose titles differ slightly.
+    """
     task_id = str(uuid.uuid4())
     
     try:
@@ -330,7 +482,10 @@ def create_new_task(user_id: int, playlist_name: str, description: str, genre: s
             genre=genre,
             days=days,
             is_public=public,
-            source_selection=source_selection_str
+            source_selection=source_selection_str,
+            min_duration=min_duration,
+            max_duration=max_duration,
+            merge_near_duplicates=merge_near_duplicates
         )
         db.session.add(db_task)
         db.session.commit()
@@ -353,6 +508,7 @@ def create_new_task(user_id: int, playlist_name: str, description: str, genre: s
         'progress': 0,
         'message': "Hold tight! We're fetching your fresh tracks...",
         'step': 0,
+        'version': 0,
         'created_at': datetime.now(),
         'last_updated': datetime.now(),
         'result': None,
@@ -363,41 +519,66 @@ def create_new_task(user_id: int, playlist_name: str, description: str, genre: s
         'genre': genre,
         'days': days,
         'public': public,
-        'source_selection': source_selection
+        'source_selection': source_selection,
+        'min_duration': min_duration,
+        'max_duration': max_duration,
+        'merge_near_duplicates': merge_near_duplicates
     }
     
     tasks[task_id] = task
     print(f"Created new task {task_id} for user {user_id}")
     return task_id
 
-def get_task(task_id: str) -> Optional[Dict[str, Any]]:
-    """Get a task by ID, checking both memory and database."""
+def get_task(task_id: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+    """Get a task by ID, checking both memory and database.
+    
+    The in-memory copy is only reused while its state version matches the
+    playlist_tasks row, so a task advanced by another worker process is
+    re-read from the database.
+    
+    Args:
+        task_id: Task UUID
+        refresh: Skip the in-memory copy and rebuild the task from the database
+                 (used when tasks run in a separate worker process)
+    """
     # First check in-memory cache
-    if task_id in tasks:
-        return tasks[task_id]
+    cached = tasks.get(task_id)
+    if cached is not None and not refresh:
+        try:
+            db_version = get_task_version(task_id)
+        except Exception as e:
+            logger.warning(f"Could not check state version of task {task_id}: {e}")
+            return cached
+        if db_version is None or db_version <= cached.get('version', 0):
+            return cached
     
-    # If not in memory, check database
+    # If not in memory (or stale), check database
     db_task = PlaylistTask.query.get(task_id)
     if db_task:
         # Parse source_selection if it's JSON
         source_selection = db_task.source_selection or 'both'
         if source_selection.startswith('['):
-            import json
             try:
                 source_selection = json.loads(source_selection)
             except:
                 pass  # Keep as string if parsing fails
         
+        if db_task.status == 'error' and db_task.error_message:
+            message = db_task.error_message
+        else:
+            message = db_task.status_message or f'Task status: {db_task.status}'
+        
         # Reconstruct task dict from database
         task = {
             'id': db_task.id,
             'user_id': db_task.user_id,
             'status': db_task.status,
             'progress': db_task.progress or 0,
-            'message': f'Task status: {db_task.status}',
-            'step': 0,  # Default step value
+            'message': message,
+            'step': db_task.step or 0,
+            'version': db_task.state_version or 0,
             'created_at': db_task.created_at,
-            'last_updated': db_task.created_at,
+            'last_updated': db_task.updated_at or db_task.created_at,
             'result': None,
             'error': db_task.error_message,
             'playlist_name': db_task.playlist_name,
@@ -405,22 +586,39 @@ def get_task(task_id: str) -> Optional[Dict[str, Any]]:
             'genre': db_task.genre,
             'days': db_task.days,
             'public': db_task.is_public,
-            'source_selection': source_selection
+            'source_selection': source_selection,
+            'min_duration': db_task.min_duration,
+            'max_duration': db_task.max_duration,
+            'merge_near_duplicates': bool(db_task.merge_near_duplicates),
+            'duplicates_removed': db_task.duplicates_removed or 0
         }
         
+        # Intermediate results written by whichever worker ran the earlier steps
+        if db_task.sources_data:
+            task['sources'] = json.loads(db_task.sources_data)
+        if db_task.tracks_data:
+            task['tracks'] = json.loads(db_task.tracks_data)
+        
         # If task is completed, try to get the result
         if db_task.status == 'completed' and db_task.tracks_found:
             task['result'] = {
                 'tracks_found': db_task.tracks_found,
                 'playlist_url': db_task.spotify_playlist_url,
                 'playlist_name': db_task.playlist_name,
-                'track_count': db_task.tracks_found
+                'track_count': db_task.tracks_found,
+                'sources_used': [source['name'] for source in task.get('sources', [])],
+                'genre': db_task.genre,
+                'days_searched': db_task.days,
+                'duplicates_removed': db_task.duplicates_removed or 0
             }
             
             # Load CSV data if available
             if db_task.csv_data:
                 task['csv_data'] = db_task.csv_data
-                
+            
+            if 'tracks' in task:
+                task['result']['tracks'] = task['tracks']
+            elif db_task.csv_data:
                 # Parse CSV to reconstruct tracks for display
                 csv_reader = csv.DictReader(io.StringIO(db_task.csv_data))
                 tracks = []
@@ -433,8 +631,16 @@ def get_task(task_id: str) -> Optional[Dict[str, Any]]:
                     })
                 task['result']['tracks'] = tracks
         
-        # Cache it in memory for future requests
-        tasks[task_id] = task
+        if refresh:
+            return task
+        
+        # Cache it in memory for future requests. The cached dict is replaced,
+        # never changed in place: a worker may be in the middle of a step with it.
+        with tasks_lock:
+            current = tasks.get(task_id)
+            if current is not None and current.get('version', 0) >= task['version']:
+                return current
+            tasks[task_id] = task
         return task
     
     return None
@@ -444,8 +650,13 @@ def get_user_tasks(user_id: int) -> list:
     return [task for task in tasks.values() if task['user_id'] == user_id]
 
 async def process_task_step(task_id: str) -> bool:
-    """Process one step of the task. Returns True if task was updated."""
-    task = tasks.get(task_id)
+    """Process one step of the task. Returns True if task was updated.
+    
+    The step runs under a lease on the playlist_tasks row, so the same step is
+    never run twice by concurrent workers (threads, processes or nodes). A
+    caller that cannot take the lease returns False without doing anything.
+    """
+    task = get_task(task_id)
     if not task:
         return False
     
@@ -453,12 +664,17 @@ async def process_task_step(task_id: str) -> bool:
     if task['status'] not in ['processing', 'running']:
         return False
     
+    current_step = task.get('step', 0)
+    owner = worker_identity()
+    
+    if not claim_task_step(task_id, current_step, owner):
+        print(f"Task {task_id}: step {current_step} is being run by another worker")
+        return False
+    
     # Change status to running when we start processing
     if task['status'] == 'processing':
         task['status'] = 'running'
     
-    current_step = task.get('step', 0)
-    
     try:
         if current_step == 0:
             # Initialize task
@@ -502,11 +718,15 @@ async def process_task_step(task_id: str) -> bool:
             print(f"Task {task_id}: Starting YouTube track fetching for genre {genre}")
             
             try:
-                # Initialize YouTube source
-                youtube_source = YouTubeSource()
+                user_id = task.get('user_id')
+                
+                # Initialize YouTube source (incremental sync state is shared via the DB),
+                # skipping titles with the user's own filter keywords too
+                youtube_source = YouTubeSource(sync_store=DatabaseSyncStateStore(),
+                                               resolution_store=DatabaseChannelResolutionStore(),
+                                               filter_keywords=get_user_filter_keywords(user_id))
                 
                 # Get sources based on user's selection
-                user_id = task.get('user_id')
                 source_selection = task.get('source_selection', 'both')
                 
                 # Check if source_selection is a list (Pro user with checkboxes)
@@ -530,8 +750,9 @@ async def process_task_step(task_id: str) -> bool:
                         include_custom=include_custom
                     )
                 
-                # Fetch tracks from YouTube sources in parallel batches for speed
-                tracks = []
+                # Fetch tracks from YouTube sources concurrently, dropping tracks
+                # already found on another source as results come in
+                dedup = TrackDeduplicator()
                 total_sources = len(custom_sources)
                 
                 if total_sources == 0:
@@ -541,76 +762,103 @@ async def process_task_step(task_id: str) -> bool:
                     update_task_status(task_id, status='error', message=task['message'])
                     raise ValueError("No sources found to process")
                 
-                # Dynamic batch size: more sources = larger batches
-                if total_sources <= 3:
-                    batch_size = total_sources  # Process all at once if few sources
-                elif total_sources <= 10:
-                    batch_size = 3  # Process 3 at a time for medium counts
-                else:
-                    batch_size = 5  # Process 5 at a time for many sources
+                # Fetch all sources concurrently, at most SOURCE_FETCH_CONCURRENCY
+                # at a time; a slow source only holds up its own slot
+                semaphore = asyncio.Semaphore(SOURCE_FETCH_CONCURRENCY)
                 
-                # Process sources in parallel batches
-                for batch_start in range(0, total_sources, batch_size):
-                    batch_end = min(batch_start + batch_size, total_sources)
-                    batch = custom_sources[batch_start:batch_end]
-                    
-                    # Update progress with source names
-                    progress_percent = 30 + int((batch_start / total_sources) * 40)  # 30-70% range
-                    source_names = [s['name'] for s in batch]
-                    if len(source_names) > 1:
-                        task['message'] = f'Processing {", ".join(source_names[:2])}... ({batch_end}/{total_sources} sources)'
-                    else:
-                        task['message'] = f'Processing {source_names[0]}... ({batch_end}/{total_sources} sources)'
-                    task['progress'] = progress_percent
-                    update_task_status(task_id, progress=progress_percent, message=task['message'])
-                    
-                    # Create tasks for parallel execution
-                    batch_tasks = []
-                    for source in batch:
-                        # Same limit for all sources
-                        tracks_per_source = 100
-                        
-                        # Create coroutine for this source
-                        source_task = youtube_source.get_tracks_from_sources(
-                            sources=[source],
-                            days_to_look_back=days,
-                            limit=tracks_per_source,
-                            progress_callback=lambda info: print(f"Progress: {info}")
+                async def fetch_source(source):
+                    async with semaphore:
+                        return await asyncio.wait_for(
+                            youtube_source.get_tracks_from_sources(
+                                sources=[source],
+                                days_to_look_back=days,
+                                limit=100,  # Same limit for all sources
+                                progress_callback=lambda info: print(f"Progress: {info}")
+                            ),
+                            timeout=SOURCE_FETCH_TIMEOUT
                         )
-                        batch_tasks.append((source, source_task))
-                    
-                    # Execute batch in parallel
-                    print(f"Task {task_id}: Processing batch {batch_start + 1}-{batch_end} in parallel...")
-                    batch_results = await asyncio.gather(
-                        *[task for _, task in batch_tasks],
-                        return_exceptions=True
-                    )
-                    
-                    # Process results
-                    for (source, _), result in zip(batch_tasks, batch_results):
-                        if isinstance(result, Exception):
-                            print(f"Task {task_id}: Error fetching from {source['name']}: {result}")
-                            logger.error(f"Error fetching from {source['name']}: {result}")
-                            continue
-                        elif result:
-                            tracks.extend(result)
-                            print(f"Task {task_id}: Fetched {len(result)} tracks from {source['name']}")
-                            logger.info(f"Fetched {len(result)} tracks from {source['name']}")
-                        else:
-                            print(f"Task {task_id}: No tracks found from {source['name']}")
-                            logger.info(f"No tracks found from {source['name']}")
+                
+                task['message'] = f'Fetching tracks from {total_sources} sources...'
+                update_task_status(task_id, progress=30, message=task['message'])
+                print(f"Task {task_id}: Fetching {total_sources} sources, {SOURCE_FETCH_CONCURRENCY} at a time")
+                
+                completed_sources = 0
+                with quota_attribution(user_id=user_id, task_id=task_id):
+                    # Tasks copy the quota attribution context when they are created
+                    fetches = {asyncio.ensure_future(fetch_source(source)): source for source in custom_sources}
+                    pending = set(fetches)
                     
-                    # Small delay between batches to prevent rate limiting
-                    if batch_end < total_sources:
-                        await asyncio.sleep(0.5)
+                    while pending:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        
+                        for fetch in done:
+                            source = fetches[fetch]
+                            completed_sources += 1
+                            
+                            try:
+                                result = fetch.result()
+                            except asyncio.TimeoutError:
+                                print(f"Task {task_id}: Timed out fetching from {source['name']} after {SOURCE_FETCH_TIMEOUT}s")
+                                logger.error(f"Timed out fetching from {source['name']} after {SOURCE_FETCH_TIMEOUT}s")
+                                result = []
+                            except Exception as e:
+                                print(f"Task {task_id}: Error fetching from {source['name']}: {e}")
+                                logger.error(f"Error fetching from {source['name']}: {e}")
+                                result = []
+                            
+                            if result:
+                                kept = dedup.extend(result)
+                                print(f"Task {task_id}: Fetched {len(result)} tracks from {source['name']} ({len(result) - kept} duplicates)")
+                                logger.info(f"Fetched {len(result)} tracks from {source['name']} ({len(result) - kept} duplicates)")
+                            else:
+                                print(f"Task {task_id}: No tracks found from {source['name']}")
+                                logger.info(f"No tracks found from {source['name']}")
+                            
+                            # Report progress per finished source (30-70% range)
+                            task['progress'] = 30 + int((completed_sources / total_sources) * 40)
+                            task['message'] = (f'Finished {source["name"]}: {len(result)} tracks '
+                                               f'({completed_sources}/{total_sources} sources, {len(dedup)} tracks so far)')
+                            update_task_status(task_id, progress=task['progress'], message=task['message'],
+                                               tracks_found=len(dedup))
+                            extend_task_lease(task_id, owner)
+                
+                tracks = dedup.tracks
+                duplicates_removed = dedup.duplicates_removed
+                
+                # Optionally merge re-uploads whose titles differ slightly (LSH-blocked, not pairwise)
+                if task.get('merge_near_duplicates') and tracks:
+                    tracks, near_duplicates = NearDuplicateClusterer().deduplicate(tracks)
+                    duplicates_removed += near_duplicates
+                    print(f"Task {task_id}: Merged {near_duplicates} near-duplicate tracks")
+                
+                task['duplicates_removed'] = duplicates_removed
+                if duplicates_removed:
+                    print(f"Task {task_id}: Removed {duplicates_removed} duplicate tracks across sources")
+                
+                # Look up real durations for all sources at once (1 unit per 50 videos)
+                if tracks:
+                    task['message'] = f'Checking track lengths for {len(tracks)} tracks...'
+                    update_task_status(task_id, message=task['message'])
+                    with quota_attribution(user_id=user_id, task_id=task_id):
+                        await youtube_source.enrich_durations(tracks)
+                
+                min_duration = task.get('min_duration')
+                max_duration = task.get('max_duration')
+                if min_duration or max_duration:
+                    kept = [track for track in tracks
+                            if within_duration(parse_iso8601_duration(track.duration), min_duration, max_duration)]
+                    print(f"Task {task_id}: Duration filter ({min_duration}-{max_duration}s) dropped {len(tracks) - len(kept)} tracks")
+                    tracks = kept
                 
                 # Convert Track objects to dictionaries for JSON serialization
                 track_dicts = []
                 for track in tracks:
+                    duration_seconds = parse_iso8601_duration(track.duration)
                     track_dict = {
                         'title': track.title,
                         'artist': track.artist,
-                        'duration': getattr(track, 'duration', 'Unknown'),
+                        'duration': format_duration(duration_seconds),
+                        'duration_seconds': duration_seconds,
                         'source': getattr(track, 'source', 'YouTube'),
                         'genre': genre,
                         'url': getattr(track, 'url', None),
@@ -622,6 +870,8 @@ async def process_task_step(task_id: str) -> bool:
                 task['step'] = 2
                 task['progress'] = 70
                 task['message'] = f'Fetched {len(track_dicts)} tracks from YouTube for genre {genre}'
+                if duplicates_removed:
+                    task['message'] += f' ({duplicates_removed} duplicates removed)'
                 print(f"Task {task_id}: Successfully fetched {len(track_dicts)} tracks")
                 
                 # Update database immediately after fetching
@@ -666,7 +916,8 @@ async def process_task_step(task_id: str) -> bool:
                 'tracks': tracks,  # Include all tracks for export
                 'sources_used': [source['name'] for source in task.get('sources', [])],
                 'genre': task['genre'],
-                'days_searched': task['days']
+                'days_searched': task['days'],
+                'duplicates_removed': task.get('duplicates_removed', 0)
             }
             
             # Save playlist to history for Pro users
@@ -714,6 +965,17 @@ async def process_task_step(task_id: str) -> bool:
             return False
             
         task['last_updated'] = datetime.now()
+        
+        # Share the step's results so any worker can serve or continue the task
+        step_results = {'step': task['step']}
+        if current_step == 0:
+            step_results['sources'] = task.get('sources', [])
+        elif current_step == 1:
+            step_results['tracks'] = task.get('tracks', [])
+            step_results['duplicates_removed'] = task.get('duplicates_removed', 0)
+        update_task_status(task_id, status=task['status'], progress=task['progress'],
+                           message=task['message'], **step_results)
+        
         print(f"Task {task_id} updated: step {task['step']}, progress {task['progress']}%, message: {task['message']}")
         return True
         
@@ -723,7 +985,18 @@ async def process_task_step(task_id: str) -> bool:
         task['message'] = f'Error: {str(e)}'
         task['error'] = str(e)
         task['last_updated'] = datetime.now()
+        try:
+            db.session.rollback()
+            update_task_status(task_id, status='error', message=task['message'], error=str(e))
+        except Exception as db_error:
+            logger.error(f"Could not save error state of task {task_id}: {db_error}")
         return True
+    
+    finally:
+        try:
+            release_task_lease(task_id, owner)
+        except Exception as e:
+            logger.warning(f"Could not release lease on task {task_id}: {e}")
 
 def cleanup_old_tasks():
     """Remove tasks older than 1 hour."""
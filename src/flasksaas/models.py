@@ -37,6 +37,9 @@ class User(db.Model, UserMixin):
     subscription_plan = db.Column(db.String(50), nullable=True)    # monthly, yearly
     subscription_current_period_end = db.Column(db.DateTime, nullable=True)
 
+    # Extra title keywords (comma separated) to skip when fetching YouTube tracks
+    filter_keywords = db.Column(db.Text, nullable=True)
+
     # ------------------------------------------------------------------
     # Password helpers
     # ------------------------------------------------------------------
@@ -172,6 +175,77 @@ class UserSource(db.Model):
         return url
 
 
+class ChannelResolution(db.Model):
+    """Cached resolution of a channel reference (@handle or channel ID) to its uploads playlist."""
+    __tablename__ = "channel_resolutions"
+
+    id = db.Column(db.Integer, primary_key=True)
+    lookup_key = db.Column(db.String(200), unique=True, nullable=False, index=True)  # Lowercased @handle or channel ID
+    channel_id = db.Column(db.String(64), nullable=False)
+    channel_title = db.Column(db.String(200))
+    uploads_playlist_id = db.Column(db.String(64), nullable=False)
+    resolved_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ChannelResolution {self.lookup_key} -> {self.uploads_playlist_id}>'
+
+
+class SourceSyncState(db.Model):
+    """High-water mark and parsed item window for incremental YouTube playlist sync."""
+    __tablename__ = "source_sync_states"
+
+    id = db.Column(db.Integer, primary_key=True)
+    playlist_id = db.Column(db.String(64), unique=True, nullable=False, index=True)  # Playlist or uploads playlist ID
+    latest_video_id = db.Column(db.String(20))  # Newest video seen
+    latest_published_at = db.Column(db.String(30))  # publishedAt of the newest video
+    covered_since = db.Column(db.DateTime)  # Oldest date the window covers (NULL = whole scan range)
+    is_complete = db.Column(db.Boolean, default=False)
+    items_data = db.Column(db.Text)  # JSON list of parsed items, newest first
+    last_full_sync_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<SourceSyncState {self.playlist_id}>'
+
+
+class DestinationMatch(db.Model):
+    """Cached destination search result for a normalized (artist, title, remix), shared across users."""
+    __tablename__ = "destination_matches"
+    __table_args__ = (db.UniqueConstraint('destination', 'match_key'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    destination = db.Column(db.String(20), nullable=False)  # Spotify or YouTube
+    match_key = db.Column(db.String(40), nullable=False, index=True)  # SHA-1 of the track fingerprint
+    matched = db.Column(db.Boolean, default=False)  # False caches "not found" (shorter TTL)
+    match_id = db.Column(db.String(64))
+    match_url = db.Column(db.String(300))
+    match_name = db.Column(db.String(300))
+    match_artist = db.Column(db.String(300))
+    score = db.Column(db.Float, default=0.0)
+    message = db.Column(db.String(200))
+    cached_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<DestinationMatch {self.destination} {self.match_key}: {self.match_id or "not found"}>'
+
+
+class YouTubeQuotaUsage(db.Model):
+    """Daily YouTube API unit usage, per method and per user/task."""
+    __tablename__ = "youtube_quota_usage"
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.String(10), nullable=False, index=True)  # Quota day (Pacific time), YYYY-MM-DD
+    method = db.Column(db.String(50), nullable=False)  # e.g. search.list
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    task_id = db.Column(db.String(36), nullable=True)
+    calls = db.Column(db.Integer, default=0)
+    units = db.Column(db.Integer, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<YouTubeQuotaUsage {self.day} {self.method}: {self.units}>'
+
+
 class PlaylistTask(db.Model):
     """Stores playlist generation tasks."""
     __tablename__ = "playlist_tasks"
@@ -188,15 +262,28 @@ class PlaylistTask(db.Model):
     days = db.Column(db.Integer, default=7)
     is_public = db.Column(db.Boolean, default=True)
     source_selection = db.Column(db.Text, default='both')  # Changed to Text to support Pro users' multiple selections
+    min_duration = db.Column(db.Integer)  # Seconds; shorter videos are dropped
+    max_duration = db.Column(db.Integer)  # Seconds; longer videos (DJ sets, mixes) are dropped
+    merge_near_duplicates = db.Column(db.Boolean, default=False)  # Also merge re-uploads with slightly different titles
     
     # Results
     spotify_playlist_url = db.Column(db.Text)
     spotify_playlist_id = db.Column(db.String(100))
     tracks_found = db.Column(db.Integer, default=0)
     tracks_matched = db.Column(db.Integer, default=0)
+    duplicates_removed = db.Column(db.Integer, default=0)  # Same track found on several sources
     error_message = db.Column(db.Text)
     csv_data = db.Column(db.Text)  # Store CSV data for all users
     
+    # Shared processing state, so any worker process can serve or advance the task
+    step = db.Column(db.Integer, default=0)  # 0: resolve sources, 1: fetch tracks, 2: finish
+    status_message = db.Column(db.Text)
+    sources_data = db.Column(db.Text)  # JSON list of sources resolved in step 0
+    tracks_data = db.Column(db.Text)  # JSON list of tracks fetched in step 1
+    state_version = db.Column(db.Integer, default=0)  # Bumped on every state write
+    lease_owner = db.Column(db.String(100))  # Worker currently running a step
+    lease_expires_at = db.Column(db.DateTime)
+    
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -206,6 +293,24 @@ class PlaylistTask(db.Model):
     user = db.relationship('User', backref=db.backref('playlist_tasks', lazy=True))
     
 
+class TaskJob(db.Model):
+    """Queued playlist task for the database job queue (see main/job_queue.py)."""
+    __tablename__ = "task_jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.String(36), db.ForeignKey('playlist_tasks.id'), nullable=False, index=True)
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)  # queued, running, done, failed
+    attempts = db.Column(db.Integer, default=0)
+    worker_id = db.Column(db.String(100))  # hostname:pid of the claiming worker
+    error = db.Column(db.Text)
+    enqueued_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<TaskJob {self.task_id} {self.status}>'
+
+
 class GeneratedPlaylist(db.Model):
     """Stores successfully generated playlists for history."""
     __tablename__ = "generated_playlists"
@@ -7,10 +7,12 @@ import asyncio
 from flask import Blueprint, request, redirect, url_for, session, flash, jsonify, current_app
 from flask_login import login_required, current_user
 from utils.spotify_oauth import SpotifyOAuth
+from utils.http_session import HTTP_SESSIONS
 from utils.destinations.spotify import SpotifyDestination
 from utils.sources.base import Track
 from src.flasksaas.models import User, db
 from src.flasksaas.main.task_manager import get_task
+from src.flasksaas.stores import DatabaseMatchStore
 
 spotify_bp = Blueprint('spotify', __name__, url_prefix='/spotify')
 
@@ -160,7 +162,7 @@ def create_playlist(task_id):
             print(f"DEBUG: Starting Spotify playlist creation for task {task_id}")
             
             # Create Spotify destination and authenticate
-            spotify = SpotifyDestination()
+            spotify = SpotifyDestination(match_store=DatabaseMatchStore())
             auth_success = await spotify.authenticate({
                 'access_token': current_user.spotify_access_token,
                 'refresh_token': current_user.spotify_refresh_token
@@ -229,7 +231,7 @@ def create_playlist(task_id):
     
     try:
         # Run the async operation with timeout
-        result, error = asyncio.run(asyncio.wait_for(create_spotify_playlist(), timeout=60.0))
+        result, error = HTTP_SESSIONS.run(asyncio.wait_for(create_spotify_playlist(), timeout=60.0))
         
         if error:
             flash(f'Failed to create Spotify playlist: {error}', 'error')
@@ -0,0 +1,205 @@
+"""Database-backed stores injected into the source/destination utilities.
+
+The classes in ``utils`` only depend on small get/save interfaces so they can
+run from the CLI without Flask; the web app plugs in these implementations to
+share state across workers and restarts.
+"""
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func
+
+from utils.destinations.match_cache import CachedMatch
+from utils.sources.channel_index import ChannelResolution, normalize_channel_ref
+from utils.sources.sync_state import SyncState
+from . import db
+from .models import (ChannelResolution as ChannelResolutionRow, DestinationMatch, SourceSyncState,
+                     YouTubeQuotaUsage)
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseSyncStateStore:
+    """Persists incremental YouTube sync state in the source_sync_states table."""
+
+    def get(self, playlist_id: str) -> Optional[SyncState]:
+        row = SourceSyncState.query.filter_by(playlist_id=playlist_id).first()
+        if not row:
+            return None
+
+        try:
+            items = json.loads(row.items_data) if row.items_data else []
+        except ValueError:
+            logger.warning(f"Corrupt sync state for {playlist_id}, ignoring it")
+            return None
+
+        return SyncState(
+            playlist_id=row.playlist_id,
+            items=items,
+            covered_since=row.covered_since,
+            complete=bool(row.is_complete),
+            last_full_sync_at=row.last_full_sync_at
+        )
+
+    def save(self, state: SyncState) -> None:
+        row = SourceSyncState.query.filter_by(playlist_id=state.playlist_id).first()
+        if not row:
+            row = SourceSyncState(playlist_id=state.playlist_id)
+            db.session.add(row)
+
+        row.latest_video_id = state.latest_video_id
+        row.latest_published_at = state.latest_published_at
+        row.covered_since = state.covered_since
+        row.is_complete = state.complete
+        row.items_data = json.dumps(state.items)
+        row.last_full_sync_at = state.last_full_sync_at
+        row.updated_at = datetime.utcnow()
+
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+
+class DatabaseChannelResolutionStore:
+    """Persists channel reference resolutions in the channel_resolutions table."""
+
+    def get(self, lookup_key: str) -> Optional[ChannelResolution]:
+        row = ChannelResolutionRow.query.filter_by(lookup_key=normalize_channel_ref(lookup_key)).first()
+        if not row:
+            return None
+
+        return ChannelResolution(
+            lookup_key=row.lookup_key,
+            channel_id=row.channel_id,
+            uploads_playlist_id=row.uploads_playlist_id,
+            channel_title=row.channel_title or "",
+            resolved_at=row.resolved_at
+        )
+
+    def save(self, resolution: ChannelResolution) -> None:
+        lookup_key = normalize_channel_ref(resolution.lookup_key)
+        row = ChannelResolutionRow.query.filter_by(lookup_key=lookup_key).first()
+        if not row:
+            row = ChannelResolutionRow(lookup_key=lookup_key)
+            db.session.add(row)
+
+        row.channel_id = resolution.channel_id
+        row.channel_title = resolution.channel_title
+        row.uploads_playlist_id = resolution.uploads_playlist_id
+        row.resolved_at = resolution.resolved_at or datetime.utcnow()
+
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+
+class DatabaseMatchStore:
+    """Persists destination search results in the destination_matches table."""
+
+    def get(self, destination: str, key: str) -> Optional[CachedMatch]:
+        row = DestinationMatch.query.filter_by(destination=destination, match_key=key).first()
+        if not row:
+            return None
+
+        return CachedMatch(
+            destination=row.destination,
+            match_key=row.match_key,
+            matched=bool(row.matched),
+            match_id=row.match_id or "",
+            match_url=row.match_url or "",
+            match_name=row.match_name or "",
+            match_artist=row.match_artist or "",
+            score=row.score or 0.0,
+            message=row.message or "",
+            cached_at=row.cached_at
+        )
+
+    def save(self, match: CachedMatch) -> None:
+        row = DestinationMatch.query.filter_by(destination=match.destination, match_key=match.match_key).first()
+        if not row:
+            row = DestinationMatch(destination=match.destination, match_key=match.match_key)
+            db.session.add(row)
+
+        row.matched = match.matched
+        row.match_id = match.match_id
+        row.match_url = match.match_url
+        row.match_name = (match.match_name or "")[:300]
+        row.match_artist = (match.match_artist or "")[:300]
+        row.score = match.score
+        row.message = (match.message or "")[:200]
+        row.cached_at = match.cached_at or datetime.utcnow()
+
+        try:
+            db.session.commit()
+        except Exception:
+            # Another worker may have cached the same track first
+            db.session.rollback()
+            raise
+
+
+class DatabaseQuotaLedger:
+    """Records YouTube API unit usage in the youtube_quota_usage table.
+
+    Quota calls happen inside request handlers as well as the background
+    processor thread, so each operation runs in its own app context.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def record(self, day: str, method: str, units: int,
+               user_id: Optional[int] = None, task_id: Optional[str] = None, calls: int = 1) -> None:
+        with self.app.app_context():
+            try:
+                updated = YouTubeQuotaUsage.query.filter_by(
+                    day=day, method=method, user_id=user_id, task_id=task_id
+                ).update({
+                    YouTubeQuotaUsage.calls: YouTubeQuotaUsage.calls + calls,
+                    YouTubeQuotaUsage.units: YouTubeQuotaUsage.units + units,
+                    YouTubeQuotaUsage.updated_at: datetime.utcnow()
+                }, synchronize_session=False)
+                if not updated:
+                    db.session.add(YouTubeQuotaUsage(
+                        day=day, method=method, user_id=user_id, task_id=task_id,
+                        calls=calls, units=units
+                    ))
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+    def total_units(self, day: str) -> int:
+        with self.app.app_context():
+            total = db.session.query(func.sum(YouTubeQuotaUsage.units)).filter_by(day=day).scalar()
+            return int(total or 0)
+
+    def summary(self, day: str) -> Dict[str, Any]:
+        with self.app.app_context():
+            by_method = {
+                method: {'calls': int(calls or 0), 'units': int(units or 0)}
+                for method, calls, units in db.session.query(
+                    YouTubeQuotaUsage.method,
+                    func.sum(YouTubeQuotaUsage.calls),
+                    func.sum(YouTubeQuotaUsage.units)
+                ).filter_by(day=day).group_by(YouTubeQuotaUsage.method)
+            }
+            by_user = {
+                str(user_id): int(units or 0)
+                for user_id, units in db.session.query(
+                    YouTubeQuotaUsage.user_id, func.sum(YouTubeQuotaUsage.units)
+                ).filter_by(day=day).group_by(YouTubeQuotaUsage.user_id)
+            }
+            by_task = {
+                str(task_id): int(units or 0)
+                for task_id, units in db.session.query(
+                    YouTubeQuotaUsage.task_id, func.sum(YouTubeQuotaUsage.units)
+                ).filter_by(day=day).group_by(YouTubeQuotaUsage.task_id)
+                .order_by(func.sum(YouTubeQuotaUsage.units).desc()).limit(50)
+            }
+            return {'by_method': by_method, 'by_user': by_user, 'by_task': by_task}
@@ -0,0 +1,95 @@
+"""
+Tests for cross-source track deduplication.
+"""
+import os
+import subprocess
+import sys
+
+from utils.sources.base import Track
+from utils.sources.dedup import TrackDeduplicator, normalize_text, track_id
+from utils.sources.near_dedup import NearDuplicateClusterer
+
+
+def _track(artist, title, remix=None, source="Defected", video_id="abc"):
+    return Track(title=title, artist=artist, remix=remix, source=source,
+                 source_url=f"https://www.youtube.com/watch?v={video_id}")
+
+
+def test_normalize_text():
+    assert normalize_text("Beyoncé feat. JAY-Z") == "beyonce"
+    assert normalize_text("Sweet  Dreams [Official Video]") == "sweet dreams"
+    assert normalize_text(None) == ""
+
+
+def test_track_id():
+    assert track_id(_track("A", "B", video_id="xyz")) == "xyz"
+    assert track_id(Track(title="B", artist="A", source_url="https://www.beatport.com/track/b/1")) == \
+        "https://www.beatport.com/track/b/1"
+
+
+def test_same_video_on_two_sources_is_merged():
+    index = TrackDeduplicator()
+    assert index.add(_track("Artist", "Song", source="Defected"))
+    assert not index.add(_track("Artist", "Song (Official Video)", source="Glitterbox"))
+
+    assert len(index) == 1
+    assert index.duplicates_removed == 1
+    assert index.tracks[0].source == "Defected, Glitterbox"
+
+
+def test_reupload_matches_on_fingerprint():
+    index = TrackDeduplicator()
+    index.add(_track("Artist ft. Singer", "Song", "Extended Mix", video_id="one"))
+    assert not index.add(_track("ARTIST", "Song!", "extended mix", source="All", video_id="two"))
+    # A third copy matches the second copy's video ID
+    assert not index.add(_track("Other", "Other", source="All", video_id="two"))
+
+    assert index.duplicates_removed == 2
+    assert index.tracks[0].source == "Defected, All"
+
+
+def test_different_remixes_are_kept():
+    index = TrackDeduplicator()
+    kept = index.extend([
+        _track("Artist", "Song", None, video_id="one"),
+        _track("Artist", "Song", "Dub Mix", video_id="two"),
+    ])
+
+    assert kept == 2
+    assert index.duplicates_removed == 0
+
+
+def test_near_duplicate_uploads_are_merged():
+    tracks = [
+        Track(title="Track", artist="Artist", remix="Extended Mix", source="Label"),
+        Track(title="Artist – Track [Official Audio]", artist="Unknown Artist", source="All"),
+        Track(title="Track", artist="Artist", remix="Dub Mix", source="Label"),
+        Track(title="Something Else", artist="Artist", source="Label"),
+    ]
+
+    kept, removed = NearDuplicateClusterer().deduplicate(tracks)
+
+    assert removed == 1
+    assert [track.remix for track in kept] == ["Extended Mix", "Dub Mix", None]
+    assert kept[0].source == "Label, All"
+
+
+def test_near_duplicate_typo_is_clustered():
+    tracks = [_track("Kerri Chandler", "Rain"), _track("Kerri Chandler", "Bar A Thym"),
+              _track("Kerri Chandlr", "Bar A Thyme")]
+
+    assert NearDuplicateClusterer().cluster(tracks) == [[0], [1, 2]]
+
+
+def test_minhash_signature_is_the_same_in_every_process():
+    """Signatures must not depend on PYTHONHASHSEED, or clustering differs between runs."""
+    code = ("from utils.sources.near_dedup import NearDuplicateClusterer; "
+            "print(NearDuplicateClusterer().signature('fisher losing it'))")
+    outputs = {
+        subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                       env={**os.environ, "PYTHONHASHSEED": seed}).stdout
+        for seed in ("1", "2")
+    }
+    assert len(outputs) == 1
+    assert outputs.pop().strip() == str(NearDuplicateClusterer().signature("fisher losing it"))
@@ -0,0 +1,43 @@
+"""
+Tests for the shared destination search result cache.
+"""
+from datetime import datetime, timedelta
+
+from utils.destinations.match_cache import InMemoryMatchStore, MatchCache, match_key
+from utils.sources.base import Track
+
+
+def test_match_key_uses_normalized_fingerprint():
+    assert match_key(Track(title="Song (Official Video)", artist="ARTIST feat. Guest")) == \
+        match_key(Track(title="song", artist="Artist"))
+    assert match_key(Track(title="Song", artist="Artist", remix="Dub Mix")) != \
+        match_key(Track(title="Song", artist="Artist"))
+    assert match_key(Track(title="", artist="Artist")) is None
+
+
+def test_misses_expire_before_matches():
+    cache = MatchCache(ttl=timedelta(days=30), negative_ttl=timedelta(hours=24))
+    found, missing = Track(title="Found", artist="Artist"), Track(title="Missing", artist="Artist")
+    cache.save("Spotify", found, True, match_id="abc", score=0.9)
+    cache.save("Spotify", missing, False)
+
+    assert cache.get("Spotify", found).match_id == "abc"
+    assert cache.get("YouTube", found) is None
+
+    two_days_ago = datetime.utcnow() - timedelta(days=2)
+    for track in (found, missing):
+        cache.store.get("Spotify", match_key(track)).cached_at = two_days_ago
+
+    assert cache.get("Spotify", found) is not None
+    assert cache.get("Spotify", missing) is None
+    assert cache.stats() == {'hits': 2, 'misses': 2}
+
+
+def test_in_memory_store_is_bounded():
+    cache = MatchCache(store=InMemoryMatchStore(max_size=2))
+    tracks = [Track(title=f"Song {i}", artist="Artist") for i in range(3)]
+    for track in tracks:
+        cache.save("Spotify", track, True, match_id=track.title)
+
+    assert cache.get("Spotify", tracks[0]) is None
+    assert cache.get("Spotify", tracks[2]).match_id == "Song 2"
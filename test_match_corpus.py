@@ -0,0 +1,32 @@
+"""
+Accuracy regression tests for match scoring against the labelled match corpus.
+"""
+import pytest
+
+from utils.destinations.base import PlaylistDestination
+from utils.destinations.match_evaluation import best_candidate, evaluate, load_corpus
+from utils.destinations.scoring import TrackScorer
+
+CASES = load_corpus()
+
+# Measured on the corpus when it was added; raise these when scoring improves
+FLOORS = {
+    0.7: (0.70, 0.67),
+    0.85: (0.70, 0.67),
+}
+
+
+@pytest.mark.parametrize("threshold", sorted(FLOORS))
+def test_precision_and_recall_do_not_regress(threshold):
+    result = evaluate(CASES, thresholds=[threshold]).at(threshold)
+    min_precision, min_recall = FLOORS[threshold]
+
+    assert result.precision >= min_precision, result.errors
+    assert result.recall >= min_recall, result.errors
+
+
+def test_best_match_picks_the_same_candidates():
+    for case in CASES:
+        index, score = TrackScorer(case.track).best_match([(title, artist) for _, title, artist in case.candidates])
+        best_id = case.candidates[index][0] if index is not None else None
+        assert (best_id, score) == best_candidate(case, PlaylistDestination.calculate_match_score), case.id
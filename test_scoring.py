@@ -0,0 +1,36 @@
+"""
+Tests for fuzzy-match scoring of search candidates.
+"""
+from utils.destinations.base import PlaylistDestination
+from utils.destinations.scoring import TrackScorer, levenshtein_distance, normalize_title
+from utils.sources.base import Track
+
+
+def test_levenshtein_distance():
+    assert levenshtein_distance("kitten", "sitting") == 3
+    assert levenshtein_distance("", "abc") == 3
+    assert levenshtein_distance("same", "same") == 0
+    # Stops once the bound is exceeded
+    assert levenshtein_distance("kitten", "sitting", max_distance=1) == 2
+    assert levenshtein_distance("a" * 100, "b" * 100) == 100
+
+
+def test_normalize_title():
+    assert normalize_title("Song (Official Video) [feat. X]") == "song x"
+    assert normalize_title(None) == ""
+
+
+def test_best_match_equals_scoring_every_candidate():
+    track = Track(title="Bar A Thym", artist="Kerri Chandler", remix="Dub Mix")
+    candidates = [("Something Else", "Other"), ("Bar A Thym - Dub Mix", "Kerri Chandler"),
+                  ("Bar A Thyme", "Kerri Chandler"), ("Bar A Thym - Dub Mix", "Kerri Chandler")]
+    scores = [PlaylistDestination.calculate_match_score(track, *candidate) for candidate in candidates]
+
+    assert TrackScorer(track).best_match(candidates) == (scores.index(max(scores)), max(scores))
+
+
+def test_score_below_min_score_is_none():
+    scorer = TrackScorer(Track(title="Rain", artist="Kerri Chandler"))
+
+    assert scorer.score("Completely Different Title", "Someone", min_score=0.7) is None
+    assert scorer.score("Rain", "Kerri Chandler", min_score=0.7) == 1.0
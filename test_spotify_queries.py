@@ -0,0 +1,45 @@
+"""
+Tests for staged Spotify search query planning.
+"""
+from utils.destinations.spotify_queries import QueryStageStats, plan_queries, strip_featuring
+from utils.sources.base import Track
+
+
+def test_queries_relax_stage_by_stage():
+    track = Track(title="Dreamin", artist="Dom Dolla feat. Daya", remix="Extended Mix")
+
+    assert plan_queries(track) == [
+        ("exact", 'track:"Dreamin Extended Mix" artist:"Dom Dolla feat. Daya"'),
+        ("no_remix", 'track:"Dreamin" artist:"Dom Dolla feat. Daya"'),
+        ("no_featuring", 'track:"Dreamin" artist:"Dom Dolla"'),
+        ("free_text", "Dreamin Dom Dolla"),
+    ]
+
+
+def test_repeated_queries_are_skipped():
+    stages = [stage for stage, _ in plan_queries(Track(title="Rain", artist="Kerri Chandler"))]
+
+    assert stages == ["exact", "free_text"]
+
+
+def test_unknown_artist_uses_free_text_only():
+    assert plan_queries(Track(title='Peggy Gou - "Nanana"', artist="Unknown Artist")) == \
+        [("free_text", "Peggy Gou - Nanana")]
+
+
+def test_strip_featuring():
+    assert strip_featuring("Latch (feat. Sam Smith)") == "Latch"
+    assert strip_featuring("Artist ft. Singer") == "Artist"
+    assert strip_featuring("Left Right") == "Left Right"
+
+
+def test_stage_stats():
+    stats = QueryStageStats()
+    stats.record(["exact"], "exact")
+    stats.record(["exact", "no_featuring", "free_text"], "free_text")
+    stats.record(["exact", "free_text"], None)
+
+    snapshot = stats.snapshot()
+    assert snapshot["requests_per_match"] == 3.0
+    assert snapshot["stages"]["exact"] == {"requests": 3, "hits": 1, "hit_rate": 0.333}
+    assert snapshot["stages"]["no_remix"]["hit_rate"] is None
@@ -0,0 +1,74 @@
+"""
+Tests for concurrent, rate-limited Spotify request scheduling.
+"""
+import asyncio
+
+from utils.spotify_scheduler import SpotifyScheduler
+
+
+class FakeResponse:
+    def __init__(self, status, data=None, headers=None):
+        self.status = status
+        self.data = data
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return self.data
+
+
+class FakeSession:
+    """Answers 429 to the first rate_limited requests, then echoes the URL."""
+
+    def __init__(self, rate_limited=0):
+        self.rate_limited = rate_limited
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        if self.calls <= self.rate_limited:
+            return FakeResponse(429, headers={"Retry-After": "0"})
+        return FakeResponse(200, {"url": url})
+
+
+def test_map_keeps_input_order():
+    scheduler = SpotifyScheduler(concurrency=5)
+
+    async def delayed(i):
+        # Later items finish first
+        await asyncio.sleep(0.001 * (20 - i))
+        return i
+
+    assert asyncio.run(scheduler.map(list(range(20)), delayed)) == list(range(20))
+
+
+def test_get_json_retries_after_429():
+    scheduler = SpotifyScheduler(backoff=0.01)
+    session = FakeSession(rate_limited=2)
+
+    status, data = asyncio.run(scheduler.get_json(session, "search"))
+
+    assert (status, data) == (200, {"url": "search"})
+    assert session.calls == 3
+    assert scheduler.stats()["rate_limited"] == 2
+
+
+def test_get_json_gives_up_after_max_retries():
+    scheduler = SpotifyScheduler(max_retries=1, backoff=0.01)
+
+    status, data = asyncio.run(scheduler.get_json(FakeSession(rate_limited=5), "search"))
+
+    assert (status, data) == (429, None)
+
+
+def test_retry_delay_honors_retry_after():
+    scheduler = SpotifyScheduler(backoff=0.5)
+
+    assert 3.0 <= scheduler.retry_delay(0, "3") <= 3.5
+    assert 2.0 <= scheduler.retry_delay(2) <= 2.5
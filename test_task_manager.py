@@ -0,0 +1,202 @@
+"""
+Tests for the task cache, step leases and the job queues.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+task_manager = pytest.importorskip("src.flasksaas.main.task_manager")
+
+from flask import Flask
+
+from src.flasksaas import db
+from src.flasksaas.main import job_queue as job_queue_module
+from src.flasksaas.main.job_queue import DatabaseJobQueue, ThreadJobQueue, run_task
+from src.flasksaas.models import PlaylistTask, TaskJob, User
+
+
+@pytest.fixture
+def app():
+    # Only the database is needed, not the blueprints of create_flasksaas_app
+    app = Flask(__name__)
+    app.config.update(TESTING=True, SQLALCHEMY_DATABASE_URI="sqlite://",
+                      SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    task_manager.tasks.clear()
+
+
+@pytest.fixture
+def task_id(app):
+    user = User(email="worker@example.com")
+    user.set_password("password123")
+    db.session.add(user)
+    db.session.commit()
+
+    db.session.add(PlaylistTask(id="task-1", user_id=user.id, status="running",
+                                playlist_name="Fresh", step=1, state_version=1))
+    db.session.commit()
+    task_manager.tasks.clear()
+    return "task-1"
+
+
+def test_reader_between_commit_and_return_keeps_worker_state(task_id, monkeypatch):
+    """A get_task right after update_task_status commits must not reset the worker's dict."""
+    worker_task = task_manager.get_task(task_id)
+    worker_task['tracks_in_progress'] = ["not saved yet"]
+
+    seen = []
+    commit = db.session.commit
+
+    def commit_then_read():
+        commit()
+        # A request thread polling the task as soon as the new version is visible
+        seen.append(task_manager.get_task(task_id))
+
+    monkeypatch.setattr(db.session, "commit", commit_then_read)
+    task_manager.update_task_status(task_id, progress=50, message="Fetching tracks")
+
+    assert seen[0] is worker_task
+    assert worker_task['tracks_in_progress'] == ["not saved yet"]
+    assert worker_task['progress'] == 50
+    assert worker_task['version'] == 2
+
+
+def test_newer_version_from_another_worker_is_swapped_in(task_id):
+    """State written by another process replaces the cached dict instead of changing it."""
+    stale = task_manager.get_task(task_id)
+
+    row = PlaylistTask.query.get(task_id)
+    row.step = 2
+    row.status_message = "Finishing up"
+    row.state_version = 5
+    db.session.commit()
+
+    fresh = task_manager.get_task(task_id)
+
+    assert fresh is not stale
+    assert task_manager.tasks[task_id] is fresh
+    assert (fresh['step'], fresh['version']) == (2, 5)
+    assert (stale['step'], stale['version']) == (1, 1)
+
+
+def test_thread_queue_recovers_unfinished_tasks(app, task_id):
+    """Tasks left queued or running by a stopped process are re-enqueued on start."""
+    user_id = PlaylistTask.query.get(task_id).user_id
+    later = datetime.utcnow() + timedelta(minutes=5)
+    earlier = datetime.utcnow() - timedelta(minutes=5)
+    db.session.add_all([
+        PlaylistTask(id="expired", user_id=user_id, status="running", playlist_name="Expired",
+                     lease_owner="gone:1:1", lease_expires_at=earlier),
+        PlaylistTask(id="leased", user_id=user_id, status="running", playlist_name="Leased",
+                     lease_owner="alive:1:1", lease_expires_at=later),
+        PlaylistTask(id="done", user_id=user_id, status="completed", playlist_name="Done"),
+    ])
+    db.session.commit()
+
+    job_queue = ThreadJobQueue(app, workers=0)
+    assert job_queue.recover() == 2
+    assert sorted(job_queue._queue.queue) == ["expired", task_id]
+
+
+
+def test_only_one_worker_claims_a_job(app, task_id, monkeypatch):
+    """Two workers that both saw the job queued: the conditional UPDATE lets one win."""
+    queue = DatabaseJobQueue(app)
+    queue.enqueue(task_id)
+    claims = {}
+    calls = []
+
+    class Clock:
+        @staticmethod
+        def utcnow():
+            calls.append(None)
+            if len(calls) == 2:
+                # Worker "a" claims after "b" read the job as queued, before b's UPDATE runs
+                claims['a'] = queue.claim("a")
+            return datetime.utcnow()
+
+    monkeypatch.setattr(job_queue_module, "datetime", Clock)
+    claims['b'] = queue.claim("b")
+
+    assert claims == {'a': task_id, 'b': None}
+    job = TaskJob.query.filter_by(task_id=task_id).one()
+    assert (job.status, job.worker_id, job.attempts) == ("running", "a", 1)
+
+
+def test_runaway_task_stops_at_max_steps(task_id, monkeypatch):
+    steps = []
+
+    async def never_finishes(task_id):
+        steps.append(task_id)
+        return True
+
+    monkeypatch.setattr(job_queue_module, "process_task_step", never_finishes)
+    task = asyncio.run(run_task(task_id))
+
+    assert len(steps) == job_queue_module.MAX_TASK_STEPS
+    assert task['status'] == 'error'
+    db.session.expire_all()
+    assert PlaylistTask.query.get(task_id).status == 'error'
+
+
+def test_claim_task_step_is_exclusive_until_the_lease_expires(task_id):
+    assert task_manager.claim_task_step(task_id, 1, "a:1:1")
+    # Renewing your own lease is fine, taking someone else's is not
+    assert task_manager.claim_task_step(task_id, 1, "a:1:1")
+    assert not task_manager.claim_task_step(task_id, 1, "b:1:1")
+    # Nor is claiming a step the task is no longer at
+    task_manager.release_task_lease(task_id, "a:1:1")
+    assert not task_manager.claim_task_step(task_id, 0, "b:1:1")
+
+
+def test_expired_lease_can_be_taken_over(task_id):
+    assert task_manager.claim_task_step(task_id, 1, "crashed:1:1")
+    row = PlaylistTask.query.get(task_id)
+    row.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+
+    assert task_manager.claim_task_step(task_id, 1, "b:1:1")
+    db.session.expire_all()
+    assert PlaylistTask.query.get(task_id).lease_owner == "b:1:1"
+
+
+def test_stolen_lease_is_not_extended_or_released_by_the_old_owner(task_id):
+    assert task_manager.claim_task_step(task_id, 1, "slow:1:1")
+    row = PlaylistTask.query.get(task_id)
+    row.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    assert task_manager.claim_task_step(task_id, 1, "b:1:1")
+    db.session.expire_all()
+    taken_until = PlaylistTask.query.get(task_id).lease_expires_at
+
+    # The previous owner finishing late must not touch the new owner's lease
+    task_manager.extend_task_lease(task_id, "slow:1:1")
+    task_manager.release_task_lease(task_id, "slow:1:1")
+    db.session.expire_all()
+    row = PlaylistTask.query.get(task_id)
+    assert (row.lease_owner, row.lease_expires_at) == ("b:1:1", taken_until)
+
+
+def test_owner_extends_and_releases_its_lease(task_id):
+    assert task_manager.claim_task_step(task_id, 1, "a:1:1")
+    row = PlaylistTask.query.get(task_id)
+    row.lease_expires_at = datetime.utcnow() + timedelta(seconds=5)
+    db.session.commit()
+
+    task_manager.extend_task_lease(task_id, "a:1:1")
+    db.session.expire_all()
+    row = PlaylistTask.query.get(task_id)
+    assert row.lease_expires_at > datetime.utcnow() + timedelta(seconds=task_manager.TASK_LEASE_SECONDS - 60)
+
+    task_manager.release_task_lease(task_id, "a:1:1")
+    db.session.expire_all()
+    row = PlaylistTask.query.get(task_id)
+    assert (row.lease_owner, row.lease_expires_at) == (None, None)
+    assert task_manager.claim_task_step(task_id, 1, "b:1:1")
@@ -0,0 +1,99 @@
+"""
+Tests that the compiled title filter decides exactly like plain substring checks.
+"""
+import random
+
+import pytest
+
+from utils.sources.title_filter import TitleFilter, parse_keywords
+from utils.sources.youtube import YouTubeSource
+
+FILTER_KEYWORDS = YouTubeSource.FILTER_KEYWORDS
+ALLOWED_TERMS = YouTubeSource.ALLOWED_TERMS
+
+# User keywords: regex metacharacters, prefixes of each other and of the
+# built-in keywords, mixed case and non-ASCII text
+USER_KEYWORDS = [
+    "mix", "mixed", "mi", "(live)", "a.b", "[set]", "c++", "$$$", "^intro", "x|y", "\\n", "?",
+    "straße", "ÉDITION", "ライブ", "🔥", "dj", "dj set b2b", "Best Of", "remix pack",
+]
+USER_ALLOWED = ["mixed feelings", "(live) edit", "dj tool"]
+
+FRAGMENTS = [
+    "Artist - Track", "(Extended Mix)", "Club Mix", "Radio Edit", "DJ Set", "Live Set", "live",
+    "(LIVE)", "Mixed By", "MIXTAPE", "mix", "MI", "a.b", "aXb", "[Set]", "[set", "c++", "c+",
+    "$$$", "$$", "^Intro", "intro", "x|y", "x", "\\n", "?", "Straße", "STRASSE", "édition",
+    "ÉDITION", "ライブ", "🔥🔥", "Best of 2024", "Yearmix", "classics", "Classics (Original Mix)",
+    "Remix Pack", "Mixed Feelings", "dj tool", "back to back", "b2b", "İstanbul", "ǅ", "",
+    " ", "\x00", "İ", "Top 10", "top 1",
+]
+
+
+def reference_is_filtered(title, block_terms, allow_terms):
+    """The nested substring loops the compiled filter replaced."""
+    lowered = title.lower()
+    if not any(term.lower() in lowered for term in block_terms):
+        return False
+    return not any(term.lower() in lowered for term in allow_terms)
+
+
+def _corpus(seed=13, size=2000):
+    rng = random.Random(seed)
+    titles = ["", " ", "\x00", "DJ Set\x00Extended Mix", "İ" * 3 + " dj set"]
+    for _ in range(size):
+        titles.append(" ".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 5))))
+    return titles
+
+
+FILTERS = [
+    pytest.param(FILTER_KEYWORDS, ALLOWED_TERMS, id="built-in"),
+    pytest.param(FILTER_KEYWORDS + USER_KEYWORDS, ALLOWED_TERMS, id="user keywords"),
+    pytest.param(FILTER_KEYWORDS + USER_KEYWORDS, ALLOWED_TERMS + USER_ALLOWED, id="user allowed terms"),
+    pytest.param(USER_KEYWORDS, (), id="no allowed terms"),
+    pytest.param((), ALLOWED_TERMS, id="no block keywords"),
+]
+
+
+@pytest.mark.parametrize("block_terms, allow_terms", FILTERS)
+def test_is_filtered_matches_substring_reference(block_terms, allow_terms):
+    title_filter = TitleFilter(block_terms, allow_terms)
+    for title in _corpus():
+        assert title_filter.is_filtered(title) == reference_is_filtered(title, block_terms, allow_terms), title
+
+
+@pytest.mark.parametrize("block_terms, allow_terms", FILTERS)
+def test_classify_matches_substring_reference(block_terms, allow_terms):
+    title_filter = TitleFilter(block_terms, allow_terms)
+    titles = _corpus()
+    expected = [reference_is_filtered(title, block_terms, allow_terms) for title in titles]
+
+    assert title_filter.classify(titles) == expected
+    # Batches the size of a playlistItems page, so titles land at every offset
+    for start in range(0, len(titles), 50):
+        assert title_filter.classify(titles[start:start + 50]) == expected[start:start + 50]
+
+
+@pytest.mark.parametrize("titles", [
+    [],
+    [""],
+    ["", "", "dj set"],
+    ["dj set", ""],
+    ["DJ SE", "T mix"],  # a keyword split across two neighbouring titles
+    ["best o", "f 2024", "best of"],
+])
+def test_classify_batch_edges(titles):
+    title_filter = TitleFilter(FILTER_KEYWORDS + ["mix"], ALLOWED_TERMS)
+    expected = [reference_is_filtered(title, FILTER_KEYWORDS + ["mix"], ALLOWED_TERMS) for title in titles]
+    assert title_filter.classify(titles) == expected
+
+
+def test_allowed_terms_override_block_keywords():
+    title_filter = TitleFilter(FILTER_KEYWORDS, ALLOWED_TERMS)
+    assert title_filter.classify(["Classics", "Classics (Extended Mix)", "Best Of REMIX"]) == [True, False, False]
+
+
+def test_extended_filter_adds_user_keywords():
+    title_filter = TitleFilter(FILTER_KEYWORDS, ALLOWED_TERMS).extended(
+        block_terms=parse_keywords("Podcast, (LIVE)\nc++"))
+    titles = ["Weekly Podcast 12", "Track (Live)", "c++ tutorial", "Track (Original Mix)"]
+    assert title_filter.classify(titles) == [True, True, True, False]
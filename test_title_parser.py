@@ -0,0 +1,52 @@
+"""
+Regression tests for track title parsing against the golden title corpus.
+"""
+import json
+import os
+
+import pytest
+
+from utils.sources.title_parser import (
+    clear_title_cache, get_title_cache_stats, parse_beatport_title, parse_youtube_title
+)
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils", "sources", "title_corpus.json")
+
+with open(CORPUS_PATH, encoding="utf-8") as corpus_file:
+    CORPUS = json.load(corpus_file)
+
+
+def _expected(case):
+    return case["artist"], case["track"], case["remix"]
+
+
+@pytest.mark.parametrize("case", CORPUS["youtube"], ids=lambda case: case["title"][:40])
+def test_youtube_title(case):
+    assert parse_youtube_title(case["title"]) == _expected(case)
+
+
+@pytest.mark.parametrize("case", CORPUS["beatport"], ids=lambda case: case["title"][:40])
+def test_beatport_title(case):
+    assert parse_beatport_title(case["title"]) == _expected(case)
+
+
+def test_repeated_titles_are_served_from_cache():
+    clear_title_cache()
+    title = CORPUS["youtube"][0]["title"]
+
+    first = parse_youtube_title(title)
+    assert parse_youtube_title(title) is first
+
+    stats = get_title_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_parsers_do_not_share_results_for_the_same_title():
+    clear_title_cache()
+    title = "Artist -Title (Dub)"
+
+    # Beatport titles need " - " around the dash, YouTube's patterns don't
+    assert parse_youtube_title(title) == ("Artist", "Title", "Dub")
+    assert parse_beatport_title(title) == ("Unknown Artist", "Artist -Title", "Dub")
+    assert get_title_cache_stats()["size"] == 2
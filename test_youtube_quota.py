@@ -0,0 +1,158 @@
+"""
+Tests for YouTube quota accounting.
+"""
+import asyncio
+
+import pytest
+
+from utils import youtube_quota
+from utils.youtube_quota import InMemoryQuotaLedger, QuotaExceededError, QuotaManager, quota_attribution
+
+
+class FakeLedger(InMemoryQuotaLedger):
+    """In-memory ledger that counts calls and can be made to fail."""
+
+    def __init__(self):
+        super().__init__()
+        self.fail_record = False
+        self.fail_read = False
+        self.reads = 0
+        self.records = 0
+
+    def record(self, *args, **kwargs):
+        self.records += 1
+        if self.fail_record:
+            raise RuntimeError("ledger down")
+        super().record(*args, **kwargs)
+
+    def total_units(self, day):
+        self.reads += 1
+        if self.fail_read:
+            raise RuntimeError("ledger down")
+        return super().total_units(day)
+
+
+class FakeRequest:
+    def __init__(self, error=None):
+        self.error = error
+
+    def execute(self):
+        if self.error:
+            raise self.error
+        return {"items": []}
+
+
+@pytest.fixture
+def day(monkeypatch):
+    current = {"day": "2026-10-17"}
+    monkeypatch.setattr(youtube_quota, "quota_day", lambda now=None: current["day"])
+    return current
+
+
+def _manager(ledger, daily_limit=1000):
+    return QuotaManager(daily_limit=daily_limit, safety_margin=0, ledger=ledger, refresh_seconds=3600)
+
+
+def test_acquire_charges_and_refuses_past_the_budget(day):
+    ledger = FakeLedger()
+    manager = _manager(ledger, daily_limit=250)
+
+    with quota_attribution(user_id=7, task_id="t1"):
+        assert manager.acquire("search.list") == 100
+        assert manager.acquire("search.list") == 100
+        with pytest.raises(QuotaExceededError):
+            manager.acquire("search.list")
+        assert manager.acquire("videos.list") == 1
+
+    assert manager.used_today() == 201
+    assert manager.refused_calls == 1
+    # Charged calls are buffered until the next sync
+    assert ledger.records == 0
+    manager.sync()
+    summary = ledger.summary(day["day"])
+    assert summary["by_method"]["search.list"] == {"calls": 2, "units": 200}
+    assert summary["by_user"] == {"7": 201}
+
+
+def test_new_quota_day_starts_from_zero(day):
+    ledger = FakeLedger()
+    manager = _manager(ledger, daily_limit=150)
+    manager.acquire("search.list")
+    with pytest.raises(QuotaExceededError):
+        manager.acquire("search.list")
+
+    day["day"] = "2026-10-18"
+    manager.sync()
+    assert manager.used_today() == 0
+    assert manager.refused_calls == 0
+    assert manager.acquire("search.list") == 100
+    # Yesterday's call is still recorded under its own day
+    assert ledger.total_units("2026-10-17") == 100
+
+
+def test_failed_flush_keeps_counts_for_the_next_one(day):
+    ledger = FakeLedger()
+    manager = _manager(ledger)
+    manager.acquire("search.list")
+    manager.acquire("videos.list")
+
+    ledger.fail_record = True
+    manager.flush()
+    assert ledger.total_units(day["day"]) == 0
+
+    ledger.fail_record = False
+    manager.acquire("videos.list")
+    manager.flush()
+    assert ledger.summary(day["day"])["by_method"] == {
+        "search.list": {"calls": 1, "units": 100},
+        "videos.list": {"calls": 2, "units": 2},
+    }
+
+
+def test_failed_ledger_read_is_not_retried_on_every_call(day):
+    ledger = FakeLedger()
+    ledger.fail_read = True
+    manager = _manager(ledger)
+
+    for _ in range(5):
+        manager.acquire("videos.list")
+
+    assert ledger.reads == 1
+    assert manager.used_today() == 5
+
+
+def test_quota_error_marks_the_day_exhausted(day):
+    manager = _manager(FakeLedger())
+
+    with pytest.raises(RuntimeError):
+        manager.execute_blocking(FakeRequest(RuntimeError("<HttpError 403 quotaExceeded>")), "videos.list")
+
+    assert manager.remaining() == 0
+    with pytest.raises(QuotaExceededError):
+        manager.acquire("videos.list")
+    assert manager.snapshot()["exhausted"]
+
+
+def test_other_errors_do_not_exhaust_the_quota(day):
+    manager = _manager(FakeLedger())
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(manager.execute(FakeRequest(RuntimeError("<HttpError 404 playlistNotFound>")),
+                                    "playlistItems.list"))
+
+    assert manager.remaining() == 999
+
+
+def test_event_loop_never_reads_the_ledger_inline(day):
+    ledger = FakeLedger()
+    manager = _manager(ledger)
+    manager.refresh_seconds = 0
+
+    async def charge():
+        reads = ledger.reads
+        manager.acquire("videos.list")
+        return ledger.reads - reads
+
+    assert asyncio.run(charge()) == 0
+    assert asyncio.run(manager.execute(FakeRequest(), "videos.list")) == {"items": []}
+    assert ledger.total_units(day["day"]) >= 1
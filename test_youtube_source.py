@@ -0,0 +1,228 @@
+"""
+Tests for the YouTube source: Atom feed vs Data API, and incremental playlist sync.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.sources import youtube as youtube_module
+from utils.sources.sync_state import InMemorySyncStateStore
+from utils.sources.youtube import YouTubeSource
+from utils.sources.youtube_feed import FEED_MAX_ENTRIES, FeedEntry
+from utils.youtube_quota import InMemoryQuotaLedger, QuotaExceededError, QuotaManager
+
+NOW = datetime(2026, 10, 17, 12, 0)
+THRESHOLD = NOW - timedelta(days=7)
+CHANNEL_ID = "UC" + "x" * 22
+
+
+def _entries(days_ago):
+    return [FeedEntry(video_id=f"v{i}", title=f"Artist {i} - Track {i}",
+                      published=NOW - timedelta(days=days) if days is not None else None)
+            for i, days in enumerate(days_ago)]
+
+
+class FakeHttp:
+    async def get_session(self):
+        return None
+
+
+@pytest.fixture
+def source():
+    source = YouTubeSource()
+    source.http = FakeHttp()
+    return source
+
+
+def test_short_feed_covers_everything():
+    assert YouTubeSource._feed_covers(_entries([1, 30, 400]), THRESHOLD)
+
+
+def test_full_feed_covers_when_it_reaches_the_threshold():
+    assert YouTubeSource._feed_covers(_entries(range(0, 2 * FEED_MAX_ENTRIES, 2)), THRESHOLD)
+
+
+def test_full_feed_of_recent_uploads_does_not_cover():
+    assert not YouTubeSource._feed_covers(_entries([0] * (FEED_MAX_ENTRIES - 1) + [6]), THRESHOLD)
+
+
+def test_unordered_feed_does_not_cover():
+    days = list(range(0, 2 * FEED_MAX_ENTRIES, 2))
+    days[0], days[5] = days[5], days[0]
+    assert not YouTubeSource._feed_covers(_entries(days), THRESHOLD)
+
+
+def test_feed_entry_without_date_does_not_cover():
+    days = list(range(0, 2 * FEED_MAX_ENTRIES, 2))
+    days[3] = None
+    assert not YouTubeSource._feed_covers(_entries(days), THRESHOLD)
+
+
+def test_channel_is_read_from_its_feed(source, monkeypatch):
+    fetched = []
+
+    async def fetch(feed_type, feed_id, session=None):
+        fetched.append((feed_type, feed_id))
+        return _entries([1, 2, 30])
+
+    monkeypatch.setattr(youtube_module.FEED_READER, "fetch", fetch)
+    tracks = asyncio.run(source._get_feed_tracks("channel", CHANNEL_ID, "Label", THRESHOLD, 10))
+
+    assert fetched == [("channel", CHANNEL_ID)]
+    assert [track.title for track in tracks] == ["Track 0", "Track 1"]
+
+
+def test_playlists_never_use_the_feed(source, monkeypatch):
+    """Playlist feed dates are upload dates, not when the video was added to the playlist."""
+    async def fetch(feed_type, feed_id, session=None):
+        raise AssertionError("playlist feed fetched")
+
+    monkeypatch.setattr(youtube_module.FEED_READER, "fetch", fetch)
+    assert asyncio.run(source._get_feed_tracks("playlist", "PLcurated", "Curated", THRESHOLD, 10)) is None
+
+
+# Incremental playlist sync
+
+class FakePlaylistClient:
+    """Serves playlistItems().list pages of 50 from a list of (video ID, published) items."""
+
+    def __init__(self, items):
+        self.items = list(items)
+        self.pages_served = 0
+
+    def playlistItems(self):
+        return self
+
+    def list(self, part, playlistId, maxResults=50, pageToken=None):
+        start = int(pageToken or 0)
+        page = self.items[start:start + maxResults]
+        response = {"items": [{
+            "snippet": {"title": f"Artist {video_id} - Track {video_id}",
+                        "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ")},
+            "contentDetails": {"videoId": video_id},
+        } for video_id, published in page]}
+        if start + maxResults < len(self.items):
+            response["nextPageToken"] = str(start + maxResults)
+        return FakePageRequest(self, response)
+
+
+class FakePageRequest:
+    def __init__(self, client, response):
+        self.client = client
+        self.response = response
+
+    def execute(self):
+        self.client.pages_served += 1
+        return self.response
+
+
+def _playlist(count, prefix="v"):
+    """count items newest first, one per day."""
+    now = datetime.utcnow()
+    return [(f"{prefix}{i}", now - timedelta(days=i, hours=1)) for i in range(count)]
+
+
+@pytest.fixture
+def sync(monkeypatch):
+    """Run _sync_playlist_tracks against a fake client with its own state store and quota."""
+    monkeypatch.setattr(youtube_module, "QUOTA_MANAGER", QuotaManager(ledger=InMemoryQuotaLedger()))
+    source = YouTubeSource(sync_store=InMemorySyncStateStore())
+
+    def run(client, days=30, limit=100, max_pages=4, chronological=False):
+        # Every run must reach the fake client rather than the shared page cache
+        youtube_module.PLAYLIST_PAGE_CACHE.clear()
+        served = client.pages_served
+        tracks = asyncio.run(source._sync_playlist_tracks(
+            client, "PLtest", "Curated", datetime.utcnow() - timedelta(days=days), limit, max_pages,
+            chronological=chronological))
+        return [track.source_url.rsplit("=", 1)[1] for track in tracks], client.pages_served - served
+
+    run.source = source
+    return run
+
+
+def test_second_sync_only_fetches_new_items_on_top(sync):
+    client = FakePlaylistClient(_playlist(60))
+    first, pages = sync(client, days=365)
+    assert (len(first), pages) == (60, 2)
+
+    now = datetime.utcnow()
+    client.items[:0] = [("new1", now), ("new0", now - timedelta(minutes=5))]
+    second, pages = sync(client, days=365)
+
+    assert pages == 1
+    assert second == ["new1", "new0"] + first
+
+
+def test_removed_top_item_forces_a_full_walk(sync):
+    client = FakePlaylistClient(_playlist(60))
+    sync(client, days=365)
+
+    del client.items[0]
+    tracks, pages = sync(client, days=365)
+
+    # The top page shows the stored window no longer starts at v0, so both pages are
+    # walked again (the top page itself comes from the page cache)
+    assert pages == 2
+    assert "v0" not in tracks and len(tracks) == 59
+
+
+def test_reordered_top_item_forces_a_full_walk(sync):
+    client = FakePlaylistClient(_playlist(60))
+    sync(client, days=365)
+
+    client.items.insert(0, client.items.pop(5))
+    tracks, pages = sync(client, days=365)
+
+    assert pages == 2
+    assert tracks[:2] == ["v5", "v0"]
+
+
+def test_incomplete_window_is_not_reused_for_a_larger_limit(sync):
+    client = FakePlaylistClient(_playlist(60))
+    first, _ = sync(client, days=365, limit=10)
+    assert len(first) == 10
+
+    client.items.insert(0, ("new0", datetime.utcnow()))
+    tracks, pages = sync(client, days=365, limit=20)
+
+    # The stored window only held 10 tracks, so the new item cannot fill 20 from it
+    # and the full walk (its one page already cached) provides the rest
+    assert pages == 1
+    assert tracks == ["new0"] + [f"v{i}" for i in range(19)]
+    assert len(sync.source.sync_store.get("PLtest").items) == 20
+
+
+def test_longer_lookback_than_the_stored_window_walks_again(sync):
+    client = FakePlaylistClient(_playlist(150))
+    week, pages = sync(client, days=7, max_pages=None, chronological=True)
+    assert (len(week), pages) == (7, 2)
+
+    month, pages = sync(client, days=30, max_pages=None, chronological=True)
+    assert (len(month), pages) == (30, 2)
+
+    # The month-long window now covers a week without another full walk
+    _, pages = sync(client, days=7, max_pages=None, chronological=True)
+    assert pages == 1
+
+
+def test_quota_exhaustion_degrades_to_the_stored_window(sync, monkeypatch):
+    client = FakePlaylistClient(_playlist(60))
+    first, _ = sync(client, days=365)
+
+    client.items.insert(0, ("new0", datetime.utcnow()))
+    monkeypatch.setattr(youtube_module, "QUOTA_MANAGER",
+                        QuotaManager(daily_limit=0, safety_margin=0, ledger=InMemoryQuotaLedger()))
+    tracks, pages = sync(client, days=365)
+
+    assert pages == 0
+    assert tracks == first
+    assert [entry['video_id'] for entry in sync.source.sync_store.get("PLtest").items] == first
+
+
+def test_quota_exhaustion_without_a_stored_window_fails(sync, monkeypatch):
+    monkeypatch.setattr(youtube_module, "QUOTA_MANAGER",
+                        QuotaManager(daily_limit=0, safety_margin=0, ledger=InMemoryQuotaLedger()))
+    with pytest.raises(QuotaExceededError):
+        sync(FakePlaylistClient(_playlist(10)))
@@ -1,12 +1,18 @@
 """
 Base class for playlist destinations.
 """
+import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Callable
 
+from utils.destinations import scoring
+from utils.destinations.match_cache import DEFAULT_MATCH_CACHE, MatchCache
+from utils.http_session import HTTP_SESSIONS, HttpSessionManager
 from utils.sources.base import Track
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class MatchResult:
@@ -38,6 +44,11 @@ class PlaylistResult:
 class PlaylistDestination(ABC):
     """Abstract base class for playlist destinations."""
     
+    # Pooled HTTP sessions; assign another HttpSessionManager on an instance to replace it
+    http: HttpSessionManager = HTTP_SESSIONS
+    # Search results shared across playlists; search_track checks it before calling the API
+    match_cache: MatchCache = DEFAULT_MATCH_CACHE
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -104,6 +115,45 @@ class PlaylistDestination(ABC):
         """
         pass
     
+    def cached_match(self, track: Track) -> Optional[MatchResult]:
+        """Return the cached search result for track on this destination, if any."""
+        try:
+            cached = self.match_cache.get(self.name, track)
+        except Exception as e:
+            logger.warning(f"Could not load cached match for '{track.title}': {e}")
+            return None
+        if cached is None:
+            return None
+        
+        return MatchResult(
+            track=track,
+            matched=cached.matched,
+            match_id=cached.match_id,
+            match_url=cached.match_url,
+            match_name=cached.match_name,
+            match_artist=cached.match_artist,
+            score=cached.score,
+            message=cached.message
+        )
+    
+    def cache_match(self, result: MatchResult) -> MatchResult:
+        """Store a definitive search result (found or not found) and return it."""
+        try:
+            self.match_cache.save(
+                self.name,
+                result.track,
+                result.matched,
+                match_id=result.match_id,
+                match_url=result.match_url,
+                match_name=result.match_name,
+                match_artist=result.match_artist,
+                score=result.score,
+                message=result.message
+            )
+        except Exception as e:
+            logger.warning(f"Could not cache match for '{result.track.title}': {e}")
+        return result
+    
     @abstractmethod
     async def add_tracks_to_playlist(
         self, 
@@ -136,23 +186,7 @@ class PlaylistDestination(ABC):
         Returns:
             Similarity score between 0.0 and 1.0
         """
-        # Clean and normalize titles
-        title1 = PlaylistDestination.normalize_title(title1)
-        title2 = PlaylistDestination.normalize_title(title2)
-        
-        # If titles are identical after normalization, return 1.0
-        if title1 == title2:
-            return 1.0
-        
-        # Calculate Levenshtein distance
-        distance = PlaylistDestination.levenshtein_distance(title1, title2)
-        max_length = max(len(title1), len(title2))
-        
-        # Convert distance to similarity score
-        if max_length == 0:
-            return 0.0
-        
-        return 1.0 - (distance / max_length)
+        return scoring.title_similarity(title1, title2)
     
     @staticmethod
     def calculate_artist_similarity(artist1: str, artist2: str) -> float:
@@ -166,27 +200,7 @@ class PlaylistDestination(ABC):
         Returns:
             Similarity score between 0.0 and 1.0
         """
-        # Clean and normalize artist names
-        artist1 = PlaylistDestination.normalize_artist(artist1)
-        artist2 = PlaylistDestination.normalize_artist(artist2)
-        
-        # If artist names are identical after normalization, return 1.0
-        if artist1 == artist2:
-            return 1.0
-        
-        # Check if one artist name contains the other
-        if artist1 in artist2 or artist2 in artist1:
-            return 0.9
-        
-        # Calculate Levenshtein distance
-        distance = PlaylistDestination.levenshtein_distance(artist1, artist2)
-        max_length = max(len(artist1), len(artist2))
-        
-        # Convert distance to similarity score
-        if max_length == 0:
-            return 0.0
-        
-        return 1.0 - (distance / max_length)
+        return scoring.artist_similarity(artist1, artist2)
     
     @staticmethod
     def normalize_title(title: str) -> str:
@@ -199,24 +213,7 @@ class PlaylistDestination(ABC):
         Returns:
             Normalized title
         """
-        if not title:
-            return ""
-        
-        # Convert to lowercase
-        title = title.lower()
-        
-        # Remove common words and punctuation
-        for word in ["official", "video", "audio", "lyric", "lyrics", "ft.", "feat.", "remix", "edit"]:
-            title = title.replace(word, "")
-        
-        # Remove punctuation
-        for char in ",.()[]{}!?\"':-;":
-            title = title.replace(char, "")
-        
-        # Remove extra whitespace
-        title = " ".join(title.split())
-        
-        return title
+        return scoring.normalize_title(title)
     
     @staticmethod
     def normalize_artist(artist: str) -> str:
@@ -229,24 +226,7 @@ class PlaylistDestination(ABC):
         Returns:
             Normalized artist name
         """
-        if not artist:
-            return ""
-        
-        # Convert to lowercase
-        artist = artist.lower()
-        
-        # Remove common words and punctuation
-        for word in ["official", "dj", "feat.", "ft."]:
-            artist = artist.replace(word, "")
-        
-        # Remove punctuation
-        for char in ",.()[]{}!?\"':-;":
-            artist = artist.replace(char, "")
-        
-        # Remove extra whitespace
-        artist = " ".join(artist.split())
-        
-        return artist
+        return scoring.normalize_artist(artist)
     
     @staticmethod
     def levenshtein_distance(s1: str, s2: str) -> int:
@@ -260,29 +240,17 @@ class PlaylistDestination(ABC):
         Returns:
             Levenshtein distance
         """
-        if len(s1) < len(s2):
-            return PlaylistDestination.levenshtein_distance(s2, s1)
-        
-        if len(s2) == 0:
-            return len(s1)
-        
-        previous_row = range(len(s2) + 1)
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-        
-        return previous_row[-1]
+        return scoring.levenshtein_distance(s1, s2)
     
     @classmethod
     def calculate_match_score(cls, track: Track, match_title: str, match_artist: str) -> float:
         """
         Calculate a match score between a track and a potential match.
         
+        Title and artist similarity are weighted equally; a remix name found
+        in the match title adds 0.05. To score several candidates for one
+        track, use scoring.TrackScorer, which prepares the track once.
+        
         Args:
             track: Original track
             match_title: Title of the potential match
@@ -291,22 +259,4 @@ class PlaylistDestination(ABC):
         Returns:
             Match score between 0.0 and 1.0
         """
-        # Calculate title similarity (50% of score)
-        title_score = cls.calculate_title_similarity(track.title, match_title)
-        
-        # Calculate artist similarity (50% of score)
-        artist_score = cls.calculate_artist_similarity(track.artist, match_artist)
-        
-        # For electronic music, title is often more distinctive than artist
-        # (many remixes, versions, etc) so we give equal weight
-        weighted_score = (title_score * 0.5) + (artist_score * 0.5)
-        
-        # Add bonus for remix consistency
-        remix_bonus = 0.0
-        if track.remix:
-            # Check if the remix info appears in the match title
-            if track.remix.lower() in match_title.lower():
-                remix_bonus = 0.05
-        
-        # Return final score with bonus (capped at 1.0)
-        return min(1.0, weighted_score + remix_bonus)
\ No newline at end of file
+        return scoring.TrackScorer(track).score(match_title, match_artist)
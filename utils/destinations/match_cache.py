@@ -0,0 +1,120 @@
+"""
+Shared cache of destination search results.
+
+Many users get the same fresh releases and each of their playlists searched
+the destination again for the identical (artist, title, remix). Results are
+cached per destination under the track's normalized fingerprint (see
+``utils.sources.dedup``), so a search runs once per release rather than once
+per user. A YouTube ``search().list`` costs 100 quota units, so every hit
+there is a search the quota no longer pays for.
+
+Misses are cached too, with a shorter TTL: a release that is not on a
+destination yet often appears there within a day or two. Failed requests
+(errors, rate limits) are not cached.
+"""
+import os
+import hashlib
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from utils.cache import TTLCache
+from utils.sources.base import Track
+from utils.sources.dedup import track_fingerprint
+
+# How long found matches and "not found" results are reused
+MATCH_TTL = timedelta(days=int(os.environ.get("MATCH_CACHE_TTL_DAYS", 30)))
+NEGATIVE_MATCH_TTL = timedelta(hours=int(os.environ.get("MATCH_CACHE_NEGATIVE_TTL_HOURS", 24)))
+# Entries kept by the process-local store
+MATCH_CACHE_SIZE = int(os.environ.get("MATCH_CACHE_SIZE", 20000))
+
+
+@dataclass
+class CachedMatch:
+    """A destination's search result for a track fingerprint."""
+    destination: str
+    match_key: str
+    matched: bool
+    match_id: str = ""
+    match_url: str = ""
+    match_name: str = ""
+    match_artist: str = ""
+    score: float = 0.0
+    message: str = ""
+    cached_at: Optional[datetime] = None
+
+
+def match_key(track: Track) -> Optional[str]:
+    """Stable key for a track's normalized (artist, title, remix), or None without a title."""
+    artist, title, remix = track_fingerprint(track)
+    if not title:
+        return None
+    return hashlib.sha1(f"{artist}\n{title}\n{remix}".encode("utf-8")).hexdigest()
+
+
+class InMemoryMatchStore:
+    """Process-local match store (used by the CLI and as the default).
+
+    Bounded LRU with the longer (found) TTL; MatchCache applies the shorter
+    TTL of "not found" results when reading.
+    """
+
+    def __init__(self, max_size: int = MATCH_CACHE_SIZE, ttl: timedelta = MATCH_TTL):
+        self._matches = TTLCache(max_size=max_size, ttl=ttl.total_seconds())
+
+    def get(self, destination: str, key: str) -> Optional[CachedMatch]:
+        return self._matches.get((destination, key))
+
+    def save(self, match: CachedMatch) -> None:
+        self._matches.set((match.destination, match.match_key), match)
+
+
+class MatchCache:
+    """Looks up and stores destination search results with separate hit/miss TTLs."""
+
+    def __init__(self, store=None, ttl: timedelta = MATCH_TTL,
+                 negative_ttl: timedelta = NEGATIVE_MATCH_TTL):
+        """
+        Args:
+            store: Optional store with get(destination, key) / save(CachedMatch);
+                   defaults to a process-local one
+        """
+        self.store = store if store is not None else InMemoryMatchStore()
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, destination: str, track: Track) -> Optional[CachedMatch]:
+        """Return the cached result for track on destination, if there is a fresh one."""
+        key = match_key(track)
+        cached = self.store.get(destination, key) if key else None
+        if cached is not None and cached.cached_at is not None:
+            ttl = self.ttl if cached.matched else self.negative_ttl
+            if datetime.utcnow() - cached.cached_at > ttl:
+                cached = None
+
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return cached
+
+    def save(self, destination: str, track: Track, matched: bool, **fields) -> None:
+        """Store a search result for track; fields are the remaining CachedMatch fields."""
+        key = match_key(track)
+        if not key:
+            return
+        self.store.save(CachedMatch(destination=destination, match_key=key, matched=matched,
+                                    cached_at=datetime.utcnow(), **fields))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+
+# Shared by destinations that are not given a store of their own
+DEFAULT_MATCH_CACHE = MatchCache()
@@ -0,0 +1,149 @@
+"""
+Offline accuracy and speed evaluation of match scoring.
+
+Runs a scorer over the labelled corpus in match_corpus.json (source tracks
+with the Spotify search results they got and the correct result, if any),
+picks the best candidate the way search_track does, and reports precision
+and recall of accepting that candidate at each min_match_score threshold,
+along with tracks per second and time per candidate. Used by
+benchmark_matching.py and test_match_corpus.py, so a change to scoring is
+checked for both accuracy and speed regressions.
+"""
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from utils.destinations.base import PlaylistDestination
+from utils.sources.base import Track
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "match_corpus.json")
+
+# Includes 0.7 (Spotify search_track and create_playlist) and 0.85 (the base class default)
+DEFAULT_THRESHOLDS = (0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9)
+
+# (track, candidate title, candidate artist) -> score between 0.0 and 1.0
+Scorer = Callable[[Track, str, str], float]
+
+
+@dataclass
+class MatchCase:
+    """A source track, its search results as (id, title, artist), and the correct result ID."""
+    id: str
+    note: str
+    track: Track
+    candidates: List[Tuple[str, str, str]]
+    expected: Optional[str]
+
+
+@dataclass
+class ThresholdResult:
+    """Counts of accepted best candidates at one min_match_score."""
+    threshold: float
+    true_positives: int = 0
+    false_positives: int = 0
+    false_negatives: int = 0
+    errors: List[str] = field(default_factory=list)  # IDs of cases decided wrongly
+
+    @property
+    def precision(self) -> float:
+        accepted = self.true_positives + self.false_positives
+        return self.true_positives / accepted if accepted else 1.0
+
+    @property
+    def recall(self) -> float:
+        positives = self.true_positives + self.false_negatives
+        return self.true_positives / positives if positives else 1.0
+
+
+@dataclass
+class Evaluation:
+    """Accuracy per threshold and scoring speed of one scorer over a corpus."""
+    results: List[ThresholdResult]
+    tracks: int
+    candidates: int
+    seconds: float
+
+    @property
+    def tracks_per_second(self) -> float:
+        return self.tracks / self.seconds if self.seconds else 0.0
+
+    @property
+    def us_per_candidate(self) -> float:
+        return self.seconds / self.candidates * 1e6 if self.candidates else 0.0
+
+    def at(self, threshold: float) -> ThresholdResult:
+        return next(result for result in self.results if abs(result.threshold - threshold) < 1e-9)
+
+
+def load_corpus(path: str = CORPUS_PATH) -> List[MatchCase]:
+    """Load labelled cases from a corpus file of recorded search responses."""
+    with open(path, encoding="utf-8") as corpus_file:
+        corpus = json.load(corpus_file)
+
+    cases = []
+    for case in corpus["cases"]:
+        items = case["response"].get("tracks", {}).get("items", [])
+        cases.append(MatchCase(
+            id=case["id"],
+            note=case.get("note", ""),
+            track=Track(title=case["track"]["title"], artist=case["track"]["artist"],
+                        remix=case["track"].get("remix")),
+            candidates=[(item["id"], item["name"], item["artists"][0]["name"] if item["artists"] else "")
+                        for item in items],
+            expected=case["expected"]
+        ))
+    return cases
+
+
+def best_candidate(case: MatchCase, scorer: Scorer) -> Tuple[Optional[str], float]:
+    """Best candidate ID and score, choosing like search_track (first highest, 0 is no match)."""
+    best_id, best_score = None, 0.0
+    for candidate_id, title, artist in case.candidates:
+        score = scorer(case.track, title, artist)
+        if score > best_score:
+            best_id, best_score = candidate_id, score
+    return best_id, best_score
+
+
+def evaluate(cases: Sequence[MatchCase], scorer: Scorer = PlaylistDestination.calculate_match_score,
+             thresholds: Sequence[float] = DEFAULT_THRESHOLDS, repeat: int = 1) -> Evaluation:
+    """
+    Score every case and count outcomes at each threshold.
+
+    A case is a true positive when its best candidate is the expected one
+    and scores at least the threshold, a false positive when another
+    candidate is accepted, and a false negative when the expected candidate
+    is not accepted.
+
+    Args:
+        repeat: Times to score the corpus for the timing figures
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        picks = [best_candidate(case, scorer) for case in cases]
+    seconds = time.perf_counter() - start
+
+    results = []
+    for threshold in thresholds:
+        result = ThresholdResult(threshold=threshold)
+        for case, (best_id, best_score) in zip(cases, picks):
+            accepted = best_id if best_id is not None and best_score >= threshold else None
+            if accepted is not None and accepted == case.expected:
+                result.true_positives += 1
+                continue
+            if accepted is not None:
+                result.false_positives += 1
+            if case.expected is not None:
+                result.false_negatives += 1
+            if accepted != case.expected:
+                result.errors.append(case.id)
+        results.append(result)
+
+    return Evaluation(
+        results=results,
+        tracks=len(cases) * repeat,
+        candidates=sum(len(case.candidates) for case in cases) * repeat,
+        seconds=seconds
+    )
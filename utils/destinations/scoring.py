@@ -0,0 +1,227 @@
+"""
+Fuzzy-match scoring of destination search results.
+
+Every search scores each returned candidate against the track, and the
+pure-Python DP behind it was the hot spot of matching: it allocates a list
+per row and always fills the whole n·m table, even for candidates that are
+obviously worse than the best one so far. This module computes the same
+scores as before, faster:
+
+- normalization strips punctuation with one ``str.translate`` pass and is
+  memoized, so the track's title and artist are normalized once per search
+  and recurring candidate strings once per process;
+- edit distance uses Myers' bit-parallel algorithm (one pass over the
+  shorter string with Python ints as bit vectors) and stops as soon as the
+  distance can no longer stay under a bound;
+- TrackScorer scores one track against a batch of candidates, deriving that
+  bound from the best score so far (or a minimum score), so hopeless
+  candidates exit early.
+"""
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.sources.base import Track
+
+# Removed in this order, before punctuation, like the original replace() chain
+TITLE_NOISE_WORDS = ("official", "video", "audio", "lyric", "lyrics", "ft.", "feat.", "remix", "edit")
+ARTIST_NOISE_WORDS = ("official", "dj", "feat.", "ft.")
+
+_PUNCTUATION = str.maketrans("", "", ",.()[]{}!?\"':-;")
+
+# Scores are compared with this slack so rounding never prunes a candidate that ties
+_EPSILON = 1e-9
+
+
+def _normalize(value: str, noise_words: Tuple[str, ...]) -> str:
+    value = value.lower()
+    for word in noise_words:
+        if word in value:
+            value = value.replace(word, "")
+    return " ".join(value.translate(_PUNCTUATION).split())
+
+
+@lru_cache(maxsize=8192)
+def normalize_title(title: str) -> str:
+    """Lowercase title without noise words, punctuation and repeated whitespace."""
+    if not title:
+        return ""
+    return _normalize(title, TITLE_NOISE_WORDS)
+
+
+@lru_cache(maxsize=8192)
+def normalize_artist(artist: str) -> str:
+    """Lowercase artist name without "dj", "feat." etc., punctuation and repeated whitespace."""
+    if not artist:
+        return ""
+    return _normalize(artist, ARTIST_NOISE_WORDS)
+
+
+class Pattern:
+    """A string prepared for repeated bit-parallel edit distance computations."""
+
+    __slots__ = ("text", "length", "peq", "mask", "last")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.length = len(text)
+        # Bit i of peq[c] is set where text[i] == c
+        peq: Dict[str, int] = {}
+        for i, char in enumerate(text):
+            peq[char] = peq.get(char, 0) | (1 << i)
+        self.peq = peq
+        self.mask = (1 << self.length) - 1
+        self.last = 1 << (self.length - 1) if self.length else 0
+
+    def distance(self, other: str, max_distance: Optional[int] = None) -> int:
+        """
+        Levenshtein distance to other (Myers/Hyyrö bit-vector algorithm).
+
+        With max_distance, returns max_distance + 1 as soon as the distance
+        is known to exceed it.
+        """
+        m, n = self.length, len(other)
+        if max_distance is None:
+            max_distance = max(m, n)
+        if abs(m - n) > max_distance:
+            return max_distance + 1
+        if not m or not n:
+            return m or n
+        if self.text == other:
+            return 0
+
+        peq, mask, last = self.peq, self.mask, self.last
+        pv, mv, score = mask, 0, m
+        for j, char in enumerate(other):
+            eq = peq.get(char, 0)
+            xv = eq | mv
+            xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+            ph = mv | (~(xh | pv) & mask)
+            mh = pv & xh
+            if ph & last:
+                score += 1
+            elif mh & last:
+                score -= 1
+            # Each remaining character lowers the distance by at most one
+            if score - (n - j - 1) > max_distance:
+                return max_distance + 1
+            ph = ((ph << 1) | 1) & mask
+            mh = (mh << 1) & mask
+            pv = mh | (~(xv | ph) & mask)
+            mv = ph & xv
+        return score
+
+
+def levenshtein_distance(s1: str, s2: str, max_distance: Optional[int] = None) -> int:
+    """Levenshtein distance between s1 and s2, or max_distance + 1 once it is exceeded."""
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    return Pattern(s1).distance(s2, max_distance)
+
+
+def _similarity(distance: int, max_length: int) -> float:
+    return 1.0 - (distance / max_length)
+
+
+def _max_distance(required: float, max_length: int) -> int:
+    """Largest distance whose similarity 1 - d/max_length is still >= required."""
+    return int((1.0 - required) * max_length + _EPSILON)
+
+
+def title_similarity(title1: str, title2: str) -> float:
+    """Similarity of two titles between 0.0 and 1.0 (1 - edit distance / length)."""
+    title1, title2 = normalize_title(title1), normalize_title(title2)
+    if title1 == title2:
+        return 1.0
+    max_length = max(len(title1), len(title2))
+    if max_length == 0:
+        return 0.0
+    return _similarity(levenshtein_distance(title1, title2), max_length)
+
+
+def _artist_similarity(artist1: str, artist2: str) -> float:
+    """artist_similarity for normalized names."""
+    if artist1 == artist2:
+        return 1.0
+    if artist1 in artist2 or artist2 in artist1:
+        return 0.9
+    max_length = max(len(artist1), len(artist2))
+    if max_length == 0:
+        return 0.0
+    return _similarity(levenshtein_distance(artist1, artist2), max_length)
+
+
+def artist_similarity(artist1: str, artist2: str) -> float:
+    """Similarity of two artist names between 0.0 and 1.0; containment scores 0.9."""
+    return _artist_similarity(normalize_artist(artist1), normalize_artist(artist2))
+
+
+class TrackScorer:
+    """Scores candidates (title, artist) against one track, preparing the track once."""
+
+    def __init__(self, track: Track):
+        self.track = track
+        self.title = normalize_title(track.title)
+        self.artist = normalize_artist(track.artist)
+        self.remix = track.remix.lower() if track.remix else ""
+        self._pattern = Pattern(self.title)
+        self.comparisons = 0
+        self.pruned = 0
+
+    def score(self, match_title: str, match_artist: str, min_score: float = 0.0) -> Optional[float]:
+        """
+        Match score between 0.0 and 1.0: title and artist similarity weighted
+        equally, plus 0.05 if the remix name appears in the match title.
+
+        Returns:
+            The score, or None if it is certainly below min_score
+        """
+        artist_score = _artist_similarity(self.artist, normalize_artist(match_artist))
+        remix_bonus = 0.05 if self.remix and self.remix in match_title.lower() else 0.0
+
+        title = normalize_title(match_title)
+        if title == self.title:
+            title_score = 1.0
+        else:
+            max_length = max(len(title), self._pattern.length)
+            if max_length == 0:
+                title_score = 0.0
+            else:
+                # Title similarity needed for (title + artist) / 2 + bonus to reach min_score
+                required = (min_score - remix_bonus - artist_score * 0.5) / 0.5
+                if required > 1.0 + _EPSILON:
+                    self.pruned += 1
+                    return None
+                max_distance = _max_distance(required, max_length) if required > 0 else max_length
+                self.comparisons += 1
+                distance = self._pattern.distance(title, max_distance)
+                if distance > max_distance:
+                    self.pruned += 1
+                    return None
+                title_score = _similarity(distance, max_length)
+
+        score = min(1.0, (title_score * 0.5) + (artist_score * 0.5) + remix_bonus)
+        return score if score >= min_score - _EPSILON else None
+
+    def score_all(self, candidates: Iterable[Tuple[str, str]],
+                  min_score: float = 0.0) -> List[Optional[float]]:
+        """Score (title, artist) candidates; None where a candidate is below min_score."""
+        return [self.score(title, artist, min_score) for title, artist in candidates]
+
+    def best_match(self, candidates: Sequence[Tuple[str, str]],
+                   min_score: float = 0.0) -> Tuple[Optional[int], float]:
+        """
+        Find the best (title, artist) candidate.
+
+        Candidates are only scored exactly if they can still beat the best
+        so far, so the result equals scoring all of them. Like the loops it
+        replaces, the first of equal scores wins and a score of 0 is no match.
+
+        Returns:
+            Tuple of (index of the best candidate or None, its score)
+        """
+        best_index, best_score = None, 0.0
+        for index, (title, artist) in enumerate(candidates):
+            score = self.score(title, artist, max(min_score, best_score))
+            if score is not None and score > best_score:
+                best_index, best_score = index, score
+        return best_index, best_score
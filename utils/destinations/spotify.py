@@ -12,9 +12,12 @@ import base64
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 
-import aiohttp
 from utils.sources.base import Track
 from utils.destinations.base import PlaylistDestination, MatchResult, PlaylistResult
+from utils.destinations.match_cache import MatchCache
+from utils.destinations.scoring import TrackScorer
+from utils.destinations.spotify_queries import SPOTIFY_QUERY_STATS, plan_queries
+from utils.spotify_scheduler import SPOTIFY_SCHEDULER, SpotifyScheduler
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -24,10 +27,22 @@ class SpotifyDestination(PlaylistDestination):
     """Creates playlists on Spotify."""
     
     API_BASE_URL = "https://api.spotify.com/v1"
+    # Score a search result needs to count as a match (and to stop relaxing the query)
+    MATCH_THRESHOLD = 0.7
     AUTH_FILE_PATH = os.path.expanduser("~/.spotify_auth.json")
     
-    def __init__(self):
+    def __init__(self, scheduler: SpotifyScheduler = SPOTIFY_SCHEDULER, match_store=None):
+        """
+        Args:
+            scheduler: Rate-limited scheduler for search requests
+            match_store: Optional store for cached search results (get/save of
+                         CachedMatch); the process-wide in-memory cache otherwise
+        """
         self.auth_data = None
+        self.scheduler = scheduler
+        self.query_stats = SPOTIFY_QUERY_STATS
+        if match_store is not None:
+            self.match_cache = MatchCache(match_store)
     
     @property
     def name(self) -> str:
@@ -123,7 +138,7 @@ class SpotifyDestination(PlaylistDestination):
             auth_bytes = auth_string.encode('ascii')
             base64_auth = base64.b64encode(auth_bytes).decode('ascii')
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.post(
                     "https://accounts.spotify.com/api/token",
                     headers={
@@ -172,72 +187,105 @@ class SpotifyDestination(PlaylistDestination):
                 message="Not authenticated"
             )
         
-        # Create search query
-        query = f"{track.title} {track.artist}"
-        if track.remix:
-            query += f" {track.remix}"
+        cached = self.cached_match(track)
+        if cached is not None:
+            return cached
         
-        # URL-encode the query
-        query = query.replace(" ", "%20")
+        scorer = TrackScorer(track)
+        best_match, best_score, best_stage = None, 0.0, None
+        stages_run = []
+        found_any = False
         
-        async with aiohttp.ClientSession() as session:
+        async with self.http.session() as session:
             headers = {
                 "Authorization": f"Bearer {self.auth_data['access_token']}",
                 "Content-Type": "application/json"
             }
             
-            async with session.get(
-                f"{self.API_BASE_URL}/search?q={query}&type=track&limit=5",
-                headers=headers
-            ) as response:
-                if response.status != 200:
+            # Strictest query first; relax it only while nothing scores above the threshold
+            for stage, query in plan_queries(track):
+                status, data = await self.scheduler.get_json(
+                    session,
+                    f"{self.API_BASE_URL}/search",
+                    params={"q": query, "type": "track", "limit": 5},
+                    headers=headers
+                )
+                stages_run.append(stage)
+                if status != 200:
+                    self.query_stats.record(stages_run, None)
                     return MatchResult(
                         track=track,
                         matched=False,
-                        message=f"Search failed with status {response.status}"
+                        message=f"Search failed with status {status}"
                     )
                 
-                data = await response.json()
-                
-                if "tracks" not in data or "items" not in data["tracks"] or len(data["tracks"]["items"]) == 0:
-                    return MatchResult(
-                        track=track,
-                        matched=False,
-                        message="No matching tracks found"
-                    )
+                items = (data.get("tracks") or {}).get("items") or []
+                if not items:
+                    continue
+                found_any = True
                 
                 # Find the best match
-                best_match = None
-                best_score = 0.0
-                
-                for item in data["tracks"]["items"]:
-                    track_title = item["name"]
-                    track_artist = item["artists"][0]["name"] if item["artists"] else ""
-                    
-                    score = self.calculate_match_score(track, track_title, track_artist)
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_match = item
-                
-                if best_match and best_score >= 0.7:
-                    return MatchResult(
-                        track=track,
-                        matched=True,
-                        match_id=best_match["id"],
-                        match_url=best_match["external_urls"]["spotify"],
-                        match_name=best_match["name"],
-                        match_artist=best_match["artists"][0]["name"] if best_match["artists"] else "",
-                        score=best_score,
-                        message="Match found"
-                    )
-                else:
-                    return MatchResult(
-                        track=track,
-                        matched=False,
-                        score=best_score if best_match else 0.0,
-                        message="No good match found"
-                    )
+                index, score = scorer.best_match([
+                    (item["name"], item["artists"][0]["name"] if item["artists"] else "")
+                    for item in items
+                ])
+                if index is not None and score > best_score:
+                    best_match, best_score, best_stage = items[index], score, stage
+                if best_score >= self.MATCH_THRESHOLD:
+                    break
+        
+        matched = best_match is not None and best_score >= self.MATCH_THRESHOLD
+        self.query_stats.record(stages_run, best_stage if matched else None)
+        
+        if not found_any:
+            return self.cache_match(MatchResult(
+                track=track,
+                matched=False,
+                message="No matching tracks found"
+            ))
+        
+        if matched:
+            return self.cache_match(MatchResult(
+                track=track,
+                matched=True,
+                match_id=best_match["id"],
+                match_url=best_match["external_urls"]["spotify"],
+                match_name=best_match["name"],
+                match_artist=best_match["artists"][0]["name"] if best_match["artists"] else "",
+                score=best_score,
+                message="Match found"
+            ))
+        else:
+            return self.cache_match(MatchResult(
+                track=track,
+                matched=False,
+                score=best_score if best_match else 0.0,
+                message="No good match found"
+            ))
+    
+    async def match_tracks(self, tracks: List[Track], progress_callback=None) -> List[MatchResult]:
+        """
+        Search for tracks concurrently within Spotify's rate limit.
+        
+        Args:
+            tracks: Tracks to search for
+            progress_callback: Optional coroutine called with (completed, total, track) as searches finish
+            
+        Returns:
+            MatchResults in the order of tracks
+        """
+        async def search(track: Track) -> MatchResult:
+            try:
+                return await self.search_track(track)
+            except Exception as e:
+                logger.warning(f"Error searching Spotify for '{track.title}': {e}")
+                return MatchResult(track=track, matched=False, message=f"Search error: {e}")
+        
+        async def on_result(completed: int, match_result: MatchResult) -> None:
+            if progress_callback:
+                await progress_callback(completed, len(tracks), match_result.track)
+        
+        return await self.scheduler.map(tracks, search, on_result=on_result)
     
     async def add_tracks_to_playlist(
         self, 
@@ -267,7 +315,7 @@ class SpotifyDestination(PlaylistDestination):
         # Split track IDs into batches of 100 (Spotify's limit)
         batches = [track_ids[i:i+100] for i in range(0, len(track_ids), 100)]
         
-        async with aiohttp.ClientSession() as session:
+        async with self.http.session() as session:
             for i, batch in enumerate(batches):
                 if progress_callback:
                     try:
@@ -382,7 +430,7 @@ class SpotifyDestination(PlaylistDestination):
         try:
             print("DEBUG: Starting playlist creation process...")
             # Create the playlist
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 headers = {
                     "Authorization": f"Bearer {self.auth_data['access_token']}",
                     "Content-Type": "application/json"
@@ -449,33 +497,34 @@ class SpotifyDestination(PlaylistDestination):
                 matched_results = []
                 unmatched_results = []
                 
-                for i, track in enumerate(tracks):
-                    if i < 3:  # Debug first 3 tracks
-                        print(f"DEBUG: Processing track {i+1}: '{track.title}' by '{track.artist}'")
-                    
-                    if progress_callback:
-                        try:
-                            if asyncio.iscoroutinefunction(progress_callback):
-                                await progress_callback(
-                                    10 + int((i / len(tracks)) * 70),
-                                    100,
-                                    f"Matching track {i+1}/{len(tracks)}: {track.title} by {track.artist}"
-                                )
-                            else:
-                                progress_callback(
-                                    10 + int((i / len(tracks)) * 70),
-                                    100,
-                                    f"Matching track {i+1}/{len(tracks)}: {track.title} by {track.artist}"
-                                )
-                        except Exception as e:
-                            print(f"DEBUG: Progress callback error: {e}")
-                            # Continue without progress callback
-                            progress_callback = None
-                    
-                    match_result = await self.search_track(track)
-                    
+                async def report_match(completed: int, total: int, track: Track) -> None:
+                    nonlocal progress_callback
+                    if not progress_callback:
+                        return
+                    try:
+                        if asyncio.iscoroutinefunction(progress_callback):
+                            await progress_callback(
+                                10 + int((completed / total) * 70),
+                                100,
+                                f"Matched track {completed}/{total}: {track.title} by {track.artist}"
+                            )
+                        else:
+                            progress_callback(
+                                10 + int((completed / total) * 70),
+                                100,
+                                f"Matched track {completed}/{total}: {track.title} by {track.artist}"
+                            )
+                    except Exception as e:
+                        print(f"DEBUG: Progress callback error: {e}")
+                        # Continue without progress callback
+                        progress_callback = None
+                
+                # Searches run concurrently; results come back in track order
+                match_results = await self.match_tracks(tracks, progress_callback=report_match)
+                
+                for i, match_result in enumerate(match_results):
                     if i < 3:  # Debug first 3 results
-                        print(f"DEBUG: Track {i+1} match result: matched={match_result.matched}, score={getattr(match_result, 'score', 'N/A')}")
+                        print(f"DEBUG: Track {i+1} '{match_result.track.title}' by '{match_result.track.artist}': matched={match_result.matched}, score={getattr(match_result, 'score', 'N/A')}")
                     
                     # Add to appropriate lists for later CSV generation
                     if match_result.matched and match_result.score >= min_match_score:
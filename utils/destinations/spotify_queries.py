@@ -0,0 +1,118 @@
+"""
+Staged Spotify search queries for a track.
+
+A single free-text "title artist remix" query misses tracks whose remix
+name or featured artist is spelled differently on Spotify, and also
+returns loosely related results. The planner starts with a field-filtered
+``track:"…" artist:"…"`` query and relaxes it stage by stage (drop the
+remix, strip "feat." credits, free text); search_track stops at the first
+stage whose best candidate scores above the match threshold.
+
+Requests and hits are counted per stage, so the cost of each stage in
+requests per matched track can be measured.
+"""
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from utils.sources.base import Track
+
+# Stage names in the order they are tried
+EXACT = "exact"
+NO_REMIX = "no_remix"
+NO_FEATURING = "no_featuring"
+FREE_TEXT = "free_text"
+STAGES = (EXACT, NO_REMIX, NO_FEATURING, FREE_TEXT)
+
+UNKNOWN_ARTIST = "unknown artist"
+
+# "(feat. X)" / "[ft. X]" anywhere, or a trailing "feat. X" / "featuring X"
+_BRACKETED_FEATURING = re.compile(r"\s*[(\[]\s*(?:feat|ft|featuring)\b\.?[^)\]]*[)\]]", re.IGNORECASE)
+_TRAILING_FEATURING = re.compile(r"\s+(?:feat|ft|featuring)\b\.?\s.*$", re.IGNORECASE)
+
+
+def _clean(value: Optional[str]) -> str:
+    # Double quotes would end a field filter's phrase early
+    return " ".join((value or "").replace('"', " ").split())
+
+
+def strip_featuring(value: str) -> str:
+    """Remove "feat." credits from a title or artist."""
+    value = _BRACKETED_FEATURING.sub("", value)
+    return _TRAILING_FEATURING.sub("", value).strip()
+
+
+def field_query(title: str, artist: str) -> str:
+    return f'track:"{title}" artist:"{artist}"'
+
+
+def plan_queries(track: Track) -> List[Tuple[str, str]]:
+    """
+    Search queries for a track, strictest first.
+
+    Returns:
+        (stage name, query) pairs; stages that would repeat an earlier query are left out
+    """
+    title, artist, remix = _clean(track.title), _clean(track.artist), _clean(track.remix)
+    plain_title, plain_artist = strip_featuring(title) or title, strip_featuring(artist) or artist
+
+    if not artist or artist.lower() == UNKNOWN_ARTIST:
+        # Unparsed uploads carry the artist in the title, so field filters cannot help
+        stages = [(FREE_TEXT, plain_title)]
+    else:
+        stages = [
+            (EXACT, field_query(f"{title} {remix}" if remix else title, artist)),
+            (NO_REMIX, field_query(title, artist)),
+            (NO_FEATURING, field_query(plain_title, plain_artist)),
+            (FREE_TEXT, f"{plain_title} {plain_artist}"),
+        ]
+
+    planned, seen = [], set()
+    for stage, query in stages:
+        if query and query not in seen:
+            seen.add(query)
+            planned.append((stage, query))
+    return planned
+
+
+class QueryStageStats:
+    """Counts searches, requests and matches per query stage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tracks = 0
+        self.matched = 0
+        self.requests: Counter = Counter()
+        self.hits: Counter = Counter()
+
+    def record(self, stages_run: Sequence[str], matched_stage: Optional[str]) -> None:
+        """Record one track's search: the stages it sent and the stage that matched, if any."""
+        with self._lock:
+            self.tracks += 1
+            self.requests.update(stages_run)
+            if matched_stage is not None:
+                self.matched += 1
+                self.hits[matched_stage] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            total_requests = sum(self.requests.values())
+            return {
+                'tracks': self.tracks,
+                'matched': self.matched,
+                'requests': total_requests,
+                'requests_per_match': round(total_requests / self.matched, 2) if self.matched else None,
+                'stages': {
+                    stage: {
+                        'requests': self.requests[stage],
+                        'hits': self.hits[stage],
+                        'hit_rate': round(self.hits[stage] / self.requests[stage], 3) if self.requests[stage] else None,
+                    }
+                    for stage in STAGES
+                },
+            }
+
+
+# Shared by every SpotifyDestination in the process
+SPOTIFY_QUERY_STATS = QueryStageStats()
@@ -10,7 +10,6 @@ from typing import List, Dict, Any, Optional, Callable
 from pathlib import Path
 
 import google_auth_oauthlib.flow
-import googleapiclient.discovery
 import googleapiclient.errors
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
@@ -19,6 +18,10 @@ from google.auth.exceptions import RefreshError
 
 from utils.sources.base import Track
 from utils.destinations.base import PlaylistDestination, MatchResult, PlaylistResult
+from utils.destinations.match_cache import MatchCache
+from utils.destinations.scoring import TrackScorer
+from utils.youtube_client import YOUTUBE_CLIENTS
+from utils.youtube_quota import QUOTA_MANAGER
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -34,9 +37,16 @@ TOKEN_FILE = Path.home() / ".youtube_token.json"
 class YouTubeDestination(PlaylistDestination):
     """Creates playlists on YouTube."""
     
-    def __init__(self):
+    def __init__(self, match_store=None):
+        """
+        Args:
+            match_store: Optional store for cached search results (get/save of
+                         CachedMatch); the process-wide in-memory cache otherwise
+        """
         self.youtube = None
         self.credentials = None
+        if match_store is not None:
+            self.match_cache = MatchCache(match_store)
     
     @property
     def name(self) -> str:
@@ -106,13 +116,12 @@ class YouTubeDestination(PlaylistDestination):
                 logger.info(f"Saved credentials to {TOKEN_FILE}")
             
             # Build the YouTube API client
-            self.youtube = googleapiclient.discovery.build(
-                "youtube", "v3", credentials=self.credentials
-            )
+            self.youtube = YOUTUBE_CLIENTS.build_authorized(self.credentials)
             
             # Test connection
-            response = await asyncio.to_thread(
-                self.youtube.channels().list(part="snippet", mine=True).execute
+            response = await QUOTA_MANAGER.execute(
+                self.youtube.channels().list(part="snippet", mine=True),
+                "channels.list"
             )
             
             if "items" in response and len(response["items"]) > 0:
@@ -147,6 +156,11 @@ class YouTubeDestination(PlaylistDestination):
         if not self.youtube:
             raise ValueError("Not authenticated. Call authenticate() first.")
         
+        # A cached result saves the 100-unit search
+        cached = self.cached_match(track)
+        if cached is not None:
+            return cached
+        
         # Create search query
         query = f"{track.artist} - {track.title}"
         if track.remix:
@@ -163,16 +177,17 @@ class YouTubeDestination(PlaylistDestination):
                     video_id = video_id_match.group(1)
                     
                     # Get video details
-                    response = await asyncio.to_thread(
+                    response = await QUOTA_MANAGER.execute(
                         self.youtube.videos().list(
                             part="snippet",
                             id=video_id
-                        ).execute
+                        ),
+                        "videos.list"
                     )
                     
                     if "items" in response and len(response["items"]) > 0:
                         video = response["items"][0]
-                        return MatchResult(
+                        return self.cache_match(MatchResult(
                             track=track,
                             matched=True,
                             match_id=video_id,
@@ -181,47 +196,40 @@ class YouTubeDestination(PlaylistDestination):
                             match_artist=video["snippet"]["channelTitle"],
                             score=1.0,
                             message="Direct YouTube URL match"
-                        )
+                        ))
             except Exception as e:
                 logger.error(f"Error getting video details: {e}")
         
         try:
             # Search for the track
-            response = await asyncio.to_thread(
+            response = await QUOTA_MANAGER.execute(
                 self.youtube.search().list(
                     part="snippet",
                     q=query,
                     type="video",
                     maxResults=5
-                ).execute
+                ),
+                "search.list"
             )
             
             if "items" not in response or len(response["items"]) == 0:
-                return MatchResult(
+                return self.cache_match(MatchResult(
                     track=track,
                     matched=False,
                     message="No videos found on YouTube"
-                )
+                ))
             
             # Find the best match
-            best_score = 0.0
-            best_video = None
-            
-            for video in response["items"]:
-                video_title = video["snippet"]["title"]
-                video_channel = video["snippet"]["channelTitle"]
-                
-                # Calculate match score
-                score = self.calculate_match_score(track, video_title, video_channel)
-                
-                if score > best_score:
-                    best_score = score
-                    best_video = video
+            best_index, best_score = TrackScorer(track).best_match([
+                (video["snippet"]["title"], video["snippet"]["channelTitle"])
+                for video in response["items"]
+            ])
+            best_video = response["items"][best_index] if best_index is not None else None
             
             # Return the best match if it's good enough
             if best_video and best_score >= 0.5:
                 video_id = best_video["id"]["videoId"]
-                return MatchResult(
+                return self.cache_match(MatchResult(
                     track=track,
                     matched=True,
                     match_id=video_id,
@@ -230,13 +238,13 @@ class YouTubeDestination(PlaylistDestination):
                     match_artist=best_video["snippet"]["channelTitle"],
                     score=best_score,
                     message=f"Found match with score {best_score:.2f}"
-                )
+                ))
             
-            return MatchResult(
+            return self.cache_match(MatchResult(
                 track=track,
                 matched=False,
                 message=f"No good matches found (best score: {best_score:.2f})"
-            )
+            ))
         
         except Exception as e:
             logger.error(f"Error searching YouTube: {e}")
@@ -278,7 +286,7 @@ class YouTubeDestination(PlaylistDestination):
         
         try:
             # Create the playlist
-            playlist_response = await asyncio.to_thread(
+            playlist_response = await QUOTA_MANAGER.execute(
                 self.youtube.playlists().insert(
                     part="snippet,status",
                     body={
@@ -290,7 +298,8 @@ class YouTubeDestination(PlaylistDestination):
                             "privacyStatus": "public" if public else "private"
                         }
                     }
-                ).execute
+                ),
+                "playlists.insert"
             )
             
             playlist_id = playlist_response["id"]
@@ -352,7 +361,7 @@ class YouTubeDestination(PlaylistDestination):
                 # Add videos to playlist
                 for video_id in batch:
                     try:
-                        await asyncio.to_thread(
+                        await QUOTA_MANAGER.execute(
                             self.youtube.playlistItems().insert(
                                 part="snippet",
                                 body={
@@ -364,7 +373,8 @@ class YouTubeDestination(PlaylistDestination):
                                         }
                                     }
                                 }
-                            ).execute
+                            ),
+                            "playlistItems.insert"
                         )
                         added_count += 1
                     except Exception as e:
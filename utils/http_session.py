@@ -0,0 +1,104 @@
+"""
+Shared, pooled aiohttp sessions for sources and destinations.
+
+Opening an ``aiohttp.ClientSession`` per call means a new TCP and TLS
+handshake for every request (Spotify search used to open one per track).
+HttpSessionManager keeps one session per event loop instead, with a
+connection pool limited per host, cached DNS lookups and keep-alive.
+
+aiohttp sessions belong to the loop that created them, so the session lives
+as long as that loop: task workers keep one loop per worker thread, and
+one-off ``asyncio.run`` calls go through ``HTTP_SESSIONS.run`` so the session
+is closed before the loop is.
+"""
+import os
+import asyncio
+import logging
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Dict
+
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class HttpSessionManager:
+    """Hands out one pooled ClientSession per running event loop."""
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 10, dns_ttl: int = 300,
+                 keepalive_timeout: float = 30, timeout: float = 60):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = \
+            weakref.WeakKeyDictionary()
+        self.created = 0
+
+    async def get_session(self) -> "aiohttp.ClientSession":
+        """Return the running loop's session, creating it on first use."""
+        # Imported here so Track and the base classes do not need aiohttp to import
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            session = aiohttp.ClientSession(connector=connector,
+                                            timeout=aiohttp.ClientTimeout(total=self.timeout))
+            with self._lock:
+                self._sessions[loop] = session
+                self.created += 1
+        return session
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator["aiohttp.ClientSession"]:
+        """``async with`` form of get_session; the shared session is left open on exit."""
+        yield await self.get_session()
+
+    async def close(self) -> None:
+        """Close the running loop's session, if it has one."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def run(self, coro: Awaitable[Any]) -> Any:
+        """asyncio.run(coro), closing the loop's session before the loop is closed."""
+        async def main():
+            try:
+                return await coro
+            finally:
+                await self.close()
+        return asyncio.run(main())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sessions = [session for session in self._sessions.values() if not session.closed]
+        return {
+            'open_sessions': len(sessions),
+            'sessions_created': self.created,
+            'limit': self.limit,
+            'limit_per_host': self.limit_per_host,
+        }
+
+
+# Shared by every MusicSource and PlaylistDestination in the process
+HTTP_SESSIONS = HttpSessionManager(
+    limit=int(os.environ.get("HTTP_POOL_LIMIT", 100)),
+    limit_per_host=int(os.environ.get("HTTP_POOL_LIMIT_PER_HOST", 10)),
+    dns_ttl=int(os.environ.get("HTTP_DNS_CACHE_TTL", 300)),
+    keepalive_timeout=float(os.environ.get("HTTP_KEEPALIVE_TIMEOUT", 30))
+)
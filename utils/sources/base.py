@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from datetime import date
 from typing import List, Optional, Dict, Any
 
+from utils.http_session import HTTP_SESSIONS, HttpSessionManager
+
 
 @dataclass
 class Track:
@@ -17,11 +19,15 @@ class Track:
     source: str = ""
     source_url: str = ""
     additional_info: Dict[str, Any] = None
+    duration: Optional[str] = None  # ISO 8601, e.g. "PT3M30S", where the source provides it
 
 
 class MusicSource(ABC):
     """Abstract base class for all music sources."""
     
+    # Pooled HTTP sessions; assign another HttpSessionManager on an instance to replace it
+    http: HttpSessionManager = HTTP_SESSIONS
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -4,7 +4,6 @@ Beatport RSS implementation of the MusicSource interface.
 This module fetches tracks from Beatport's RSS feeds for new releases and top 100 charts.
 """
 import asyncio
-import re
 import logging
 import xml.etree.ElementTree as ET
 from datetime import date, datetime, timedelta
@@ -13,6 +12,7 @@ from typing import List, Optional, Dict, Any, Tuple
 import aiohttp
 
 from utils.sources.base import MusicSource, Track
+from utils.sources.title_parser import parse_beatport_title
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,6 +22,15 @@ logger = logging.getLogger(__name__)
 class BeatportRSSSource(MusicSource):
     """Fetches tracks from Beatport's RSS feeds."""
     
+    # Browser-like headers sent with every request
+    REQUEST_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+                     "AppleWebKit/537.36 (KHTML, like Gecko) "
+                     "Chrome/91.0.4472.114 Safari/537.36",
+        "Accept": "application/rss+xml, application/xml",
+        "Cache-Control": "no-cache"
+    }
+    
     # Base URLs for Beatport feeds
     RELEASES_FEED = "https://www.beatport.com/feed/releases"
     TOP_100_FEED = "https://www.beatport.com/feed/top-100"
@@ -101,19 +110,10 @@ class BeatportRSSSource(MusicSource):
         
         logger.info(f"Fetching tracks from {len(feed_urls)} Beatport RSS feeds")
         
-        # Initialize HTTP session
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                         "AppleWebKit/537.36 (KHTML, like Gecko) "
-                         "Chrome/91.0.4472.114 Safari/537.36",
-            "Accept": "application/rss+xml, application/xml",
-            "Cache-Control": "no-cache"
-        }
-        
         all_tracks = []
         
         try:
-            async with aiohttp.ClientSession(headers=headers) as session:
+            async with self.http.session() as session:
                 # Process each feed
                 feed_tasks = []
                 for url in feed_urls:
@@ -170,7 +170,7 @@ class BeatportRSSSource(MusicSource):
         tracks = []
         
         try:
-            async with session.get(feed_url) as response:
+            async with session.get(feed_url, headers=self.REQUEST_HEADERS) as response:
                 if response.status != 200:
                     logger.error(f"Error fetching feed {feed_url}: {response.status}")
                     return []
@@ -263,27 +263,4 @@ class BeatportRSSSource(MusicSource):
         Returns:
             Tuple of (artist, title, remix)
         """
-        # Default values
-        artist = "Unknown Artist"
-        title = full_title
-        remix = None
-        
-        try:
-            # Split artist and title
-            if " - " in full_title:
-                artist, title_part = full_title.split(" - ", 1)
-            else:
-                title_part = full_title
-            
-            # Extract remix if available
-            remix_match = re.search(r'\(([^)]*(?:mix|remix|edit|dub|version)[^)]*)\)', title_part, re.IGNORECASE)
-            if remix_match:
-                remix = remix_match.group(1)
-                title = title_part[:remix_match.start()].strip()
-            else:
-                title = title_part
-        
-        except Exception as e:
-            logger.error(f"Error parsing title '{full_title}': {e}")
-        
-        return artist, title, remix
\ No newline at end of file
+        return parse_beatport_title(full_title)
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+Resolution index for YouTube channel references.
+
+Resolving an ``@handle`` costs a 100-unit ``search().list`` call plus a
+``channels().list`` call just to find the channel's uploads playlist, which
+never changes. Resolutions are stored so later fetches go straight to
+``playlistItems``.
+"""
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+
+@dataclass
+class ChannelResolution:
+    """A resolved channel reference (``@handle`` or channel ID)."""
+    lookup_key: str
+    channel_id: str
+    uploads_playlist_id: str
+    channel_title: str = ""
+    resolved_at: Optional[datetime] = None
+
+
+def normalize_channel_ref(channel_ref: str) -> str:
+    """Normalize a channel reference for lookups (handles are case-insensitive)."""
+    channel_ref = channel_ref.strip()
+    if channel_ref.startswith('@'):
+        return channel_ref.lower()
+    return channel_ref
+
+
+class InMemoryChannelResolutionStore:
+    """Process-local resolution index (used by the CLI and as the default)."""
+
+    def __init__(self):
+        self._resolutions: Dict[str, ChannelResolution] = {}
+        self._lock = threading.Lock()
+
+    def get(self, lookup_key: str) -> Optional[ChannelResolution]:
+        with self._lock:
+            return self._resolutions.get(normalize_channel_ref(lookup_key))
+
+    def save(self, resolution: ChannelResolution) -> None:
+        with self._lock:
+            self._resolutions[normalize_channel_ref(resolution.lookup_key)] = resolution
@@ -0,0 +1,118 @@
+"""
+Cross-source track deduplication within a task.
+
+The same release often shows up on several sources (a label upload that is
+also on the label's sub-playlists and an "all" list). Each track gets two
+keys, computed once: its video ID (or source URL) and a normalized
+(artist, title, remix) fingerprint. A track is a duplicate when either key
+was already seen, so the index runs in O(n) as source results stream in.
+"""
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from utils.sources.base import Track
+
+Fingerprint = Tuple[str, str, str]
+
+# Separator used when several sources carried the same track
+SOURCE_SEPARATOR = ", "
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+# "feat. X" / "ft. X" / "featuring X" up to the next bracket or the end
+_FEATURING = re.compile(r"\b(?:feat|ft|featuring)\b\.?[^()\[\]]*", re.IGNORECASE)
+# Bracketed noise such as "[Official Video]" or "(Official Audio)"
+_NOISE = re.compile(r"[(\[][^)\]]*\b(?:official|video|audio|visualizer|lyrics?)\b[^)\]]*[)\]]", re.IGNORECASE)
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """Casefold, drop accents, "feat." credits and punctuation, and collapse whitespace."""
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFKD", value)
+    value = "".join(char for char in value if not unicodedata.combining(char))
+    value = _NOISE.sub(" ", value)
+    value = _FEATURING.sub(" ", value)
+    return " ".join(_NON_WORD.sub(" ", value.casefold()).split())
+
+
+def track_fingerprint(track: Track) -> Fingerprint:
+    """Normalized (artist, title, remix) of a track."""
+    return normalize_text(track.artist), normalize_text(track.title), normalize_text(track.remix)
+
+
+def track_id(track: Track) -> Optional[str]:
+    """YouTube video ID of a track, or its source URL for other sources."""
+    url = track.source_url
+    if not url:
+        return None
+    parsed = urlparse(url)
+    if parsed.netloc.endswith("youtube.com"):
+        video_id = parse_qs(parsed.query).get("v")
+        if video_id:
+            return video_id[0]
+    elif parsed.netloc == "youtu.be":
+        return parsed.path.lstrip("/") or url
+    return url
+
+
+class TrackDeduplicator:
+    """Keeps the first copy of each track and merges the sources of later copies."""
+
+    def __init__(self):
+        self.tracks: List[Track] = []
+        self.duplicates_removed = 0
+        self._by_id: Dict[str, Track] = {}
+        self._by_fingerprint: Dict[Fingerprint, Track] = {}
+
+    def add(self, track: Track) -> bool:
+        """
+        Add a track unless it was already seen.
+
+        Returns:
+            True if the track was kept, False if it was merged into an earlier copy
+        """
+        video_id = track_id(track)
+        fingerprint = track_fingerprint(track)
+        # Without a title there is nothing to fingerprint, only the ID
+        if not fingerprint[1]:
+            fingerprint = None
+
+        kept = self._by_id.get(video_id) if video_id else None
+        if kept is None and fingerprint:
+            kept = self._by_fingerprint.get(fingerprint)
+
+        if kept is not None:
+            self.duplicates_removed += 1
+            merge_source(kept, track.source)
+            # Remember this copy's other key so a third copy matches either way
+            if video_id:
+                self._by_id.setdefault(video_id, kept)
+            if fingerprint:
+                self._by_fingerprint.setdefault(fingerprint, kept)
+            return False
+
+        self.tracks.append(track)
+        if video_id:
+            self._by_id[video_id] = track
+        if fingerprint:
+            self._by_fingerprint[fingerprint] = track
+        return True
+
+    def extend(self, tracks: Iterable[Track]) -> int:
+        """Add tracks in order; returns how many were kept."""
+        return sum(1 for track in tracks if self.add(track))
+
+    def __len__(self) -> int:
+        return len(self.tracks)
+
+
+def merge_source(kept: Track, source: str) -> None:
+    """Add a duplicate's source name to the copy that was kept."""
+    if not source:
+        return
+    sources = kept.source.split(SOURCE_SEPARATOR) if kept.source else []
+    if source not in sources:
+        sources.append(source)
+        kept.source = SOURCE_SEPARATOR.join(sources)
@@ -0,0 +1,54 @@
+"""
+Helpers for video durations as returned by the YouTube API (ISO 8601, e.g. "PT1H2M3S").
+"""
+import re
+from typing import Optional
+
+_ISO_DURATION = re.compile(
+    r"^P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+(?:\.\d+)?)S)?)?$"
+)
+
+
+def parse_iso8601_duration(value: Optional[str]) -> Optional[int]:
+    """
+    Convert an ISO 8601 duration such as "PT3M30S" to seconds.
+
+    Returns:
+        Duration in seconds, or None if value is empty or not an ISO 8601 duration.
+        Live streams and premieres report "P0D", which gives 0.
+    """
+    if not value:
+        return None
+    match = _ISO_DURATION.match(value.strip())
+    if not match:
+        return None
+    parts = match.groupdict()
+    return int(
+        int(parts["days"] or 0) * 86400
+        + int(parts["hours"] or 0) * 3600
+        + int(parts["minutes"] or 0) * 60
+        + float(parts["seconds"] or 0)
+    )
+
+
+def format_duration(seconds: Optional[int]) -> str:
+    """Format seconds as "m:ss" or "h:mm:ss", or "Unknown" if not known."""
+    if seconds is None:
+        return "Unknown"
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+def within_duration(seconds: Optional[int], min_seconds: Optional[int] = None,
+                    max_seconds: Optional[int] = None) -> bool:
+    """Whether a duration is inside [min_seconds, max_seconds]; unknown durations always pass."""
+    if seconds is None:
+        return True
+    if min_seconds and seconds < min_seconds:
+        return False
+    if max_seconds and seconds > max_seconds:
+        return False
+    return True
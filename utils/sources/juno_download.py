@@ -22,6 +22,16 @@ logger = logging.getLogger(__name__)
 class JunoDownloadSource(MusicSource):
     """Scrapes tracks from Juno Download."""
     
+    # Browser-like headers sent with every request
+    REQUEST_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Cache-Control': 'max-age=0'
+    }
+    
     BASE_URL = "https://www.junodownload.com"
     
     # Map of genre keys to their Juno Download URLs
@@ -67,17 +77,7 @@ class JunoDownloadSource(MusicSource):
         
         logger.info(f"Will scrape {len(urls_to_scrape)} Juno Download pages for tracks")
         
-        # Add headers to mimic a browser request
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Cache-Control': 'max-age=0'
-        }
-        
-        async with aiohttp.ClientSession(headers=headers) as session:
+        async with self.http.session() as session:
             all_track_links = set()  # Use a set to avoid duplicates
             tracks = []
             
@@ -86,7 +86,7 @@ class JunoDownloadSource(MusicSource):
                 for url in urls_to_scrape:
                     try:
                         logger.info(f"Scraping Juno Download URL: {url}")
-                        async with session.get(url) as response:
+                        async with session.get(url, headers=self.REQUEST_HEADERS) as response:
                             if response.status != 200:
                                 logger.warning(f"Error accessing {url}: HTTP {response.status}")
                                 continue
@@ -149,7 +149,7 @@ class JunoDownloadSource(MusicSource):
     async def _process_track(self, session: aiohttp.ClientSession, track_url: str) -> Optional[Track]:
         """Process a track page and extract track information."""
         try:
-            async with session.get(track_url) as response:
+            async with session.get(track_url, headers=self.REQUEST_HEADERS) as response:
                 if response.status != 200:
                     logger.warning(f"Error accessing track page {track_url}: {response.status}")
                     return None
@@ -0,0 +1,208 @@
+"""
+Near-duplicate clustering of tracks with MinHash/LSH blocking.
+
+Exact fingerprints (see dedup.py) miss uploads whose titles differ slightly,
+e.g. "Artist - Track (Extended Mix)" and "Artist – Track [Official Audio]".
+Comparing every pair with Levenshtein distance is O(n²), so each track's
+"artist title" text is reduced to a MinHash signature of its character
+n-grams (one permutation hashing) and hashed into LSH bands. Only tracks
+sharing band buckets are compared with the same test as
+PlaylistDestination.calculate_title_similarity.
+"""
+import hashlib
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.destinations.base import PlaylistDestination
+from utils.destinations.scoring import levenshtein_distance
+from utils.sources.base import Track
+from utils.sources.dedup import merge_source, normalize_text
+
+SHINGLE_SIZE = 3
+# 16 bands of 3 rows: pairs above ~0.4 n-gram Jaccard similarity are likely to share a
+# bucket, which catches most one- or two-character differences in a short title
+NUM_BANDS = 16
+ROWS_PER_BAND = 3
+# Minimum calculate_title_similarity score for two tracks to be merged
+SIMILARITY_THRESHOLD = 0.85
+# Candidates sharing fewer bands than this are almost never near duplicates (a one
+# letter typo usually shares 9 or more)
+MIN_SHARED_BANDS = 4
+# Bound on precise comparisons per track when a bucket gets crowded
+MAX_CANDIDATES = 20
+
+# Remix words that do not make a different version of the track
+GENERIC_VERSION_WORDS = {"extended", "original", "radio", "club", "mix", "edit", "version"}
+
+_UNKNOWN_ARTIST = normalize_text("Unknown Artist")
+
+# Added per bin of distance when an empty signature bin borrows a neighbour's value
+_DENSIFY_OFFSET = 1 << 62
+
+
+def match_text(track: Track) -> str:
+    """Normalized "artist title" used for near-duplicate comparison."""
+    artist = normalize_text(track.artist)
+    if artist == _UNKNOWN_ARTIST:
+        # Unparsed titles still carry the artist inside the title
+        artist = ""
+    return f"{artist} {normalize_text(track.title)}".strip()
+
+
+def version_key(track: Track) -> str:
+    """Remix name without generic words, so "Extended Mix" equals no remix but "Dub Mix" does not."""
+    return " ".join(word for word in normalize_text(track.remix).split() if word not in GENERIC_VERSION_WORDS)
+
+
+@lru_cache(maxsize=65536)
+def shingle_hash(gram: str) -> int:
+    """Non-negative 64-bit hash of an n-gram, the same in every process (unlike hash())."""
+    return int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Hashed character n-grams of text, padded so short words still count."""
+    padded = f" {text} "
+    if len(padded) <= size:
+        return {shingle_hash(padded)}
+    return {shingle_hash(padded[i:i + size]) for i in range(len(padded) - size + 1)}
+
+
+class NearDuplicateClusterer:
+    """Groups tracks whose artist and title are nearly the same."""
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD, bands: int = NUM_BANDS,
+                 rows: int = ROWS_PER_BAND, max_candidates: int = MAX_CANDIDATES,
+                 min_shared_bands: int = MIN_SHARED_BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.max_candidates = max_candidates
+        self.min_shared_bands = min_shared_bands
+        self.size = bands * rows
+        self.comparisons = 0
+
+    def signature(self, text: str) -> List[int]:
+        """
+        MinHash signature by one permutation hashing.
+        
+        Each shingle hash is hashed once into one of the signature's bins,
+        which keeps its minimum. Empty bins take the value of the next
+        non-empty bin to the right (rotation densification), so similar texts
+        still agree bin by bin. This is one pass over the shingles rather than
+        one per signature value.
+        """
+        size = self.size
+        bins: List[Optional[int]] = [None] * size
+        for value in shingles(text):
+            index, value = value % size, value // size
+            current = bins[index]
+            if current is None or value < current:
+                bins[index] = value
+
+        signature = list(bins)
+        borrowed, distance = None, 0
+        # Walk right to left twice so bins at the end can borrow from the start
+        for position in range(2 * size - 1, -1, -1):
+            index = position % size
+            if bins[index] is not None:
+                borrowed, distance = bins[index], 0
+                continue
+            distance += 1
+            if position < size and borrowed is not None:
+                signature[index] = borrowed + distance * _DENSIFY_OFFSET
+        return signature
+
+    def cluster(self, tracks: List[Track]) -> List[List[int]]:
+        """
+        Cluster tracks by near-duplicate artist and title.
+
+        Returns:
+            Lists of track indices in input order; the first index of each list
+            is the copy to keep
+        """
+        texts = [match_text(track) for track in tracks]
+        # Normalized the way calculate_title_similarity does it, once per track
+        scored = [PlaylistDestination.normalize_title(text) for text in texts]
+        letters = [Counter(text) for text in scored]
+        versions = [version_key(track) for track in tracks]
+        parent = list(range(len(tracks)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+
+            signature = self.signature(text)
+            # Earlier tracks sharing a bucket, by number of bands shared
+            shared_bands = Counter()
+            for band in range(self.bands):
+                key = (band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+                bucket = buckets.setdefault(key, [])
+                shared_bands.update(bucket[-self.max_candidates:])
+                bucket.append(i)
+
+            # Near duplicates share most bands; compare the closest candidates first
+            for j, bands_shared in shared_bands.most_common(self.max_candidates):
+                if bands_shared < self.min_shared_bands:
+                    break
+                root_i, root_j = find(i), find(j)
+                if root_i == root_j or versions[i] != versions[j]:
+                    continue
+                if self._similar(scored[i], scored[j], letters[i], letters[j]):
+                    # Lower index as root keeps the earliest copy first
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        clusters: Dict[int, List[int]] = {}
+        for i in range(len(tracks)):
+            clusters.setdefault(find(i), []).append(i)
+        return list(clusters.values())
+
+    def deduplicate(self, tracks: List[Track]) -> Tuple[List[Track], int]:
+        """
+        Keep the first track of each cluster, merging the others' source names into it.
+
+        Returns:
+            Tuple of (kept tracks in input order, near duplicates removed)
+        """
+        kept = []
+        # Clusters come out ordered by their first index, so input order is kept
+        for indices in self.cluster(tracks):
+            first = tracks[indices[0]]
+            for index in indices[1:]:
+                merge_source(first, tracks[index].source)
+            kept.append(first)
+        return kept, len(tracks) - len(kept)
+
+    def _similar(self, title1: str, title2: str, letters1: Optional[Counter] = None,
+                 letters2: Optional[Counter] = None) -> bool:
+        """
+        calculate_title_similarity(title1, title2) >= threshold, for pre-normalized titles.
+        
+        Cheap lower bounds on the edit distance (length and letter count
+        differences) rule out most candidates before the edit distance runs,
+        which itself stops once the distance is past the threshold.
+        """
+        if title1 == title2:
+            return True
+        max_length = max(len(title1), len(title2))
+        if not max_length:
+            return False
+        max_distance = (1.0 - self.threshold) * max_length
+        if abs(len(title1) - len(title2)) > max_distance:
+            return False
+        if letters1 is not None and letters2 is not None:
+            # Each edit fixes at most one missing and one surplus letter
+            if max(sum((letters1 - letters2).values()), sum((letters2 - letters1).values())) > max_distance:
+                return False
+        self.comparisons += 1
+        # Bounded one above the cutoff, so the threshold test below stays exact
+        distance = levenshtein_distance(title1, title2, int(max_distance) + 1)
+        return 1.0 - distance / max_length >= self.threshold
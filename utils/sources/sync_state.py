@@ -0,0 +1,53 @@
+"""
+High-water-mark state for incremental YouTube playlist syncing.
+
+A sync state remembers the newest items already seen for a playlist (or a
+channel's uploads playlist) together with their parsed artist/title/remix,
+so later fetches can stop paging as soon as they reach known items and merge
+the new items on top of the stored window.
+"""
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class SyncState:
+    """Stored window of parsed playlist items, newest first."""
+    playlist_id: str
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    # Oldest publish date the window is guaranteed to cover, or None when the
+    # window spans the whole scan range (end of playlist or page limit)
+    covered_since: Optional[datetime] = None
+    # False when the walk that built the window stopped early at the track limit
+    complete: bool = False
+    last_full_sync_at: Optional[datetime] = None
+
+    @property
+    def latest_video_id(self) -> Optional[str]:
+        return self.items[0]['video_id'] if self.items else None
+
+    @property
+    def latest_published_at(self) -> Optional[str]:
+        return self.items[0].get('published_at') if self.items else None
+
+    def covers(self, date_threshold: datetime) -> bool:
+        """Whether the stored window reaches back far enough for date_threshold."""
+        return self.covered_since is None or self.covered_since <= date_threshold
+
+
+class InMemorySyncStateStore:
+    """Process-local sync state store (used by the CLI and as the default)."""
+
+    def __init__(self):
+        self._states: Dict[str, SyncState] = {}
+        self._lock = threading.Lock()
+
+    def get(self, playlist_id: str) -> Optional[SyncState]:
+        with self._lock:
+            return self._states.get(playlist_id)
+
+    def save(self, state: SyncState) -> None:
+        with self._lock:
+            self._states[state.playlist_id] = state
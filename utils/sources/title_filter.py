@@ -0,0 +1,117 @@
+"""
+Keyword filter for video titles that are not single tracks (mixes, sets, vlogs...).
+
+A title is filtered when it contains any block keyword and none of the
+allowed terms (e.g. "classics" is blocked but "Classics (Extended Mix)" is
+kept). Each list is compiled into one regex built from a trie of its keywords,
+so shared prefixes such as "mix"/"mixed by" are only tried once, and a title is
+lowercased once and scanned once per list instead of once per keyword.
+Matching is plain case-insensitive substring matching, the same as
+``keyword.lower() in title.lower()``.
+"""
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Iterable, List, Optional, Pattern, Sequence, Tuple
+
+# Longer user keywords are dropped (they would also deepen the trie needlessly)
+MAX_KEYWORD_LENGTH = 100
+
+# Joins titles for batch scans; keywords never contain it, so no match spans two titles
+_SEPARATOR = "\x00"
+
+
+def _trie_regex(node: dict) -> str:
+    """Render a character trie as a regex; shared prefixes are only tried once."""
+    if "" in node:
+        # A shorter term ends here, so longer ones add nothing to "does any term occur"
+        return ""
+    branches = [re.escape(char) + _trie_regex(child) for char, child in sorted(node.items())]
+    return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+
+def _compile(terms: Iterable[str]) -> Optional[Pattern]:
+    """Compile terms into one lowercase pattern matching any of them, or None if there are none."""
+    trie: dict = {}
+    for term in terms:
+        term = term.strip().lower() if term else ""
+        if not term:
+            continue
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = True
+    if not trie:
+        return None
+    return re.compile(_trie_regex(trie))
+
+
+def parse_keywords(text: Optional[str]) -> Tuple[str, ...]:
+    """Split a comma- or newline-separated keyword list as entered by a user."""
+    if not text:
+        return ()
+    keywords = (part.strip().lower() for part in re.split(r"[,\n]", text))
+    return tuple(sorted({keyword for keyword in keywords if 0 < len(keyword) <= MAX_KEYWORD_LENGTH}))
+
+
+class TitleFilter:
+    """Compiled block/allow keyword filter for video titles."""
+
+    def __init__(self, block_terms: Sequence[str], allow_terms: Sequence[str] = ()):
+        self.block_terms = tuple(block_terms)
+        self.allow_terms = tuple(allow_terms)
+        self._block = _compile(self.block_terms)
+        self._allow = _compile(self.allow_terms)
+
+    def is_filtered(self, title: str) -> bool:
+        """Whether a title should be skipped."""
+        if self._block is None:
+            return False
+        lowered = title.lower()
+        if not self._block.search(lowered):
+            return False
+        return self._allow is None or not self._allow.search(lowered)
+
+    def classify(self, titles: Sequence[str]) -> List[bool]:
+        """
+        Classify a batch of titles, e.g. a whole playlistItems page, in one scan.
+
+        Args:
+            titles: Video titles
+
+        Returns:
+            One flag per title, True if the title should be skipped
+        """
+        if self._block is None or not titles:
+            return [False] * len(titles)
+
+        lowered = [title.lower() for title in titles]
+        text = _SEPARATOR.join(lowered)
+        if text.count(_SEPARATOR) != len(titles) - 1:
+            # A title contains the separator itself; fall back to one scan per title
+            return [self.is_filtered(title) for title in titles]
+
+        # Start offset of every title in the joined text
+        starts = list(accumulate((len(title) + 1 for title in lowered[:-1]), initial=0))
+        blocked = {bisect_right(starts, match.start()) - 1 for match in self._block.finditer(text)}
+
+        flags = [False] * len(titles)
+        for index in blocked:
+            # Only titles with a block keyword need the allowed-terms check
+            flags[index] = self._allow is None or not self._allow.search(lowered[index])
+        return flags
+
+    def extended(self, block_terms: Iterable[str] = (), allow_terms: Iterable[str] = ()) -> "TitleFilter":
+        """Return a filter with additional block and/or allowed terms, reusing compiled filters."""
+        block_terms, allow_terms = tuple(block_terms), tuple(allow_terms)
+        if not block_terms and not allow_terms:
+            return self
+        return _extended_filter(self, tuple(sorted(set(block_terms))), tuple(sorted(set(allow_terms))))
+
+
+@lru_cache(maxsize=256)
+def _extended_filter(base: TitleFilter, block_terms: Tuple[str, ...],
+                     allow_terms: Tuple[str, ...]) -> TitleFilter:
+    # Users tend to keep the same keywords, so each combination is compiled once
+    return TitleFilter(base.block_terms + block_terms, base.allow_terms + allow_terms)
@@ -0,0 +1,157 @@
+"""
+Artist / title / remix parsing for track titles from YouTube and Beatport.
+
+Patterns are compiled once at import, and parsed results are memoized in a
+bounded LRU keyed by the raw title: the same uploads come back on every task,
+so most titles are parsed once per process. Results are immutable tuples and
+safe to share between tasks.
+"""
+import os
+import re
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Parsed titles kept in memory (a few hundred bytes each)
+TITLE_CACHE_SIZE = int(os.environ.get("TITLE_PARSE_CACHE_SIZE", 20000))
+
+ParsedTitle = Tuple[str, str, Optional[str]]
+
+# Common patterns in electronic music YouTube titles, tried in order
+YOUTUBE_TITLE_PATTERNS = [
+    # Artist - Title (Remix) pattern
+    re.compile(r"^([^-]+)\s*-\s*([^(\[]+)(?:\(([^)]+)\))?"),
+    # Artist "Title" pattern
+    re.compile(r'^([^"]+)\s*"([^"]+)"(?:\s*\(([^)]+)\))?'),
+    # Artist 'Title' pattern
+    re.compile(r"^([^']+)\s*'([^']+)'(?:\s*\(([^)]+)\))?"),
+    # Artist | Title pattern
+    re.compile(r"^([^|]+)\s*\|\s*([^(\[]+)(?:\s*\(([^)]+)\))?"),
+    # Title by Artist pattern
+    re.compile(r"^([^(byB)]+)\s+(?:by|BY)\s+([^(\[]+)(?:\s*\(([^)]+)\))?"),
+]
+
+# Delimiters tried when no pattern matches
+YOUTUBE_DELIMITERS = [" - ", " | ", ": ", " _ "]
+
+# Remix/edit info in parentheses, and the same with its leading whitespace for removal
+YOUTUBE_REMIX = re.compile(r'\(([^)]*(?:remix|mix|edit|version)[^)]*)\)', re.IGNORECASE)
+YOUTUBE_REMIX_STRIP = re.compile(r'\s*\([^)]*(?:remix|mix|edit|version)[^)]*\)')
+
+BEATPORT_REMIX = re.compile(r'\(([^)]*(?:mix|remix|edit|dub|version)[^)]*)\)', re.IGNORECASE)
+
+
+def _split_remix(track_title: str) -> Tuple[str, Optional[str]]:
+    """Move "(... Remix)" style info out of a YouTube track title."""
+    remix_match = YOUTUBE_REMIX.search(track_title)
+    if not remix_match:
+        return track_title, None
+    # Remove the remix info from the title
+    return YOUTUBE_REMIX_STRIP.sub('', track_title), remix_match.group(1)
+
+
+def _parse_youtube_title(title: str) -> ParsedTitle:
+    # Clean up the title
+    title = title.strip()
+
+    for pattern in YOUTUBE_TITLE_PATTERNS:
+        match = pattern.search(title)
+        if match:
+            groups = match.groups()
+            artist = groups[0].strip()
+            track_title = groups[1].strip()
+            remix = groups[2].strip() if groups[2] else None
+
+            # Check if remix info is already in title and not in the remix field
+            if not remix:
+                track_title, remix = _split_remix(track_title)
+
+            return artist, track_title, remix
+
+    # If no pattern matches, use a default split on first delimiter found
+    for delimiter in YOUTUBE_DELIMITERS:
+        if delimiter in title:
+            artist, track_title = title.split(delimiter, 1)
+            track_title, remix = _split_remix(track_title.strip())
+            return artist.strip(), track_title, remix
+
+    # If all else fails, treat the whole title as the track title
+    return "Unknown Artist", title, None
+
+
+def _parse_beatport_title(full_title: str) -> ParsedTitle:
+    # Default values
+    artist = "Unknown Artist"
+    title = full_title
+    remix = None
+
+    try:
+        # Split artist and title
+        if " - " in full_title:
+            artist, title_part = full_title.split(" - ", 1)
+        else:
+            title_part = full_title
+
+        # Extract remix if available
+        remix_match = BEATPORT_REMIX.search(title_part)
+        if remix_match:
+            remix = remix_match.group(1)
+            title = title_part[:remix_match.start()].strip()
+        else:
+            title = title_part
+
+    except Exception as e:
+        logger.error(f"Error parsing title '{full_title}': {e}")
+
+    return artist, title, remix
+
+
+_PARSERS = {
+    "youtube": _parse_youtube_title,
+    "beatport": _parse_beatport_title,
+}
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def _parse_cached(style: str, title: str) -> ParsedTitle:
+    # One memo for all parsers so the cache size bounds their total memory
+    return _PARSERS[style](title)
+
+
+def parse_youtube_title(title: str) -> ParsedTitle:
+    """
+    Parse a YouTube video title to extract artist and track information.
+
+    Returns:
+        Tuple of (artist, track_title, remix)
+    """
+    return _parse_cached("youtube", title)
+
+
+def parse_beatport_title(full_title: str) -> ParsedTitle:
+    """
+    Parse a Beatport title, usually formatted as "Artist - Title (Remix)".
+
+    Returns:
+        Tuple of (artist, title, remix)
+    """
+    return _parse_cached("beatport", full_title)
+
+
+def get_title_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters of the parsed title memo."""
+    info = _parse_cached.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        'size': info.currsize,
+        'max_size': info.maxsize,
+        'hits': info.hits,
+        'misses': info.misses,
+        'hit_rate': round(info.hits / lookups, 4) if lookups else 0.0,
+    }
+
+
+def clear_title_cache() -> None:
+    _parse_cached.cache_clear()
@@ -22,6 +22,19 @@ logger = logging.getLogger(__name__)
 class TraxsourceSource(MusicSource):
     """Scrapes tracks from Traxsource's charts."""
     
+    # Browser-like headers sent with every request
+    REQUEST_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+                     "AppleWebKit/537.36 (KHTML, like Gecko) "
+                     "Chrome/91.0.4472.114 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.5",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1",
+        "Cache-Control": "max-age=0"
+    }
+    
     BASE_URL = "https://www.traxsource.com"
     CHART_URL = f"{BASE_URL}/top100"
     
@@ -81,23 +94,10 @@ class TraxsourceSource(MusicSource):
         
         logger.info(f"Fetching tracks from Traxsource with genre={genre}, days_back={days_to_look_back}")
         
-        # Initialize HTTP session with headers to mimic a browser
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                         "AppleWebKit/537.36 (KHTML, like Gecko) "
-                         "Chrome/91.0.4472.114 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Cache-Control": "max-age=0"
-        }
-        
         tracks = []
         
         try:
-            async with aiohttp.ClientSession(headers=headers) as session:
+            async with self.http.session() as session:
                 # Process multiple pages until we have enough tracks or no more pages
                 page = 1
                 max_pages = 5  # Safety limit to prevent infinite loops
@@ -108,7 +108,7 @@ class TraxsourceSource(MusicSource):
                     logger.info(f"Fetching Traxsource page {page}: {url}")
                     
                     # Get the chart page
-                    async with session.get(url) as response:
+                    async with session.get(url, headers=self.REQUEST_HEADERS) as response:
                         if response.status != 200:
                             logger.error(f"Failed to fetch chart page {page}: {response.status}")
                             break
@@ -203,7 +203,7 @@ class TraxsourceSource(MusicSource):
             release_date = None
             if track_url:
                 try:
-                    async with session.get(track_url) as response:
+                    async with session.get(track_url, headers=self.REQUEST_HEADERS) as response:
                         if response.status == 200:
                             track_html = await response.text()
                             track_soup = BeautifulSoup(track_html, "html.parser")
@@ -4,23 +4,85 @@ YouTube implementation of the MusicSource interface.
 This module fetches tracks from various YouTube channels and playlists.
 """
 import os
-import re
 import json
 import logging
 import asyncio
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple
 
-import aiohttp
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from utils.cache import TTLCache
 from utils.sources.base import MusicSource, Track
+from utils.sources.channel_index import (
+    ChannelResolution, InMemoryChannelResolutionStore, normalize_channel_ref
+)
+from utils.sources.sync_state import InMemorySyncStateStore, SyncState
+from utils.sources.title_filter import TitleFilter
+from utils.sources.title_parser import parse_youtube_title
+from utils.sources.youtube_feed import FEED_MAX_ENTRIES, FeedEntry, YouTubeFeedReader
+from utils.sources.youtube_scrape import YouTubeScraper
+from utils.youtube_client import get_youtube_client
+from utils.youtube_quota import QUOTA_MANAGER, QuotaExceededError
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Cross-task cache of playlistItems pages, keyed by (playlist ID, page token).
+# Many users pick the same curated playlists within the same hour, so a cached
+# page saves one quota unit and a network round trip per hit.
+PLAYLIST_PAGE_CACHE = TTLCache(
+    max_size=int(os.environ.get("YOUTUBE_PAGE_CACHE_SIZE", 512)),
+    ttl=float(os.environ.get("YOUTUBE_PAGE_CACHE_TTL", 1800))
+)
+
+# Quota cost of a single playlistItems().list call
+PLAYLIST_PAGE_QUOTA_COST = 1
+
+
+# Conditional GETs of channel/playlist Atom feeds, shared by all YouTubeSource instances
+FEED_READER = YouTubeFeedReader()
+
+
+def get_page_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters and quota units saved by the playlist page cache."""
+    stats = PLAYLIST_PAGE_CACHE.stats()
+    # Every hit is a playlistItems().list call that was not made
+    stats['quota_units_saved'] = stats['hits'] * PLAYLIST_PAGE_QUOTA_COST
+    stats['feeds'] = FEED_READER.stats()
+    return stats
+
+
+# Video durations never change, so they are kept for a week (ISO 8601 strings keyed by video ID)
+VIDEO_DURATION_CACHE = TTLCache(
+    max_size=int(os.environ.get("YOUTUBE_DURATION_CACHE_SIZE", 20000)),
+    ttl=7 * 24 * 3600
+)
+
+# videos().list accepts up to 50 IDs per call, for 1 quota unit
+VIDEOS_PER_LOOKUP = 50
+
+
+# Process-local fallbacks for sync state and channel resolutions (the web app injects DB-backed stores)
+DEFAULT_SYNC_STORE = InMemorySyncStateStore()
+DEFAULT_RESOLUTION_STORE = InMemoryChannelResolutionStore()
+
+
+@dataclass
+class PlaylistWalk:
+    """Result of walking a playlist's pages from the top."""
+    entries: List[Dict[str, Any]] = field(default_factory=list)
+    pages_scanned: int = 0
+    # Video ID of the first already-known item reached, if any
+    first_known_id: Optional[str] = None
+    # True when the walk covered the whole scan range rather than stopping at the limit
+    complete: bool = False
+    # Oldest publish date the walk is guaranteed to cover (None: whole scan range)
+    covered_since: Optional[datetime] = None
+
+
 class YouTubeSource(MusicSource):
     """Fetches tracks from YouTube channels and playlists."""
     
@@ -73,6 +135,45 @@ class YouTubeSource(MusicSource):
         "extended mix", "club mix", "radio edit", "original mix", "remix"
     ]
     
+    # Both lists compiled once; instances extend it with per-user keywords
+    TITLE_FILTER = TitleFilter(FILTER_KEYWORDS, ALLOWED_TERMS)
+    
+    # Atom feeds cost no quota but list only the latest 15 videos; they are tried
+    # first for lookbacks up to this many days
+    FEED_MAX_DAYS = int(os.environ.get("YOUTUBE_FEED_MAX_DAYS", 7))
+    
+    # Scraping fallback: concurrent connections to youtube.com and pages followed per source
+    SCRAPE_PER_HOST_LIMIT = int(os.environ.get("YOUTUBE_SCRAPE_PER_HOST_LIMIT", 4))
+    SCRAPE_MAX_PAGES = int(os.environ.get("YOUTUBE_SCRAPE_MAX_PAGES", 10))
+    
+    # Incremental sync: re-walk from scratch after this many hours, and cap the
+    # stored window for unbounded (channel uploads) walks
+    SYNC_FULL_REFRESH_HOURS = int(os.environ.get("YOUTUBE_SYNC_FULL_REFRESH_HOURS", 24))
+    SYNC_WINDOW_MAX_ITEMS = 1000
+    
+    # Default page limits (50 videos per page); sources may override with "max_pages"
+    PLAYLIST_MAX_PAGES = 4
+    CHANNEL_MAX_PAGES = int(os.environ.get("YOUTUBE_CHANNEL_MAX_PAGES", 20))
+    
+    # Chronological scan: stop after this many consecutive pages entirely older than
+    # the date threshold (raise it to tolerate out-of-order uploads)
+    CHRONOLOGICAL_STALE_PAGES = int(os.environ.get("YOUTUBE_CHRONOLOGICAL_STALE_PAGES", 1))
+    
+    def __init__(self, sync_store=None, resolution_store=None, filter_keywords=None):
+        """
+        Args:
+            sync_store: Optional store for incremental sync state (get/save of
+                        SyncState); defaults to a process-local in-memory store
+            resolution_store: Optional store for channel resolutions (get/save of
+                              ChannelResolution); defaults to a process-local in-memory store
+            filter_keywords: Optional extra keywords (e.g. a user's own) whose titles are skipped
+                             in addition to FILTER_KEYWORDS
+        """
+        self.sync_store = sync_store if sync_store is not None else DEFAULT_SYNC_STORE
+        self.resolution_store = (resolution_store if resolution_store is not None
+                                 else DEFAULT_RESOLUTION_STORE)
+        self.title_filter = self.TITLE_FILTER.extended(block_terms=filter_keywords or ())
+    
     @property
     def name(self) -> str:
         return "YouTube"
@@ -118,8 +219,8 @@ class YouTubeSource(MusicSource):
             logger.warning("No YouTube API key found, results will be limited")
             return await self._scrape_youtube_tracks(sources, limit, date_threshold)
         
-        # Initialize YouTube API client
-        youtube = build("youtube", "v3", developerKey=api_key)
+        # Shared client, built once per process
+        youtube = get_youtube_client(api_key)
         
         all_tracks = []
         per_source_limit = max(limit // len(sources), 10)  # Ensure at least 10 per source
@@ -127,17 +228,15 @@ class YouTubeSource(MusicSource):
         # Process each source (playlist or channel)
         for source in sources:
             source_tracks = []
-            source_type = source["type"]
             source_id = source["id"]
             source_name = source["name"]
             
             try:
-                if source_type == "playlist":
-                    # Fetch videos from playlist
-                    source_tracks = await self._get_playlist_tracks(youtube, source_id, source_name, date_threshold, per_source_limit)
-                elif source_type == "channel":
-                    # Fetch videos from channel
-                    source_tracks = await self._get_channel_tracks(youtube, source_id, source_name, date_threshold, per_source_limit)
+                source_tracks = await self._fetch_source_tracks(youtube, source, date_threshold,
+                                                                per_source_limit, days_to_look_back)
+            except QuotaExceededError as e:
+                logger.warning(f"Skipping {source_name} (ID: {source_id}): {e}")
+                continue
             except HttpError as e:
                 error_details = e.error_details[0] if hasattr(e, 'error_details') and e.error_details else {}
                 error_reason = error_details.get('reason', 'unknown')
@@ -163,7 +262,9 @@ class YouTubeSource(MusicSource):
         else:
             logger.warning(f"No tracks found from any of the {len(sources)} sources")
         
-        return all_tracks[:limit]
+        tracks = all_tracks[:limit]
+        await self._enrich_durations(youtube, tracks)
+        return tracks
     
     async def get_tracks_from_sources(self, sources: List[Dict], days_to_look_back: int = 14, limit: int = 100, progress_callback=None) -> List[Track]:
         """
@@ -187,8 +288,8 @@ class YouTubeSource(MusicSource):
             logger.warning("No YouTube API key found, results will be limited")
             return await self._scrape_youtube_tracks(sources, limit, date_threshold)
         
-        # Initialize YouTube API client
-        youtube = build("youtube", "v3", developerKey=api_key)
+        # Shared client, built once per process
+        youtube = get_youtube_client(api_key)
         
         all_tracks = []
         per_source_limit = max(limit // len(sources), 10) if sources else limit
@@ -196,17 +297,15 @@ class YouTubeSource(MusicSource):
         # Process each source (playlist or channel)
         for source in sources:
             source_tracks = []
-            source_type = source["type"]
             source_id = source["id"]
             source_name = source["name"]
             
             try:
-                if source_type == "playlist":
-                    # Fetch videos from playlist
-                    source_tracks = await self._get_playlist_tracks(youtube, source_id, source_name, date_threshold, per_source_limit)
-                elif source_type == "channel":
-                    # Fetch videos from channel
-                    source_tracks = await self._get_channel_tracks(youtube, source_id, source_name, date_threshold, per_source_limit)
+                source_tracks = await self._fetch_source_tracks(youtube, source, date_threshold,
+                                                                per_source_limit, days_to_look_back)
+            except QuotaExceededError as e:
+                logger.warning(f"Skipping {source_name} (ID: {source_id}): {e}")
+                continue
             except HttpError as e:
                 error_details = e.error_details[0] if hasattr(e, 'error_details') and e.error_details else {}
                 error_reason = error_details.get('reason', 'unknown')
@@ -234,115 +333,281 @@ class YouTubeSource(MusicSource):
         
         return all_tracks[:limit]
     
-    async def _get_playlist_tracks(self, youtube, playlist_id: str, playlist_name: str, 
-                                   date_threshold: datetime, limit: int) -> List[Track]:
-        """Fetch tracks from a YouTube playlist."""
-        tracks = []
-        next_page_token = None
-        pages_scanned = 0
-        max_pages_to_scan = 4  # Scan up to 200 videos (50 per page)
-        
-        loop = asyncio.get_event_loop()
-        
-        while pages_scanned < max_pages_to_scan:
-            # Get playlist items
-            playlist_request = youtube.playlistItems().list(
-                part="snippet,contentDetails",
-                playlistId=playlist_id,
-                maxResults=50,
-                pageToken=next_page_token
-            )
-            
-            # Execute request in the thread pool
-            playlist_response = await loop.run_in_executor(None, playlist_request.execute)
-            pages_scanned += 1
+    async def _fetch_source_tracks(self, youtube, source: Dict[str, Any], date_threshold: datetime,
+                                   limit: int, days_to_look_back: int) -> List[Track]:
+        """
+        Fetch one source's tracks, from its Atom feed when that covers the lookback.
+        
+        The feed costs no quota but lists only 15 videos, so it is tried for
+        lookbacks up to FEED_MAX_DAYS and the Data API is used when the feed
+        does not reach back to date_threshold. Only channels use the feed: a
+        playlist feed's dates are upload dates, while playlists are filtered
+        on when a video was added to them.
+        """
+        source_type = source["type"]
+        source_id = source["id"]
+        source_name = source["name"]
+        
+        if days_to_look_back <= self.FEED_MAX_DAYS:
+            feed_tracks = await self._get_feed_tracks(source_type, source_id, source_name, date_threshold, limit)
+            if feed_tracks is not None:
+                return feed_tracks
+        
+        if source_type == "playlist":
+            # Fetch videos from playlist
+            return await self._get_playlist_tracks(youtube, source_id, source_name, date_threshold, limit,
+                                                   max_pages=source.get("max_pages"),
+                                                   chronological=source.get("chronological", False))
+        elif source_type == "channel":
+            # Fetch videos from channel
+            return await self._get_channel_tracks(youtube, source_id, source_name, date_threshold, limit,
+                                                  max_pages=source.get("max_pages"))
+        return []
+    
+    async def _get_feed_tracks(self, source_type: str, source_id: str, source_name: str,
+                               date_threshold: datetime, limit: int) -> Optional[List[Track]]:
+        """
+        Build tracks from a channel's uploads feed.
+        
+        Returns:
+            Tracks, or None if the source is not a channel, or its feed is
+            unavailable or does not cover date_threshold
+        """
+        if source_type != "channel":
+            return None
+        # Feeds need the UC... ID; handles are only used once they are in the resolution index
+        feed_id = self._feed_channel_id(source_id)
+        if not feed_id:
+            return None
+        
+        entries = await FEED_READER.fetch(source_type, feed_id, session=await self.http.get_session())
+        if entries is None:
+            return None
+        
+        if not self._feed_covers(entries, date_threshold):
+            logger.info(f"Feed for {source_name} does not reach back to {date_threshold}, using the Data API")
+            return None
+        
+        parsed = []
+        for feed_entry in entries:
+            artist, track_title, remix = self._parse_title(feed_entry.title)
+            parsed.append({
+                'video_id': feed_entry.video_id,
+                'title': feed_entry.title,
+                'published_at': feed_entry.published.strftime("%Y-%m-%dT%H:%M:%SZ") if feed_entry.published else "",
+                'artist': artist,
+                'track_title': track_title,
+                'remix': remix
+            })
+        
+        tracks = self._entries_to_tracks(parsed, source_name, date_threshold, limit)
+        logger.info(f"Feed for {source_name}: {len(entries)} entries, {len(tracks)} tracks (no quota used)")
+        return tracks
+    
+    @staticmethod
+    def _feed_covers(entries: List[FeedEntry], date_threshold: datetime) -> bool:
+        """
+        Whether a channel feed lists every upload since date_threshold.
+        
+        A feed with fewer than 15 entries lists the whole channel. Otherwise
+        its entries must be newest first and the last one must be older
+        than date_threshold.
+        """
+        if len(entries) < FEED_MAX_ENTRIES:
+            return True
+        dates = [entry.published for entry in entries]
+        if any(published is None for published in dates):
+            return False
+        if any(newer < older for newer, older in zip(dates, dates[1:])):
+            return False
+        return dates[-1] < date_threshold
+    
+    def _feed_channel_id(self, channel_ref: str) -> Optional[str]:
+        """Return the UC... channel ID for a channel reference without calling the API."""
+        if channel_ref.startswith("UC") and len(channel_ref) == 24:
+            return channel_ref
+        resolution = self._load_resolution(normalize_channel_ref(channel_ref))
+        return resolution.channel_id if resolution else None
+    
+    async def _fetch_playlist_page(self, youtube, playlist_id: str,
+                                   page_token: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch one page of playlistItems, consulting the shared page cache first.
+        
+        Args:
+            youtube: YouTube API client
+            playlist_id: ID of the playlist (or channel uploads playlist)
+            page_token: Page token returned by the previous page, if any
             
-            items = playlist_response.get("items", [])
-            logger.info(f"Playlist {playlist_name}: Page {pages_scanned}, found {len(items)} items")
+        Returns:
+            The raw playlistItems().list response
+        """
+        cache_key = (playlist_id, page_token or "")
+        cached_response = PLAYLIST_PAGE_CACHE.get(cache_key)
+        if cached_response is not None:
+            logger.debug(f"Page cache hit for playlist {playlist_id} (token: {page_token})")
+            return cached_response
+        
+        playlist_request = youtube.playlistItems().list(
+            part="snippet,contentDetails",
+            playlistId=playlist_id,
+            maxResults=50,
+            pageToken=page_token
+        )
+        
+        # Execute request in the thread pool (charged against the daily quota)
+        playlist_response = await QUOTA_MANAGER.execute(playlist_request, "playlistItems.list")
+        
+        PLAYLIST_PAGE_CACHE.set(cache_key, playlist_response)
+        return playlist_response
+    
+    async def _get_playlist_tracks(self, youtube, playlist_id: str, playlist_name: str, 
+                                   date_threshold: datetime, limit: int,
+                                   max_pages: Optional[int] = None,
+                                   chronological: bool = False) -> List[Track]:
+        """
+        Fetch tracks from a YouTube playlist.
+        
+        Curated playlists are not necessarily newest-first, so the chronological
+        early stop is opt-in per source.
+        """
+        max_pages_to_scan = max_pages or self.PLAYLIST_MAX_PAGES
+        
+        return await self._sync_playlist_tracks(
+            youtube, playlist_id, playlist_name, date_threshold, limit, max_pages_to_scan,
+            chronological=chronological
+        )
+    
+    async def _get_channel_tracks(self, youtube, channel_id: str, channel_name: str,
+                                 date_threshold: datetime, limit: int,
+                                 max_pages: Optional[int] = None) -> List[Track]:
+        """
+        Fetch tracks from a YouTube channel.
+        
+        The uploads playlist is reverse-chronological, so the walk stops once it
+        reaches pages that are entirely older than date_threshold.
+        """
+        resolution = await self._resolve_channel(youtube, channel_id)
+        if resolution is None:
+            logger.warning(f"Channel {channel_name} not found")
+            return []
+        
+        # Handles resolve to the channel's display name
+        if channel_id.startswith('@') and resolution.channel_title:
+            channel_name = resolution.channel_title
+        
+        uploads_playlist_id = resolution.uploads_playlist_id
+        
+        # Now get videos from the uploads playlist
+        return await self._sync_playlist_tracks(
+            youtube, uploads_playlist_id, channel_name, date_threshold, limit,
+            max_pages or self.CHANNEL_MAX_PAGES, chronological=True
+        )
+    
+    async def enrich_durations(self, tracks: List[Track]) -> int:
+        """
+        Attach video durations (ISO 8601, e.g. "PT3M30S") to tracks that don't have one.
+        
+        Returns:
+            Number of videos().list calls made (1 quota unit per 50 videos)
+        """
+        api_key = os.environ.get("YOUTUBE_API_KEY")
+        if not api_key:
+            return 0
+        return await self._enrich_durations(get_youtube_client(api_key), tracks)
+    
+    async def _enrich_durations(self, youtube, tracks: List[Track]) -> int:
+        """Look up durations in batches of VIDEOS_PER_LOOKUP, skipping cached videos."""
+        tracks_by_video: Dict[str, List[Track]] = {}
+        for track in tracks:
+            video_id = self._video_id(track.source_url)
+            if video_id and not track.duration:
+                tracks_by_video.setdefault(video_id, []).append(track)
+        
+        missing = []
+        for video_id, video_tracks in tracks_by_video.items():
+            duration = VIDEO_DURATION_CACHE.get(video_id)
+            if duration is None:
+                missing.append(video_id)
+                continue
+            for track in video_tracks:
+                track.duration = duration
+        
+        calls = 0
+        for start in range(0, len(missing), VIDEOS_PER_LOOKUP):
+            batch = missing[start:start + VIDEOS_PER_LOOKUP]
+            try:
+                response = await QUOTA_MANAGER.execute(
+                    youtube.videos().list(part="contentDetails", id=",".join(batch), maxResults=VIDEOS_PER_LOOKUP),
+                    "videos.list"
+                )
+            except QuotaExceededError as e:
+                logger.warning(f"Skipping duration lookup for {len(missing) - start} videos: {e}")
+                break
+            except HttpError as e:
+                logger.error(f"YouTube API error looking up durations: {e}")
+                continue
+            calls += 1
             
-            # Process videos
-            for item in items:
-                snippet = item.get("snippet", {})
-                video_id = item.get("contentDetails", {}).get("videoId")
-                
-                # Skip if no video ID
-                if not video_id:
-                    continue
-                
-                # Get video details
-                title = snippet.get("title", "")
-                channel_title = snippet.get("channelTitle", "")
-                published_at = snippet.get("publishedAt", "")
-                
-                # Skip private videos
-                if title == "Private video" or not title:
-                    continue
-                
-                # Skip if video is too old
-                if published_at:
-                    publish_date = datetime.strptime(published_at, "%Y-%m-%dT%H:%M:%SZ")
-                    if publish_date < date_threshold:
-                        continue
-                    else:
-                        days_old = (datetime.utcnow() - publish_date).days
-                        logger.info(f"[{playlist_name}] Video '{title}' is {days_old} days old, within date range")
-                
-                # Skip if it matches any filter keywords (but allow specific terms)
-                should_filter = False
-                for keyword in self.FILTER_KEYWORDS:
-                    if keyword.lower() in title.lower():
-                        # Check if it contains an allowed term
-                        has_allowed_term = False
-                        for allowed in self.ALLOWED_TERMS:
-                            if allowed.lower() in title.lower():
-                                has_allowed_term = True
-                                break
-                        
-                        if not has_allowed_term:
-                            should_filter = True
-                            break
-                
-                if should_filter:
+            for item in response.get("items", []):
+                duration = item.get("contentDetails", {}).get("duration")
+                if not duration:
                     continue
-                
-                # Extract artist and track title
-                artist, track_title, remix = self._parse_title(title)
-                
-                # Create Track object
-                track = Track(
-                    title=track_title,
-                    artist=artist,
-                    remix=remix,
-                    release_date=publish_date.date() if publish_date else None,
-                    source=playlist_name,
-                    source_url=f"https://www.youtube.com/watch?v={video_id}"
-                )
-                
-                tracks.append(track)
-                
-                # Respect the limit
-                if len(tracks) >= limit:
-                    return tracks
+                VIDEO_DURATION_CACHE.set(item["id"], duration)
+                for track in tracks_by_video.get(item["id"], []):
+                    track.duration = duration
+        
+        logger.info(f"Durations: {len(tracks_by_video) - len(missing)} cached, "
+                    f"{len(missing)} looked up in {calls} videos().list calls")
+        return calls
+    
+    @staticmethod
+    def _video_id(source_url: str) -> Optional[str]:
+        """Extract the video ID from a track's watch URL."""
+        if not source_url or "v=" not in source_url:
+            return None
+        return source_url.split("v=")[-1].split("&")[0] or None
+    
+    async def resolve_channel(self, channel_ref: str) -> Optional[ChannelResolution]:
+        """
+        Resolve a channel reference to its uploads playlist and store the result.
+        
+        Used when a channel source is added so the first playlist generation
+        does not pay for the lookup.
+        
+        Args:
+            channel_ref: "@handle" or channel ID
             
-            # Check if there are more pages
-            next_page_token = playlist_response.get("nextPageToken")
-            if not next_page_token:
-                break
+        Returns:
+            ChannelResolution, or None if the channel was not found or no API key is set
+        """
+        api_key = os.environ.get("YOUTUBE_API_KEY")
+        if not api_key:
+            logger.warning("YOUTUBE_API_KEY not set, cannot resolve channel")
+            return None
         
-        logger.info(f"Playlist {playlist_name}: Scanned {pages_scanned} pages, found {len(tracks)} tracks within date range")
-        return tracks
+        youtube = get_youtube_client(api_key)
+        return await self._resolve_channel(youtube, channel_ref)
     
-    async def _get_channel_tracks(self, youtube, channel_id: str, channel_name: str,
-                                 date_threshold: datetime, limit: int) -> List[Track]:
-        """Fetch tracks from a YouTube channel."""
-        tracks = []
-        next_page_token = None
+    async def _resolve_channel(self, youtube, channel_ref: str) -> Optional[ChannelResolution]:
+        """
+        Resolve "@handle" or channel ID to the channel's uploads playlist.
         
-        loop = asyncio.get_event_loop()
+        Checks the resolution index first; on a miss, handles cost a 100-unit
+        search().list call and every channel a channels().list call.
+        """
+        lookup_key = normalize_channel_ref(channel_ref)
+        resolution = self._load_resolution(lookup_key)
+        if resolution is not None:
+            logger.info(f"Using stored resolution for {channel_ref}: {resolution.uploads_playlist_id}")
+            return resolution
+        
+        channel_id = lookup_key
+        channel_title = ""
         
         # Handle @username format by resolving to channel ID first
-        if channel_id.startswith('@'):
-            username = channel_id[1:]  # Remove @ symbol
+        if lookup_key.startswith('@'):
+            username = channel_ref.strip()[1:]  # Remove @ symbol
             logger.info(f"Resolving @{username} to channel ID...")
             try:
                 # Search for the channel by username
@@ -352,197 +617,380 @@ class YouTubeSource(MusicSource):
                     type="channel",
                     maxResults=5
                 )
-                search_response = await loop.run_in_executor(None, search_request.execute)
+                search_response = await QUOTA_MANAGER.execute(search_request, "search.list")
                 
                 # Find the best matching channel
                 channel_id_found = None
                 for item in search_response.get("items", []):
                     # First result is usually the best match
                     channel_id_found = item["snippet"]["channelId"]
-                    channel_name = item["snippet"]["channelTitle"]
-                    logger.info(f"Found channel: {channel_name} with ID: {channel_id_found}")
+                    channel_title = item["snippet"]["channelTitle"]
+                    logger.info(f"Found channel: {channel_title} with ID: {channel_id_found}")
                     break
                 
                 if not channel_id_found:
                     logger.warning(f"Channel @{username} not found in search")
-                    return []
+                    return None
                 
                 channel_id = channel_id_found
                 logger.info(f"Resolved @{username} to channel ID: {channel_id}")
+            except QuotaExceededError:
+                raise
             except Exception as e:
                 logger.error(f"Error resolving @{username}: {e}")
-                return []
+                return None
         
         # Now get the uploads playlist ID for the channel
         channel_request = youtube.channels().list(
-            part="contentDetails",
+            part="snippet,contentDetails",
             id=channel_id
         )
         
-        channel_response = await loop.run_in_executor(None, channel_request.execute)
+        channel_response = await QUOTA_MANAGER.execute(channel_request, "channels.list")
         
         if not channel_response.get("items"):
-            logger.warning(f"Channel {channel_name} not found")
-            return []
+            return None
+        
+        channel_item = channel_response["items"][0]
+        resolution = ChannelResolution(
+            lookup_key=lookup_key,
+            channel_id=channel_id,
+            uploads_playlist_id=channel_item["contentDetails"]["relatedPlaylists"]["uploads"],
+            channel_title=channel_title or channel_item.get("snippet", {}).get("title", ""),
+            resolved_at=datetime.utcnow()
+        )
+        self._save_resolution(resolution)
+        return resolution
+    
+    def _load_resolution(self, lookup_key: str) -> Optional[ChannelResolution]:
+        try:
+            return self.resolution_store.get(lookup_key)
+        except Exception as e:
+            logger.warning(f"Could not load channel resolution for {lookup_key}: {e}")
+            return None
+    
+    def _save_resolution(self, resolution: ChannelResolution) -> None:
+        try:
+            self.resolution_store.save(resolution)
+        except Exception as e:
+            logger.warning(f"Could not save channel resolution for {resolution.lookup_key}: {e}")
+    
+    async def _sync_playlist_tracks(self, youtube, playlist_id: str, source_name: str,
+                                    date_threshold: datetime, limit: int,
+                                    max_pages: Optional[int],
+                                    chronological: bool = False) -> List[Track]:
+        """
+        Fetch tracks from a playlist, reusing the stored window of known items.
         
-        uploads_playlist_id = channel_response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+        Pages are walked from the top and the walk stops as soon as it reaches
+        the newest item seen by a previous fetch. New items are merged on top of
+        the stored window, which is saved back as the new high-water mark.
+        Falls back to a full walk when there is no usable stored window, and to
+        the stored window alone when the daily quota budget is spent.
         
-        # Now get videos from the uploads playlist
-        while True:
-            playlist_request = youtube.playlistItems().list(
-                part="snippet,contentDetails",
-                playlistId=uploads_playlist_id,
-                maxResults=50,
-                pageToken=next_page_token
+        Args:
+            youtube: YouTube API client
+            playlist_id: ID of the playlist (or channel uploads playlist)
+            source_name: Display name used for the Track source field
+            date_threshold: Skip videos published before this date
+            limit: Maximum number of tracks to return
+            max_pages: Maximum number of pages to scan (None for no limit)
+            chronological: Whether the playlist is newest-first, enabling the
+                           early stop on pages older than date_threshold
+            
+        Returns:
+            List of Track objects
+        """
+        state = self._load_sync_state(playlist_id)
+        
+        try:
+            return await self._sync_playlist_window(youtube, playlist_id, source_name, date_threshold,
+                                                    limit, max_pages, state, chronological)
+        except QuotaExceededError as e:
+            if not state or not state.items:
+                raise
+            # Degrade to the stored window rather than failing the source
+            tracks = self._entries_to_tracks(state.items, source_name, date_threshold, limit)
+            logger.warning(f"Playlist {source_name}: {e}; using {len(tracks)} tracks from the stored window")
+            return tracks
+    
+    async def _sync_playlist_window(self, youtube, playlist_id: str, source_name: str,
+                                    date_threshold: datetime, limit: int, max_pages: Optional[int],
+                                    state: Optional[SyncState], chronological: bool) -> List[Track]:
+        """Incremental or full walk for _sync_playlist_tracks, given the stored state."""
+        if state and state.items and state.covers(date_threshold) and not self._needs_full_sync(state):
+            walk = await self._walk_playlist(
+                youtube, playlist_id, source_name, date_threshold, limit, max_pages,
+                known_ids={entry['video_id'] for entry in state.items},
+                chronological=chronological
             )
             
-            playlist_response = await loop.run_in_executor(None, playlist_request.execute)
+            if walk.first_known_id is None:
+                # Never reached a known item, so this was a full walk anyway
+                return self._finish_full_walk(playlist_id, source_name, date_threshold, limit, walk)
             
-            # Process videos
-            for item in playlist_response.get("items", []):
-                snippet = item.get("snippet", {})
-                video_id = item.get("contentDetails", {}).get("videoId")
-                
-                # Skip if no video ID
-                if not video_id:
-                    continue
-                
-                # Get video details
-                title = snippet.get("title", "")
-                published_at = snippet.get("publishedAt", "")
-                
-                # Skip private videos
-                if title == "Private video" or not title:
-                    continue
+            # Only trust the stored window if the first known item reached is
+            # still the previous top of the playlist (nothing reordered/removed)
+            if walk.first_known_id == state.latest_video_id:
+                items = self._merge_entries(walk.entries, state.items, max_pages)
+                tracks = self._entries_to_tracks(items, source_name, date_threshold, limit)
                 
-                # Skip if video is too old
-                if published_at:
-                    publish_date = datetime.strptime(published_at, "%Y-%m-%dT%H:%M:%SZ")
-                    if publish_date < date_threshold:
-                        continue
-                    else:
-                        days_old = (datetime.utcnow() - publish_date).days
-                        logger.info(f"[{channel_name}] Video '{title}' is {days_old} days old, within date range")
-                
-                # Skip if it matches any filter keywords
-                should_filter = False
-                for keyword in self.FILTER_KEYWORDS:
-                    if keyword.lower() in title.lower():
-                        # Check if it contains an allowed term
-                        has_allowed_term = False
-                        for allowed in self.ALLOWED_TERMS:
-                            if allowed.lower() in title.lower():
-                                has_allowed_term = True
-                                break
-                        
-                        if not has_allowed_term:
-                            should_filter = True
-                            break
-                
-                if should_filter:
+                # An incomplete window may be missing older tracks we now need
+                if state.complete or len(tracks) >= limit:
+                    self._save_sync_state(SyncState(
+                        playlist_id=playlist_id,
+                        items=items,
+                        covered_since=state.covered_since,
+                        complete=state.complete,
+                        last_full_sync_at=state.last_full_sync_at
+                    ))
+                    logger.info(f"Playlist {source_name}: Incremental sync scanned {walk.pages_scanned} pages, "
+                                f"{len(walk.entries)} new items, {len(tracks)} tracks within date range")
+                    return tracks
+            
+            logger.info(f"Playlist {source_name}: Stored window unusable, doing a full walk")
+        
+        walk = await self._walk_playlist(youtube, playlist_id, source_name, date_threshold, limit, max_pages,
+                                         chronological=chronological)
+        return self._finish_full_walk(playlist_id, source_name, date_threshold, limit, walk)
+    
+    def _finish_full_walk(self, playlist_id: str, source_name: str, date_threshold: datetime,
+                          limit: int, walk: "PlaylistWalk") -> List[Track]:
+        """Store the result of a full walk as the new window and build its tracks."""
+        self._save_sync_state(SyncState(
+            playlist_id=playlist_id,
+            items=walk.entries,
+            covered_since=walk.covered_since,
+            complete=walk.complete,
+            last_full_sync_at=datetime.utcnow()
+        ))
+        
+        tracks = self._entries_to_tracks(walk.entries, source_name, date_threshold, limit)
+        logger.info(f"Playlist {source_name}: Scanned {walk.pages_scanned} pages, found {len(tracks)} tracks within date range")
+        return tracks
+    
+    async def _walk_playlist(self, youtube, playlist_id: str, source_name: str,
+                             date_threshold: datetime, limit: int, max_pages: Optional[int],
+                             known_ids: Optional[Set[str]] = None,
+                             chronological: bool = False) -> "PlaylistWalk":
+        """
+        Walk playlist pages from the top, parsing each item once.
+        
+        Stops at the first item in known_ids, once limit qualifying tracks were
+        found, at the end of the playlist, or after max_pages pages. In
+        chronological mode it also stops after CHRONOLOGICAL_STALE_PAGES
+        consecutive pages whose items are all older than date_threshold.
+        """
+        walk = PlaylistWalk()
+        next_page_token = None
+        qualifying = 0
+        stale_pages = 0
+        
+        while max_pages is None or walk.pages_scanned < max_pages:
+            playlist_response = await self._fetch_playlist_page(youtube, playlist_id, next_page_token)
+            walk.pages_scanned += 1
+            
+            items = playlist_response.get("items", [])
+            logger.info(f"Playlist {source_name}: Page {walk.pages_scanned}, found {len(items)} items")
+            
+            # Classify the whole page's titles in one scan
+            page_filtered = self.title_filter.classify(
+                [item.get("snippet", {}).get("title", "") for item in items]
+            )
+            
+            page_has_recent = False
+            for item, filtered in zip(items, page_filtered):
+                entry = self._parse_playlist_item(item)
+                if not entry:
                     continue
                 
-                # Extract artist and track title
-                artist, track_title, remix = self._parse_title(title)
+                if not self._is_older_than(entry, date_threshold):
+                    page_has_recent = True
                 
-                # Create Track object
-                track = Track(
-                    title=track_title,
-                    artist=artist,
-                    remix=remix,
-                    release_date=publish_date.date() if publish_date else None,
-                    source=channel_name,
-                    source_url=f"https://www.youtube.com/watch?v={video_id}"
-                )
+                if known_ids is not None and entry['video_id'] in known_ids:
+                    walk.first_known_id = entry['video_id']
+                    return walk
                 
-                tracks.append(track)
+                walk.entries.append(entry)
                 
                 # Respect the limit
-                if len(tracks) >= limit:
-                    return tracks
+                if self._entry_to_track(entry, source_name, date_threshold, filtered=filtered):
+                    qualifying += 1
+                    if qualifying >= limit:
+                        return walk
+            
+            # Newest-first playlists: everything past a run of old pages is older still
+            if chronological and items:
+                stale_pages = 0 if page_has_recent else stale_pages + 1
+                if stale_pages >= self.CHRONOLOGICAL_STALE_PAGES:
+                    logger.info(f"Playlist {source_name}: Page {walk.pages_scanned} is entirely older than "
+                                f"{date_threshold}, stopping chronological scan")
+                    walk.complete = True
+                    walk.covered_since = date_threshold
+                    return walk
             
             # Check if there are more pages
             next_page_token = playlist_response.get("nextPageToken")
             if not next_page_token:
                 break
         
+        walk.complete = True
+        return walk
+    
+    @staticmethod
+    def _is_older_than(entry: Dict[str, Any], date_threshold: datetime) -> bool:
+        """Whether a parsed entry was published before date_threshold."""
+        if not entry.get('published_at'):
+            return False
+        return datetime.strptime(entry['published_at'], "%Y-%m-%dT%H:%M:%SZ") < date_threshold
+    
+    def _parse_playlist_item(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Parse a playlistItems entry into a storable dict, or None if unusable."""
+        snippet = item.get("snippet", {})
+        video_id = item.get("contentDetails", {}).get("videoId")
+        
+        # Skip if no video ID
+        if not video_id:
+            return None
+        
+        # Get video details
+        title = snippet.get("title", "")
+        
+        # Skip private videos
+        if title == "Private video" or not title:
+            return None
+        
+        # Extract artist and track title
+        artist, track_title, remix = self._parse_title(title)
+        
+        return {
+            'video_id': video_id,
+            'title': title,
+            'published_at': snippet.get("publishedAt", ""),
+            'artist': artist,
+            'track_title': track_title,
+            'remix': remix
+        }
+    
+    def _entry_to_track(self, entry: Dict[str, Any], source_name: str,
+                        date_threshold: datetime, filtered: Optional[bool] = None) -> Optional[Track]:
+        """
+        Build a Track from a parsed entry, or None if it is too old or filtered.
+        
+        filtered is the entry's title filter result when the caller already
+        classified a batch of titles; otherwise the title is checked here.
+        """
+        title = entry['title']
+        publish_date = None
+        
+        # Skip if video is too old
+        if entry.get('published_at'):
+            publish_date = datetime.strptime(entry['published_at'], "%Y-%m-%dT%H:%M:%SZ")
+            if publish_date < date_threshold:
+                return None
+        
+        # Skip if it matches any filter keywords (but allow specific terms)
+        if filtered is None:
+            filtered = self.title_filter.is_filtered(title)
+        if filtered:
+            return None
+        
+        return Track(
+            title=entry['track_title'],
+            artist=entry['artist'],
+            remix=entry['remix'],
+            release_date=publish_date.date() if publish_date else None,
+            source=source_name,
+            source_url=f"https://www.youtube.com/watch?v={entry['video_id']}"
+        )
+    
+    def _entries_to_tracks(self, entries: List[Dict[str, Any]], source_name: str,
+                           date_threshold: datetime, limit: int) -> List[Track]:
+        """Build up to limit tracks from a window of parsed entries."""
+        tracks = []
+        window_filtered = self.title_filter.classify([entry['title'] for entry in entries])
+        for entry, filtered in zip(entries, window_filtered):
+            track = self._entry_to_track(entry, source_name, date_threshold, filtered=filtered)
+            if track:
+                tracks.append(track)
+                if len(tracks) >= limit:
+                    break
         return tracks
     
+    def _merge_entries(self, new_entries: List[Dict[str, Any]], stored_entries: List[Dict[str, Any]],
+                       max_pages: Optional[int]) -> List[Dict[str, Any]]:
+        """Put new entries on top of the stored window, trimmed to the scan range."""
+        new_ids = {entry['video_id'] for entry in new_entries}
+        merged = new_entries + [entry for entry in stored_entries if entry['video_id'] not in new_ids]
+        max_items = max_pages * 50 if max_pages else self.SYNC_WINDOW_MAX_ITEMS
+        return merged[:max_items]
+    
+    def _needs_full_sync(self, state: SyncState) -> bool:
+        """Periodically re-walk from scratch to pick up edits below the high-water mark."""
+        if not state.last_full_sync_at:
+            return True
+        return datetime.utcnow() - state.last_full_sync_at > timedelta(hours=self.SYNC_FULL_REFRESH_HOURS)
+    
+    def _load_sync_state(self, playlist_id: str) -> Optional[SyncState]:
+        """Load the stored window for a playlist, ignoring store failures."""
+        if not self.sync_store:
+            return None
+        try:
+            return self.sync_store.get(playlist_id)
+        except Exception as e:
+            logger.warning(f"Could not load sync state for {playlist_id}: {e}")
+            return None
+    
+    def _save_sync_state(self, state: SyncState) -> None:
+        """Persist the window for a playlist, ignoring store failures."""
+        if not self.sync_store:
+            return
+        try:
+            self.sync_store.save(state)
+        except Exception as e:
+            logger.warning(f"Could not save sync state for {state.playlist_id}: {e}")
+    
     async def _scrape_youtube_tracks(self, sources: List[Dict], limit: int, 
                                     date_threshold: datetime) -> List[Track]:
-        """Fallback method to scrape YouTube without API key."""
-        # This is a simplified scraping implementation
-        logger.warning("Using YouTube scraping fallback (limited functionality)")
+        """
+        Fallback that scrapes YouTube pages when there is no API key or no quota left.
         
-        all_tracks = []
+        Sources are scraped concurrently (SCRAPE_PER_HOST_LIMIT connections) and
+        each follows continuation pages until its videos are older than
+        date_threshold. Upload dates are approximate ("3 days ago").
+        """
+        logger.warning("Using YouTube scraping fallback (approximate upload dates)")
         
-        async with aiohttp.ClientSession() as session:
-            for source in sources:
-                source_type = source["type"]
-                source_id = source["id"]
-                source_name = source["name"]
-                
-                if source_type == "playlist":
-                    url = f"https://www.youtube.com/playlist?list={source_id}"
-                else:
-                    url = f"https://www.youtube.com/channel/{source_id}/videos"
-                
-                try:
-                    async with session.get(url) as response:
-                        if response.status != 200:
-                            logger.warning(f"Error accessing {url}: {response.status}")
-                            continue
-                        
-                        html = await response.text()
-                        
-                        # Extract video information from the HTML
-                        # This is a simplified implementation and may break if YouTube changes their HTML structure
-                        video_titles = re.findall(r'"title":{"runs":\[{"text":"(.*?)"}\]}', html)
-                        video_ids = re.findall(r'"videoId":"(.*?)"', html)
-                        
-                        # Match titles with IDs
-                        for i, (title, video_id) in enumerate(zip(video_titles, video_ids)):
-                            if i >= limit // len(sources):
-                                break
-                            
-                            # Skip private videos
-                            if title == "Private video" or not title:
-                                continue
-                            
-                            # Skip if it matches any filter keywords
-                            should_filter = False
-                            for keyword in self.FILTER_KEYWORDS:
-                                if keyword.lower() in title.lower():
-                                    has_allowed_term = False
-                                    for allowed in self.ALLOWED_TERMS:
-                                        if allowed.lower() in title.lower():
-                                            has_allowed_term = True
-                                            break
-                                    
-                                    if not has_allowed_term:
-                                        should_filter = True
-                                        break
-                            
-                            if should_filter:
-                                continue
-                            
-                            # Extract artist and track title
-                            artist, track_title, remix = self._parse_title(title)
-                            
-                            # Create Track object
-                            track = Track(
-                                title=track_title,
-                                artist=artist,
-                                remix=remix,
-                                release_date=None,  # No date info in scraping
-                                source=source_name,
-                                source_url=f"https://www.youtube.com/watch?v={video_id}"
-                            )
-                            
-                            all_tracks.append(track)
+        if not sources:
+            return []
+        
+        scraper = YouTubeScraper(per_host_limit=self.SCRAPE_PER_HOST_LIMIT, max_pages=self.SCRAPE_MAX_PAGES,
+                                 http=self.http)
+        scraped = await scraper.scrape_sources(sources, date_threshold)
+        
+        all_tracks = []
+        per_source_limit = max(limit // len(sources), 1)
+        for source, videos in scraped:
+            entries = []
+            for video in videos:
+                # Skip private videos
+                if video.title == "Private video":
+                    continue
                 
-                except Exception as e:
-                    logger.error(f"Error scraping {url}: {e}", exc_info=True)
+                # Extract artist and track title
+                artist, track_title, remix = self._parse_title(video.title)
+                entries.append({
+                    'video_id': video.video_id,
+                    'title': video.title,
+                    'published_at': video.published.strftime("%Y-%m-%dT%H:%M:%SZ") if video.published else "",
+                    'artist': artist,
+                    'track_title': track_title,
+                    'remix': remix
+                })
+            
+            source_tracks = self._entries_to_tracks(entries, source["name"], date_threshold, per_source_limit)
+            logger.info(f"Scraped {len(source_tracks)} tracks from {source['name']} ({len(videos)} videos)")
+            all_tracks.extend(source_tracks)
         
         # Shuffle tracks to ensure variety, then limit
         import random
@@ -559,59 +1007,4 @@ class YouTubeSource(MusicSource):
         
         Returns a tuple of (artist, track_title, remix)
         """
-        # Clean up the title
-        title = title.strip()
-        
-        # Common patterns in electronic music YouTube titles
-        patterns = [
-            # Artist - Title (Remix) pattern
-            r"^([^-]+)\s*-\s*([^(\[]+)(?:\(([^)]+)\))?",
-            # Artist "Title" pattern
-            r'^([^"]+)\s*"([^"]+)"(?:\s*\(([^)]+)\))?',
-            # Artist 'Title' pattern
-            r"^([^']+)\s*'([^']+)'(?:\s*\(([^)]+)\))?",
-            # Artist | Title pattern
-            r"^([^|]+)\s*\|\s*([^(\[]+)(?:\s*\(([^)]+)\))?",
-            # Title by Artist pattern
-            r"^([^(byB)]+)\s+(?:by|BY)\s+([^(\[]+)(?:\s*\(([^)]+)\))?",
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, title)
-            if match:
-                groups = match.groups()
-                if len(groups) >= 2:
-                    artist = groups[0].strip()
-                    track_title = groups[1].strip()
-                    remix = groups[2].strip() if len(groups) > 2 and groups[2] else None
-                    
-                    # Check if remix info is already in title and not in the remix field
-                    if not remix:
-                        remix_match = re.search(r'\(([^)]*(?:remix|mix|edit|version)[^)]*)\)', track_title, re.IGNORECASE)
-                        if remix_match:
-                            remix = remix_match.group(1)
-                            # Remove the remix info from the title
-                            track_title = re.sub(r'\s*\([^)]*(?:remix|mix|edit|version)[^)]*\)', '', track_title)
-                    
-                    return artist, track_title, remix
-        
-        # If no pattern matches, use a default split on first delimiter found
-        for delimiter in [" - ", " | ", ": ", " _ "]:
-            if delimiter in title:
-                parts = title.split(delimiter, 1)
-                artist = parts[0].strip()
-                track_title = parts[1].strip()
-                
-                # Check for remix info in parentheses
-                remix_match = re.search(r'\(([^)]*(?:remix|mix|edit|version)[^)]*)\)', track_title, re.IGNORECASE)
-                if remix_match:
-                    remix = remix_match.group(1)
-                    # Remove the remix info from the title
-                    track_title = re.sub(r'\s*\([^)]*(?:remix|mix|edit|version)[^)]*\)', '', track_title)
-                else:
-                    remix = None
-                
-                return artist, track_title, remix
-        
-        # If all else fails, treat the whole title as the track title
-        return "Unknown Artist", title, None
\ No newline at end of file
+        return parse_youtube_title(title)
@@ -0,0 +1,161 @@
+"""
+YouTube Atom feeds (``/feeds/videos.xml``) for channels and playlists.
+
+Feeds cost no Data API quota but only list the first 15 videos of a channel
+(newest uploads) or playlist (in playlist order). Responses are cached with
+their ETag/Last-Modified validators and revalidated with a conditional GET,
+so an unchanged feed comes back as an empty 304.
+"""
+import logging
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from utils.cache import TTLCache
+from utils.http_session import HTTP_SESSIONS, HttpSessionManager
+
+logger = logging.getLogger(__name__)
+
+FEED_URL = "https://www.youtube.com/feeds/videos.xml"
+
+# YouTube never puts more entries than this in a feed
+FEED_MAX_ENTRIES = 15
+
+NAMESPACES = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "yt": "http://www.youtube.com/xml/schemas/2015",
+    "media": "http://search.yahoo.com/mrss/",
+}
+
+
+@dataclass
+class FeedEntry:
+    """A video listed in a feed; published is naive UTC."""
+    video_id: str
+    title: str
+    published: Optional[datetime] = None
+
+
+@dataclass
+class CachedFeed:
+    """Parsed feed with the validators needed to revalidate it."""
+    entries: List[FeedEntry] = field(default_factory=list)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def feed_url(feed_type: str, feed_id: str) -> str:
+    """Return the feed URL for a "channel" (UC... ID) or "playlist"."""
+    param = "playlist_id" if feed_type == "playlist" else "channel_id"
+    return f"{FEED_URL}?{param}={feed_id}"
+
+
+def parse_feed(xml_text: str) -> List[FeedEntry]:
+    """Parse the entries of a YouTube Atom feed, in feed order."""
+    root = ET.fromstring(xml_text)
+    entries = []
+    for entry in root.findall("atom:entry", NAMESPACES):
+        video_id = entry.findtext("yt:videoId", default="", namespaces=NAMESPACES)
+        title = (entry.findtext("atom:title", default="", namespaces=NAMESPACES)
+                 or entry.findtext("media:group/media:title", default="", namespaces=NAMESPACES))
+        if not video_id or not title:
+            continue
+        entries.append(FeedEntry(
+            video_id=video_id,
+            title=title,
+            published=_parse_timestamp(entry.findtext("atom:published", default="", namespaces=NAMESPACES))
+        ))
+    return entries
+
+
+def _parse_timestamp(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        published = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if published.tzinfo is not None:
+        published = published.astimezone(timezone.utc).replace(tzinfo=None)
+    return published
+
+
+class YouTubeFeedReader:
+    """Fetches feeds with conditional GETs against a cache of parsed feeds."""
+
+    def __init__(self, cache: Optional[TTLCache] = None, timeout: float = 10,
+                 http: HttpSessionManager = HTTP_SESSIONS):
+        self.cache = cache if cache is not None else TTLCache(max_size=1024, ttl=24 * 3600)
+        self.timeout = timeout
+        self.http = http
+        self.fetched = 0
+        self.not_modified = 0
+        self.errors = 0
+
+    async def fetch(self, feed_type: str, feed_id: str,
+                    session: Optional[aiohttp.ClientSession] = None) -> Optional[List[FeedEntry]]:
+        """
+        Fetch a channel or playlist feed.
+
+        Args:
+            feed_type: "channel" or "playlist"
+            feed_id: Channel ID (UC...) or playlist ID
+            session: Session to use instead of the reader's pooled one
+
+        Returns:
+            Feed entries, or None if the feed could not be fetched
+        """
+        url = feed_url(feed_type, feed_id)
+        cached = self.cache.get(url)
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        if session is None:
+            session = await self.http.get_session()
+        try:
+            async with session.get(url, headers=headers,
+                                   timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+                if response.status == 304 and cached is not None:
+                    self.not_modified += 1
+                    # Keep the validated copy for another TTL
+                    self.cache.set(url, cached)
+                    return cached.entries
+                if response.status != 200:
+                    self.errors += 1
+                    logger.warning(f"YouTube feed {url} returned HTTP {response.status}")
+                    return None
+                body = await response.text()
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Could not fetch YouTube feed {url}: {e}")
+            return None
+
+        try:
+            entries = parse_feed(body)
+        except ET.ParseError as e:
+            self.errors += 1
+            logger.warning(f"Could not parse YouTube feed {url}: {e}")
+            return None
+
+        self.fetched += 1
+        if etag or last_modified:
+            self.cache.set(url, CachedFeed(entries=entries, etag=etag, last_modified=last_modified))
+        return entries
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'fetched': self.fetched,
+            'not_modified': self.not_modified,
+            'errors': self.errors,
+            'cached_feeds': len(self.cache),
+        }
@@ -0,0 +1,289 @@
+"""
+Scraping fallback for YouTube channels and playlists (no API key or no quota).
+
+Each page's embedded ``ytInitialData`` JSON is decoded once and walked for
+video renderers, so titles, video IDs and relative upload dates
+("3 days ago") always come from the same video. Further pages are loaded by
+posting the page's continuation token to the InnerTube browse endpoint until
+the videos are older than the date threshold.
+"""
+import re
+import json
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from utils.http_session import HTTP_SESSIONS, HttpSessionManager
+
+logger = logging.getLogger(__name__)
+
+YOUTUBE_URL = "https://www.youtube.com"
+BROWSE_URL = f"{YOUTUBE_URL}/youtubei/v1/browse"
+
+# English UI so relative dates can be parsed; CONSENT skips the EU cookie wall
+REQUEST_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"),
+    "Accept-Language": "en-US,en;q=0.9",
+    "Cookie": "CONSENT=YES+cb",
+}
+
+INITIAL_DATA_MARKERS = ("var ytInitialData = ", 'window["ytInitialData"] = ', "ytInitialData = ")
+
+VIDEO_RENDERERS = ("playlistVideoRenderer", "videoRenderer", "gridVideoRenderer")
+
+_RELATIVE_TIME = re.compile(r"(\d+)\s+(second|minute|hour|day|week|month|year)s?\s+ago", re.IGNORECASE)
+_RELATIVE_UNITS = {
+    "second": timedelta(seconds=1),
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+
+_INNERTUBE_KEY = re.compile(r'"INNERTUBE_API_KEY"\s*:\s*"([^"]+)"')
+_INNERTUBE_VERSION = re.compile(r'"INNERTUBE_CLIENT_VERSION"\s*:\s*"([^"]+)"')
+
+
+@dataclass
+class ScrapedVideo:
+    """A video found on a scraped page; published is approximate naive UTC."""
+    video_id: str
+    title: str
+    published: Optional[datetime] = None
+    published_text: str = ""
+
+
+@dataclass
+class ScrapedPage:
+    videos: List[ScrapedVideo] = field(default_factory=list)
+    continuation: Optional[str] = None
+
+
+def parse_relative_time(text: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Turn "3 days ago" / "Streamed 2 weeks ago" into an approximate UTC datetime."""
+    match = _RELATIVE_TIME.search(text or "")
+    if not match:
+        return None
+    now = now or datetime.utcnow()
+    return now - int(match.group(1)) * _RELATIVE_UNITS[match.group(2).lower()]
+
+
+def extract_initial_data(html: str) -> Optional[Dict[str, Any]]:
+    """Decode the ytInitialData object embedded in a YouTube page."""
+    decoder = json.JSONDecoder()
+    for marker in INITIAL_DATA_MARKERS:
+        start = html.find(marker)
+        if start == -1:
+            continue
+        try:
+            data, _ = decoder.raw_decode(html, start + len(marker))
+            return data
+        except ValueError:
+            continue
+    return None
+
+
+def extract_innertube_config(html: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return the page's (INNERTUBE_API_KEY, INNERTUBE_CLIENT_VERSION) for continuation requests."""
+    key = _INNERTUBE_KEY.search(html)
+    version = _INNERTUBE_VERSION.search(html)
+    return (key.group(1) if key else None), (version.group(1) if version else None)
+
+
+def _text(value: Any) -> str:
+    """Flatten a {"simpleText": ...} or {"runs": [{"text": ...}]} text object."""
+    if not isinstance(value, dict):
+        return ""
+    if "simpleText" in value:
+        return value["simpleText"]
+    return "".join(run.get("text", "") for run in value.get("runs", []))
+
+
+def _parse_renderer(renderer: Dict[str, Any], now: datetime) -> Optional[ScrapedVideo]:
+    video_id = renderer.get("videoId")
+    title = _text(renderer.get("title"))
+    if not video_id or not title:
+        return None
+
+    published_text = _text(renderer.get("publishedTimeText"))
+    if not published_text:
+        # Playlist rows put the date in "1.2K views • 3 days ago"
+        for run in renderer.get("videoInfo", {}).get("runs", []):
+            if _RELATIVE_TIME.search(run.get("text", "")):
+                published_text = run["text"]
+                break
+
+    return ScrapedVideo(
+        video_id=video_id,
+        title=title,
+        published=parse_relative_time(published_text, now),
+        published_text=published_text
+    )
+
+
+def _continuation_token(node: Any) -> Optional[str]:
+    if isinstance(node, dict):
+        command = node.get("continuationCommand")
+        if isinstance(command, dict) and command.get("token"):
+            return command["token"]
+        node = list(node.values())
+    if isinstance(node, list):
+        for item in node:
+            token = _continuation_token(item)
+            if token:
+                return token
+    return None
+
+
+def parse_videos(data: Any, now: Optional[datetime] = None) -> ScrapedPage:
+    """Collect video renderers and the continuation token from ytInitialData or a browse response."""
+    now = now or datetime.utcnow()
+    page = ScrapedPage()
+
+    def walk(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in VIDEO_RENDERERS and isinstance(value, dict):
+                    video = _parse_renderer(value, now)
+                    if video:
+                        page.videos.append(video)
+                elif key == "continuationItemRenderer":
+                    # Sort chips carry continuation tokens too; only this one loads the next page
+                    page.continuation = _continuation_token(value) or page.continuation
+                else:
+                    walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(data)
+    return page
+
+
+def source_url(source: Dict[str, Any]) -> str:
+    """Page listing a source's videos."""
+    source_id = source["id"]
+    if source["type"] == "playlist":
+        return f"{YOUTUBE_URL}/playlist?list={source_id}"
+    if source_id.startswith("@"):
+        return f"{YOUTUBE_URL}/{source_id}/videos"
+    return f"{YOUTUBE_URL}/channel/{source_id}/videos"
+
+
+class YouTubeScraper:
+    """Scrapes several sources concurrently, following continuations to the date threshold."""
+
+    def __init__(self, per_host_limit: int = 4, max_pages: int = 10, timeout: float = 20,
+                 http: HttpSessionManager = HTTP_SESSIONS):
+        self.per_host_limit = per_host_limit
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.http = http
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def scrape_sources(self, sources: List[Dict[str, Any]],
+                             date_threshold: datetime) -> List[Tuple[Dict[str, Any], List[ScrapedVideo]]]:
+        """
+        Scrape all sources concurrently.
+
+        Returns:
+            (source, videos) pairs in the order of sources; failed sources have no videos
+        """
+        session = await self.http.get_session()
+        results = await asyncio.gather(
+            *[self.scrape_source(session, source, date_threshold) for source in sources],
+            return_exceptions=True
+        )
+
+        scraped = []
+        for source, result in zip(sources, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error scraping {source.get('name', source['id'])}: {result}")
+                result = []
+            scraped.append((source, result))
+        return scraped
+
+    async def scrape_source(self, session: aiohttp.ClientSession, source: Dict[str, Any],
+                            date_threshold: datetime) -> List[ScrapedVideo]:
+        """Scrape one source's pages until its videos are older than date_threshold."""
+        url = source_url(source)
+        async with self._slot():
+            async with session.get(url, headers=REQUEST_HEADERS, timeout=self._timeout()) as response:
+                if response.status != 200:
+                    logger.warning(f"Error accessing {url}: {response.status}")
+                    return []
+                html = await response.text()
+
+        data = extract_initial_data(html)
+        if data is None:
+            logger.warning(f"No ytInitialData found on {url}")
+            return []
+        api_key, client_version = extract_innertube_config(html)
+
+        videos: List[ScrapedVideo] = []
+        seen = set()
+        page = parse_videos(data)
+        pages = 1
+        newest_first = source["type"] != "playlist"
+
+        while True:
+            for video in page.videos:
+                if video.video_id not in seen:
+                    seen.add(video.video_id)
+                    videos.append(video)
+
+            if self._reached_threshold(page.videos, date_threshold, newest_first):
+                break
+            if not page.continuation or not client_version or pages >= self.max_pages:
+                break
+
+            page = await self._fetch_continuation(session, page.continuation, api_key, client_version)
+            if page is None:
+                break
+            pages += 1
+
+        logger.info(f"Scraped {len(videos)} videos from {url} in {pages} pages")
+        return videos
+
+    @staticmethod
+    def _reached_threshold(videos: List[ScrapedVideo], date_threshold: datetime, newest_first: bool) -> bool:
+        dates = [video.published for video in videos if video.published]
+        if not dates:
+            return False
+        if newest_first:
+            # Channel uploads: everything after an old video is older still
+            return min(dates) < date_threshold
+        # Playlists are in playlist order: stop after a page with nothing recent
+        return max(dates) < date_threshold
+
+    async def _fetch_continuation(self, session: aiohttp.ClientSession, token: str,
+                                  api_key: Optional[str], client_version: str) -> Optional[ScrapedPage]:
+        params = {"key": api_key} if api_key else None
+        payload = {
+            "context": {"client": {"clientName": "WEB", "clientVersion": client_version, "hl": "en", "gl": "US"}},
+            "continuation": token,
+        }
+        async with self._slot():
+            async with session.post(BROWSE_URL, params=params, json=payload,
+                                    headers=REQUEST_HEADERS, timeout=self._timeout()) as response:
+                if response.status != 200:
+                    logger.warning(f"YouTube continuation request failed: {response.status}")
+                    return None
+                data = await response.json(content_type=None)
+        return parse_videos(data)
+
+    def _slot(self) -> asyncio.Semaphore:
+        # The pooled session is shared with other work; keep youtube.com to per_host_limit here
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.per_host_limit)
+        return self._slots
+
+    def _timeout(self) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(total=self.timeout)
@@ -0,0 +1,170 @@
+"""
+Concurrent, rate-limited scheduling of Spotify Web API requests.
+
+Spotify limits each app by the number of calls in a rolling 30-second
+window and answers 429 with a Retry-After header once it is exceeded.
+Matching a playlist one search at a time stays well under that limit but
+takes a round trip per track; SpotifyScheduler runs searches concurrently
+instead, while a token bucket keeps the process under the window and a 429
+pauses every request until Retry-After has passed.
+
+The bucket is shared by all event loops in the process (task worker threads
+each run their own), so it is guarded by a threading lock and waits with
+asyncio.sleep outside of it.
+"""
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Spotify's rate limit is calculated over a rolling 30 second window
+RATE_WINDOW_SECONDS = 30
+
+
+class TokenBucket:
+    """Token bucket that hands out send times instead of blocking a thread."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is a queue of callers waiting for refills
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    async def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def block(self, seconds: float) -> None:
+        """Hold back every caller for seconds, e.g. after a 429."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            # Start again from an empty bucket rather than a burst when the block ends
+            self._tokens = min(self._tokens, 0.0)
+
+
+class SpotifyScheduler:
+    """Runs Spotify requests concurrently within the app's rate limit."""
+
+    def __init__(self, concurrency: int = 10, requests_per_window: int = 600, burst: int = 100,
+                 max_retries: int = 5, backoff: float = 1.0, max_retry_after: float = 60.0):
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(rate=requests_per_window / RATE_WINDOW_SECONDS, capacity=burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_retry_after = max_retry_after
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.rate_limited = 0
+
+    def retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Seconds to wait before retry number attempt (0-based).
+
+        Retry-After is honored when present; otherwise the delay backs off
+        exponentially. Jitter keeps concurrent searches from retrying in lockstep.
+        """
+        try:
+            delay = float(retry_after) if retry_after is not None else None
+        except ValueError:
+            delay = None
+        if delay is None:
+            delay = self.backoff * (2 ** attempt)
+        return delay + random.uniform(0, self.backoff)
+
+    async def get_json(self, session, url: str, **kwargs) -> Tuple[int, Optional[Any]]:
+        """
+        GET url within the rate limit, retrying on 429.
+
+        Returns:
+            Tuple of (status, decoded JSON body or None if the status was not 200)
+        """
+        status = 429
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            with self._lock:
+                self.requests += 1
+            async with session.get(url, **kwargs) as response:
+                status = response.status
+                if status == 200:
+                    return status, await response.json()
+                if status != 429:
+                    return status, None
+                retry_after = response.headers.get("Retry-After")
+
+            with self._lock:
+                self.rate_limited += 1
+            if attempt == self.max_retries:
+                break
+            delay = self.retry_delay(attempt, retry_after)
+            if delay > self.max_retry_after:
+                logger.warning(f"Spotify asked to wait {delay:.0f}s, giving up on {url}")
+                break
+            logger.info(f"Spotify rate limit hit, retrying in {delay:.1f}s")
+            self.bucket.block(delay)
+        return status, None
+
+    async def map(self, items: Sequence[T], func: Callable[[T], Awaitable[R]],
+                  on_result: Optional[Callable[[int, R], Awaitable[None]]] = None) -> List[R]:
+        """
+        Await func(item) for every item, at most `concurrency` at a time.
+
+        Args:
+            items: Inputs, e.g. tracks to search for
+            func: Coroutine function to run per item
+            on_result: Optional coroutine called with (completed count, result) as results arrive
+
+        Returns:
+            Results in the order of items
+        """
+        results: List[Optional[R]] = [None] * len(items)
+        pending = iter(range(len(items)))
+        completed = 0
+
+        async def worker():
+            nonlocal completed
+            for index in pending:
+                results[index] = await func(items[index])
+                completed += 1
+                if on_result:
+                    await on_result(completed, results[index])
+
+        await asyncio.gather(*[worker() for _ in range(min(self.concurrency, len(items)))])
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'concurrency': self.concurrency,
+                'requests': self.requests,
+                'rate_limited': self.rate_limited,
+            }
+
+
+# Shared by every SpotifyDestination in the process, since the limit is per app
+SPOTIFY_SCHEDULER = SpotifyScheduler(
+    concurrency=int(os.environ.get("SPOTIFY_MATCH_CONCURRENCY", 10)),
+    requests_per_window=int(os.environ.get("SPOTIFY_REQUESTS_PER_WINDOW", 600)),
+    burst=int(os.environ.get("SPOTIFY_RATE_BURST", 100))
+)
@@ -0,0 +1,157 @@
+"""
+Process-wide YouTube Data API client factory.
+
+``googleapiclient.discovery.build`` reads and parses the YouTube discovery
+document (several hundred KB of JSON) and generates the resource classes on
+every call. The factory loads the static discovery document bundled with
+google-api-python-client once per process and caches one client per API key,
+so sources can ask for a client on every call without paying that cost.
+
+httplib2 connections are not thread-safe, and requests are executed on
+executor threads, so client requests do not share the client's connection:
+each request is sent over an ``httplib2.Http`` owned by the executing thread.
+"""
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import httplib2
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document
+from googleapiclient.http import HttpRequest
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "youtube"
+SERVICE_VERSION = "v3"
+DISCOVERY_URI = "https://www.googleapis.com/discovery/v1/apis/youtube/v3/rest"
+
+# Socket timeout for YouTube API connections
+HTTP_TIMEOUT = 30
+
+_thread_state = threading.local()
+
+
+def thread_http(credentials=None):
+    """
+    Return an HTTP object that sends requests over this thread's connection.
+
+    Only the unauthenticated ``httplib2.Http`` is kept per thread; OAuth
+    credentials get a fresh ``AuthorizedHttp`` wrapper around it on every
+    call, so no per-user state outlives the request.
+
+    Args:
+        credentials: google.auth credentials for OAuth clients, or None for API key clients
+    """
+    http = getattr(_thread_state, "http", None)
+    if http is None:
+        http = _thread_state.http = httplib2.Http(timeout=HTTP_TIMEOUT)
+    if credentials is None:
+        return http
+
+    import google_auth_httplib2
+    return google_auth_httplib2.AuthorizedHttp(credentials, http=http)
+
+
+def _credentials_of(http) -> Optional[Any]:
+    """OAuth credentials of a client's HTTP object (an AuthorizedHttp), or None."""
+    # httplib2.Http has a "credentials" attribute of its own (for HTTP basic auth)
+    if http is None or isinstance(http, httplib2.Http):
+        return None
+    return getattr(http, "credentials", None)
+
+
+class ThreadLocalHttpRequest(HttpRequest):
+    """HttpRequest that executes over the calling thread's own connection."""
+
+    def execute(self, http=None, num_retries=0):
+        if http is None:
+            http = thread_http(_credentials_of(self.http))
+        return super().execute(http=http, num_retries=num_retries)
+
+
+class YouTubeClientFactory:
+    """Builds YouTube clients from a discovery document loaded once per process."""
+
+    def __init__(self):
+        self._document: Optional[Dict[str, Any]] = None
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def discovery_document(self) -> Dict[str, Any]:
+        """Return the parsed YouTube v3 discovery document, loading it on first use."""
+        if self._document is None:
+            with self._lock:
+                if self._document is None:
+                    self._document = self._load_document()
+        return self._document
+
+    @staticmethod
+    def _load_document() -> Dict[str, Any]:
+        content = discovery_cache.get_static_doc(SERVICE_NAME, SERVICE_VERSION)
+        if content is None:
+            # Only happens with a google-api-python-client that does not bundle the document
+            logger.warning("No bundled YouTube discovery document, downloading it once")
+            response, content = httplib2.Http(timeout=HTTP_TIMEOUT).request(DISCOVERY_URI)
+            if response.status >= 400:
+                raise RuntimeError(f"Could not download YouTube discovery document: HTTP {response.status}")
+        if isinstance(content, bytes):
+            content = content.decode("utf-8")
+        return json.loads(content)
+
+    def get_client(self, api_key: str):
+        """
+        Return the shared client for an API key.
+
+        Args:
+            api_key: YouTube Data API key
+
+        Returns:
+            googleapiclient Resource for YouTube v3
+        """
+        client = self._clients.get(api_key)
+        if client is None:
+            document = self.discovery_document()
+            with self._lock:
+                client = self._clients.get(api_key)
+                if client is None:
+                    client = build_from_document(
+                        document,
+                        developerKey=api_key,
+                        http=httplib2.Http(timeout=HTTP_TIMEOUT),
+                        requestBuilder=ThreadLocalHttpRequest
+                    )
+                    self._clients[api_key] = client
+                    self.builds += 1
+        return client
+
+    def build_authorized(self, credentials):
+        """
+        Build a client for OAuth credentials (e.g. to manage the user's playlists).
+
+        These clients are not cached since credentials belong to one session.
+        """
+        # Requests find the credentials on the client's AuthorizedHttp
+        client = build_from_document(
+            self.discovery_document(),
+            credentials=credentials,
+            requestBuilder=ThreadLocalHttpRequest
+        )
+        with self._lock:
+            self.builds += 1
+        return client
+
+    def clear(self) -> None:
+        """Drop cached clients, e.g. after the API key changes."""
+        with self._lock:
+            self._clients.clear()
+
+
+YOUTUBE_CLIENTS = YouTubeClientFactory()
+
+
+def get_youtube_client(api_key: str):
+    """Return the process-wide YouTube client for an API key."""
+    return YOUTUBE_CLIENTS.get_client(api_key)
@@ -0,0 +1,101 @@
+"""
+Dedicated thread pool for blocking YouTube API calls.
+
+googleapiclient requests block, so they are run on threads. Using a named,
+sized pool instead of the event loop's default executor keeps YouTube I/O
+from competing with other blocking work and bounds the number of open
+connections. Each pool thread sends requests over its own keep-alive
+``httplib2.Http`` (see ``utils.youtube_client.thread_http``).
+
+Queue depth and time spent waiting for a free thread are tracked so the pool
+can be sized against SOURCE_FETCH_CONCURRENCY and the number of task workers.
+"""
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class YouTubeExecutor:
+    """ThreadPoolExecutor wrapper that records queue depth and wait times."""
+
+    def __init__(self, max_workers: int = 16, thread_name_prefix: str = "youtube-io",
+                 sample_size: int = 500):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=sample_size)
+        self.queued = 0
+        self.active = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_wait = 0.0
+
+    def _wrap(self, func: Callable[[], Any], submitted_at: float) -> Callable[[], Any]:
+        def run():
+            wait = time.monotonic() - submitted_at
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                self._waits.append(wait)
+                self.max_wait = max(self.max_wait, wait)
+            try:
+                result = func()
+            except Exception:
+                with self._lock:
+                    self.failed += 1
+                raise
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+            return result
+        return run
+
+    async def run(self, func: Callable[[], Any]) -> Any:
+        """Run a blocking callable on the pool and await its result."""
+        with self._lock:
+            self.queued += 1
+            self.submitted += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._wrap(func, time.monotonic()))
+
+    def call(self, func: Callable[[], Any]) -> Any:
+        """Run a blocking callable on the pool from synchronous code and wait for its result."""
+        with self._lock:
+            self.queued += 1
+            self.submitted += 1
+        return self._executor.submit(self._wrap(func, time.monotonic())).result()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size, queue depth and wait-time statistics in milliseconds."""
+        with self._lock:
+            waits = sorted(self._waits)
+            stats = {
+                'max_workers': self.max_workers,
+                'queue_depth': self.queued,
+                'active': self.active,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'max_wait_ms': round(self.max_wait * 1000, 2),
+            }
+        if waits:
+            stats['avg_wait_ms'] = round(sum(waits) / len(waits) * 1000, 2)
+            stats['p95_wait_ms'] = round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 2)
+        else:
+            stats['avg_wait_ms'] = stats['p95_wait_ms'] = 0.0
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+YOUTUBE_EXECUTOR = YouTubeExecutor(
+    max_workers=int(os.environ.get("YOUTUBE_IO_WORKERS", 16))
+)
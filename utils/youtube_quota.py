@@ -0,0 +1,346 @@
+"""
+YouTube Data API quota accounting.
+
+Every ``youtube.*().execute`` call goes through ``QUOTA_MANAGER.execute`` so
+its unit cost is charged against the daily budget (10,000 units by default,
+reset at midnight Pacific time) before the request is sent. Calls that would
+push usage past the budget are refused with ``QuotaExceededError`` so callers
+can degrade to cached results instead of running into ``quotaExceeded``.
+
+Usage is attributed to the user/task set with ``quota_attribution`` and
+recorded in a ledger in batches; the web app injects a DB-backed ledger so the
+budget is shared across workers and restarts.
+"""
+import os
+import time
+import atexit
+import asyncio
+import logging
+import threading
+import contextvars
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.youtube_executor import YOUTUBE_EXECUTOR
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+except Exception:  # tzdata missing (e.g. minimal Windows installs)
+    QUOTA_TIMEZONE = None
+
+logger = logging.getLogger(__name__)
+
+# Unit cost per API method (https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COSTS = {
+    "playlistItems.list": 1,
+    "channels.list": 1,
+    "videos.list": 1,
+    "playlists.list": 1,
+    "search.list": 100,
+    "playlists.insert": 50,
+    "playlistItems.insert": 50,
+}
+DEFAULT_QUOTA_COST = 1
+
+_attribution: contextvars.ContextVar = contextvars.ContextVar(
+    "youtube_quota_attribution", default=(None, None)
+)
+
+
+class QuotaExceededError(Exception):
+    """Raised when a call is refused because the daily quota budget is spent."""
+
+
+def quota_day(now: Optional[datetime] = None) -> str:
+    """Return the quota day (YYYY-MM-DD); YouTube resets quotas at midnight Pacific."""
+    if QUOTA_TIMEZONE is None:
+        return (now or datetime.utcnow()).strftime("%Y-%m-%d")
+    if now is None:
+        return datetime.now(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    return now.astimezone(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+
+
+@contextmanager
+def quota_attribution(user_id: Optional[int] = None, task_id: Optional[str] = None):
+    """Attribute YouTube API calls made inside the block to a user and/or task."""
+    token = _attribution.set((user_id, task_id))
+    try:
+        yield
+    finally:
+        _attribution.reset(token)
+
+
+def current_attribution() -> Tuple[Optional[int], Optional[str]]:
+    """Return the (user_id, task_id) the current calls are attributed to."""
+    return _attribution.get()
+
+
+class InMemoryQuotaLedger:
+    """Process-local usage ledger (used by the CLI and as the default)."""
+
+    def __init__(self):
+        self._rows: Dict[tuple, Dict[str, int]] = defaultdict(lambda: {'calls': 0, 'units': 0})
+        self._lock = threading.Lock()
+
+    def record(self, day: str, method: str, units: int,
+               user_id: Optional[int] = None, task_id: Optional[str] = None, calls: int = 1) -> None:
+        with self._lock:
+            row = self._rows[(day, method, user_id, task_id)]
+            row['calls'] += calls
+            row['units'] += units
+
+    def total_units(self, day: str) -> int:
+        with self._lock:
+            return sum(row['units'] for key, row in self._rows.items() if key[0] == day)
+
+    def summary(self, day: str) -> Dict[str, Any]:
+        by_method: Dict[str, Dict[str, int]] = defaultdict(lambda: {'calls': 0, 'units': 0})
+        by_user: Dict[Any, int] = defaultdict(int)
+        by_task: Dict[Any, int] = defaultdict(int)
+        with self._lock:
+            for (row_day, method, user_id, task_id), row in self._rows.items():
+                if row_day != day:
+                    continue
+                by_method[method]['calls'] += row['calls']
+                by_method[method]['units'] += row['units']
+                by_user[user_id] += row['units']
+                by_task[task_id] += row['units']
+        return {
+            'by_method': dict(by_method),
+            'by_user': {str(k): v for k, v in by_user.items()},
+            'by_task': {str(k): v for k, v in by_task.items()},
+        }
+
+
+class QuotaManager:
+    """
+    Tracks YouTube API units used today and admits or refuses calls.
+
+    Calls are refused once usage plus the call's cost would exceed the daily
+    limit minus a safety margin. The margin leaves room for other workers
+    whose usage has not been synced from the ledger yet. A ``quotaExceeded``
+    error from the API marks the budget as spent for the rest of the day.
+
+    Charged calls are counted in memory and written to the ledger in one
+    batch every refresh_seconds, when today's total is re-read from it, so
+    charging a call never waits on the ledger.
+    """
+
+    def __init__(self, daily_limit: int = 10000, safety_margin: int = 500,
+                 ledger=None, refresh_seconds: float = 10):
+        self.daily_limit = daily_limit
+        self.safety_margin = safety_margin
+        self.ledger = ledger if ledger is not None else InMemoryQuotaLedger()
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._day: Optional[str] = None
+        self._synced_units = 0
+        self._pending_units = 0
+        self._synced_at = 0.0
+        self._syncing = False
+        # (day, method, user_id, task_id) -> [calls, units] not written to the ledger yet
+        self._unrecorded: Dict[tuple, List[int]] = {}
+        self._exhausted_day: Optional[str] = None
+        self.refused_calls = 0
+
+    @staticmethod
+    def cost(method: str) -> int:
+        """Return the unit cost of an API method such as "search.list"."""
+        return QUOTA_COSTS.get(method, DEFAULT_QUOTA_COST)
+
+    def _roll_day(self, day: str) -> None:
+        if self._day != day:
+            self._day = day
+            self._synced_units = 0
+            self._pending_units = 0
+            self._synced_at = 0.0
+            self.refused_calls = 0
+
+    def sync_due(self) -> bool:
+        """Whether the ledger is due to be synced (see sync)."""
+        return time.monotonic() - self._synced_at >= self.refresh_seconds
+
+    def flush(self) -> None:
+        """Write the buffered call counts to the ledger."""
+        with self._lock:
+            rows, self._unrecorded = self._unrecorded, {}
+
+        for key, (calls, units) in rows.items():
+            day, method, user_id, task_id = key
+            try:
+                self.ledger.record(day, method, units, user_id=user_id, task_id=task_id, calls=calls)
+            except Exception as e:
+                logger.warning(f"Could not record YouTube quota usage for {method}: {e}")
+                # Keep the counts for the next flush
+                with self._lock:
+                    row = self._unrecorded.setdefault(key, [0, 0])
+                    row[0] += calls
+                    row[1] += units
+
+    def sync(self) -> None:
+        """Flush buffered usage and re-read today's total from the ledger.
+
+        Both are blocking ledger (database) calls; execute runs this on an
+        executor thread. Only one thread syncs at a time, others keep using
+        the last synced total.
+        """
+        with self._lock:
+            if self._syncing:
+                return
+            self._syncing = True
+        try:
+            day = quota_day()
+            self.flush()
+            try:
+                total = self.ledger.total_units(day)
+            except Exception as e:
+                logger.warning(f"Could not read YouTube quota ledger: {e}")
+                # Retry after refresh_seconds rather than on every call
+                with self._lock:
+                    self._roll_day(day)
+                    self._synced_at = time.monotonic()
+                return
+            with self._lock:
+                self._roll_day(day)
+                self._synced_units = total
+                # Calls charged since the flush are not in the total yet
+                self._pending_units = sum(units for (row_day, *_), (_, units) in self._unrecorded.items()
+                                          if row_day == day)
+                self._synced_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._syncing = False
+
+    def used_today(self) -> int:
+        """Units used today, synced from the ledger every refresh_seconds.
+
+        On an event loop thread the ledger is never read here (execute syncs
+        on an executor thread first), so charging a call does not block the loop.
+        """
+        if self.sync_due() and not _on_event_loop():
+            self.sync()
+        day = quota_day()
+        with self._lock:
+            self._roll_day(day)
+            return self._synced_units + self._pending_units
+
+    def remaining(self) -> int:
+        """Units that can still be spent today before calls are refused."""
+        if self._exhausted_day == quota_day():
+            return 0
+        return max(self.daily_limit - self.safety_margin - self.used_today(), 0)
+
+    def acquire(self, method: str) -> int:
+        """
+        Charge one call of method against today's budget.
+
+        Returns:
+            Units charged
+
+        Raises:
+            QuotaExceededError: If the call does not fit in the remaining budget
+        """
+        units = self.cost(method)
+        if units > self.remaining():
+            with self._lock:
+                self.refused_calls += 1
+            raise QuotaExceededError(
+                f"YouTube quota budget exhausted ({self.used_today()}/{self.daily_limit} units used), "
+                f"refusing {method} ({units} units)"
+            )
+
+        day = quota_day()
+        user_id, task_id = current_attribution()
+        with self._lock:
+            self._roll_day(day)
+            self._pending_units += units
+            row = self._unrecorded.setdefault((day, method, user_id, task_id), [0, 0])
+            row[0] += 1
+            row[1] += units
+        return units
+
+    def mark_exhausted(self) -> None:
+        """Refuse further calls until the next quota day."""
+        self._exhausted_day = quota_day()
+        logger.error("YouTube API reported quotaExceeded, refusing calls until midnight Pacific")
+
+    async def execute(self, request, method: str):
+        """
+        Charge and execute a googleapiclient request on the YouTube I/O pool.
+
+        Args:
+            request: Request object returned by e.g. youtube.search().list(...)
+            method: API method name used for the unit cost, e.g. "search.list"
+
+        Returns:
+            The API response
+        """
+        if self.sync_due():
+            # Ledger reads and writes block, so they must not run on the event loop
+            await asyncio.get_running_loop().run_in_executor(None, self.sync)
+        self.acquire(method)
+        try:
+            return await YOUTUBE_EXECUTOR.run(request.execute)
+        except Exception as e:
+            if is_quota_error(e):
+                self.mark_exhausted()
+            raise
+
+    def execute_blocking(self, request, method: str):
+        """execute for synchronous callers such as Flask views: waits for the response."""
+        self.acquire(method)
+        try:
+            return YOUTUBE_EXECUTOR.call(request.execute)
+        except Exception as e:
+            if is_quota_error(e):
+                self.mark_exhausted()
+            raise
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return today's usage and per-method/user/task breakdown."""
+        day = quota_day()
+        self.sync()
+        used = self.used_today()
+        try:
+            breakdown = self.ledger.summary(day)
+        except Exception as e:
+            logger.warning(f"Could not read YouTube quota ledger summary: {e}")
+            breakdown = {}
+        return {
+            'day': day,
+            'daily_limit': self.daily_limit,
+            'safety_margin': self.safety_margin,
+            'used_units': used,
+            'remaining_units': self.remaining(),
+            'exhausted': self._exhausted_day == day,
+            'refused_calls': self.refused_calls,
+            **breakdown,
+        }
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def is_quota_error(error: Exception) -> bool:
+    """Whether an API error is YouTube's quotaExceeded/dailyLimitExceeded."""
+    message = str(error)
+    return 'quotaExceeded' in message or 'dailyLimitExceeded' in message
+
+
+QUOTA_MANAGER = QuotaManager(
+    daily_limit=int(os.environ.get("YOUTUBE_DAILY_QUOTA", 10000)),
+    safety_margin=int(os.environ.get("YOUTUBE_QUOTA_SAFETY_MARGIN", 500))
+)
+
+# Don't lose the last few seconds of buffered usage on shutdown
+atexit.register(QUOTA_MANAGER.flush)
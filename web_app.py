@@ -282,34 +282,15 @@ if IS_PRODUCTION:
 # Initialize database after everything is set up
 init_db()
 
-# Start background task processor
-from src.flasksaas.main.task_manager import cleanup_old_tasks, get_task, process_task_step
-import threading
-
-def background_task_processor():
-    """Background thread to process tasks."""
-    import time
-    while True:
-        try:
-            # Process any pending tasks
-            from src.flasksaas.main.task_manager import tasks
-            for task_id, task in list(tasks.items()):
-                if task['status'] in ['processing', 'running']:
-                    asyncio.run(process_task_step(task_id))
-            
-            # Clean up old tasks every hour
-            cleanup_old_tasks()
-            
-            time.sleep(5)  # Check every 5 seconds
-        except Exception as e:
-            print(f"Background task processor error: {e}")
-            time.sleep(10)  # Wait longer on error
-
-# Start the background processor
-if IS_PRODUCTION or True:  # Always run for now
-    processor_thread = threading.Thread(target=background_task_processor, daemon=True)
-    processor_thread.start()
-    print("Background task processor started")
+# Share the YouTube quota ledger across workers via the database
+from utils.youtube_quota import QUOTA_MANAGER
+from src.flasksaas.stores import DatabaseQuotaLedger
+QUOTA_MANAGER.ledger = DatabaseQuotaLedger(app)
+
+# Start the task job queue (worker threads in this process unless
+# TASK_QUEUE_BACKEND=database, in which case run worker.py separately)
+from src.flasksaas.main.job_queue import init_job_queue
+init_job_queue(app)
 
 # -------------- Helper Functions --------------------- #
 
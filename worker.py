@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Playlist task worker for the database job queue.
+
+Claims queued jobs from the task_jobs table and runs each task to completion.
+Run one or more of these next to the web app with the same DATABASE_URL:
+
+    TASK_QUEUE_BACKEND=database python worker.py
+"""
+import os
+import logging
+
+# The web app must not start in-process worker threads when imported here
+os.environ["TASK_QUEUE_BACKEND"] = "database"
+
+from web_app import app
+from src.flasksaas.main.job_queue import DatabaseJobQueue
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    poll_interval = float(os.environ.get("TASK_WORKER_POLL_INTERVAL", 1.0))
+    DatabaseJobQueue(app).run_worker(poll_interval=poll_interval)